@@ -35,6 +35,11 @@ TOOL_SELECTION_GUIDE = {
     "technical_specifications": "intelligent_extract",
     "ai_powered_extraction": "intelligent_extract",
     
+    # === BATCH TARGETED DATA EXTRACTION ===
+    "same_data_from_many_pages": "batch_intelligent_extract",
+    "bulk_product_information": "batch_intelligent_extract",
+    "multi_url_ai_extraction": "batch_intelligent_extract",
+    
     # === PATTERN-BASED ENTITY EXTRACTION ===
     "contact_info_patterns": "extract_entities",
     "email_extraction": "extract_entities",
@@ -70,9 +75,13 @@ TOOL_SELECTION_GUIDE = {
     # === BATCH VIDEO PROCESSING ===
     "multiple_youtube_videos": "batch_extract_youtube_transcripts",
     "bulk_video_transcription": "batch_extract_youtube_transcripts",
-    "video_playlist_processing": "batch_extract_youtube_transcripts",
+    "video_playlist_processing": "extract_youtube_playlist_transcripts",
+    "youtube_playlist": "extract_youtube_playlist_transcripts",
+    "youtube_channel_videos": "extract_youtube_playlist_transcripts",
     
     # === YOUTUBE VIDEO INFORMATION ===
+    "transcript_time_range": "query_youtube_transcript",
+    "transcript_keyword_search": "query_youtube_transcript",
     "youtube_video_info": "get_youtube_video_info",
     "video_metadata": "get_youtube_video_info",
     "transcript_availability": "get_youtube_video_info",
@@ -123,6 +132,9 @@ TOOL_SELECTION_GUIDE = {
     
     "search_genres": "get_search_genres",
     "available_search_types": "get_search_genres",
+    
+    "cache_statistics": "get_cache_stats",
+    "clear_cached_results": "get_cache_stats",
 }
 
 # Workflow-based tool selection guide
@@ -138,6 +150,7 @@ WORKFLOW_GUIDE = {
     "document_analysis_workflow": ["process_file", "intelligent_extract", "extract_entities"],
     "video_content_workflow": ["extract_youtube_transcript", "intelligent_extract"],
     "bulk_processing_workflow": ["batch_crawl", "batch_search_google", "batch_extract_youtube_transcripts"],
+    "bulk_extraction_workflow": ["search_google", "batch_intelligent_extract"],
     
     # === DATA EXTRACTION WORKFLOWS ===
     "contact_discovery_workflow": ["search_google", "extract_entities", "intelligent_extract"],
@@ -150,6 +163,6 @@ WORKFLOW_GUIDE = {
 COMPLEXITY_GUIDE = {
     "simple_single_task": ["crawl_url", "extract_entities", "search_google", "process_file"],
     "moderate_multi_step": ["intelligent_extract", "deep_crawl_site", "search_and_crawl"],
-    "complex_bulk_operations": ["batch_crawl", "batch_search_google", "batch_extract_youtube_transcripts"],
+    "complex_bulk_operations": ["batch_crawl", "batch_search_google", "batch_extract_youtube_transcripts", "batch_intelligent_extract"],
     "advanced_workflows": ["crawl_url_with_fallback", "extract_structured_data"],
 }
\ No newline at end of file
@@ -0,0 +1,435 @@
+"""
+Browser Pool Module
+Keeps warm AsyncWebCrawler instances alive for the lifetime of the server so
+tools borrow a running browser instead of launching Chromium on every call
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from crawl4ai import AsyncWebCrawler
+
+from .suppress_output import suppress_stdout_stderr
+
+# psutil ships with crawl4ai, but memory-based recycling is optional
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+# Substrings of browser process names counted against the memory limit
+BROWSER_PROCESS_MARKERS = ("chrom", "headless_shell", "firefox", "webkit")
+
+# Browser settings shared by every tool unless a request overrides them
+DEFAULT_BROWSER_CONFIG = {
+    "browser_type": "chromium",
+    "headless": True,
+    "verbose": False,
+}
+
+
+class PooledBrowser:
+    """A warm crawler together with its usage counters"""
+
+    def __init__(self, key: str, crawler: AsyncWebCrawler):
+        self.key = key
+        self.crawler = crawler
+        self.active = 0
+        self.pages_served = 0
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.retiring = False
+
+
+class BrowserPool:
+    """Process-wide pool of warm AsyncWebCrawler instances
+
+    Browsers are grouped by their launch configuration. The default
+    configuration is pre-warmed with ``size`` browsers; requests with custom
+    browser settings (user agent, headers, viewport, ...) get a browser of
+    their own that is closed again after ``idle_timeout`` seconds of disuse.
+
+    crawl4ai opens a new page for each ``arun`` call but reuses one browser
+    context per run-config signature, and a context holds cookies,
+    localStorage/IndexedDB, the HTTP cache, service workers and granted
+    permissions. The pool closes those cached contexts whenever a browser
+    goes idle, so state never carries over to a later request; requests that
+    borrow the same browser at the same time with matching run configs do
+    share it. Use ``ephemeral=True`` when that is not acceptable.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_pages_per_browser: int = 4,
+        recycle_after: int = 100,
+        max_memory_mb: int = 2048,
+        health_check_interval: float = 30.0,
+        idle_timeout: float = 300.0
+    ):
+        self.size = max(1, size)
+        self.max_pages_per_browser = max(1, max_pages_per_browser)
+        self.recycle_after = max(1, recycle_after)
+        self.max_memory_mb = max_memory_mb
+        self.health_check_interval = health_check_interval
+        self.idle_timeout = idle_timeout
+
+        self._browsers: Dict[str, List[PooledBrowser]] = {}
+        self._launching: Dict[str, int] = {}
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._stats = {
+            'launched': 0,
+            'recycled': 0,
+            'unhealthy': 0,
+            'launch_failures': 0,
+            'leases': 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "BrowserPool":
+        """Create a pool configured from BROWSER_POOL_* environment variables"""
+        return cls(
+            size=int(os.getenv("BROWSER_POOL_SIZE", "2")),
+            max_pages_per_browser=int(os.getenv("BROWSER_POOL_MAX_PAGES", "4")),
+            recycle_after=int(os.getenv("BROWSER_POOL_RECYCLE_AFTER", "100")),
+            max_memory_mb=int(os.getenv("BROWSER_POOL_MAX_MEMORY_MB", "2048")),
+            health_check_interval=float(os.getenv("BROWSER_POOL_HEALTH_INTERVAL", "30")),
+            idle_timeout=float(os.getenv("BROWSER_POOL_IDLE_TIMEOUT", "300")),
+        )
+
+    @staticmethod
+    def _config_key(browser_config: Dict[str, Any]) -> str:
+        """Build a stable key identifying a browser launch configuration"""
+        return json.dumps(browser_config, sort_keys=True, default=str)
+
+    def _bind_to_running_loop(self):
+        """Reset pool state if we are now running on a different event loop
+
+        Playwright browsers belong to the loop that launched them. Callers
+        such as the RunPod handler run every job on a fresh loop, so any
+        browsers left over from a previous (now closed) loop are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None and any(self._browsers.values()):
+            logger.warning("Browser pool moved to a new event loop; discarding stale browsers")
+        self._loop = loop
+        self._browsers = {}
+        self._launching = {}
+        self._condition = asyncio.Condition()
+        self._maintenance_task = None
+
+    async def start(self, warm: bool = True):
+        """Start the pool and optionally pre-launch the default browsers"""
+        self._bind_to_running_loop()
+
+        if warm:
+            default_key = self._config_key(DEFAULT_BROWSER_CONFIG)
+            # Reserve the launches like _checkout does, so concurrent starts and
+            # checkouts during warm-up do not launch past the pool size
+            async with self._condition:
+                live = [b for b in self._browsers.get(default_key, []) if not b.retiring]
+                missing = self.size - len(live) - self._launching.get(default_key, 0)
+                if missing > 0:
+                    self._launching[default_key] = self._launching.get(default_key, 0) + missing
+            if missing > 0:
+                results = []
+                try:
+                    results = await asyncio.gather(
+                        *[self._launch(DEFAULT_BROWSER_CONFIG) for _ in range(missing)],
+                        return_exceptions=True
+                    )
+                finally:
+                    # Release the reservations and add the browsers in one step
+                    async with self._condition:
+                        self._launching[default_key] -= missing
+                        for result in results:
+                            if isinstance(result, PooledBrowser):
+                                self._browsers.setdefault(default_key, []).append(result)
+                            else:
+                                logger.warning(f"Failed to pre-launch browser: {result}")
+                        self._condition.notify_all()
+
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
+    async def close(self):
+        """Stop maintenance and close every pooled browser"""
+        if self._loop is not asyncio.get_running_loop():
+            # Nothing we own can be closed from this loop
+            self._loop = None
+            self._browsers = {}
+            return
+
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._maintenance_task = None
+
+        async with self._condition:
+            browsers = [b for group in self._browsers.values() for b in group]
+            self._browsers = {}
+            self._condition.notify_all()
+
+        await asyncio.gather(*[self._close_browser(b) for b in browsers], return_exceptions=True)
+
+    @asynccontextmanager
+    async def crawler(self, ephemeral: bool = False, **browser_config) -> AsyncIterator[AsyncWebCrawler]:
+        """Borrow a running crawler for the duration of the context
+
+        Args:
+            ephemeral: Launch a dedicated crawler that is closed on release.
+                Use this when the request mutates browser-wide state such as
+                cookies, so nothing leaks into other requests.
+            **browser_config: AsyncWebCrawler launch options overriding
+                DEFAULT_BROWSER_CONFIG
+        """
+        config = {**DEFAULT_BROWSER_CONFIG, **browser_config}
+
+        if ephemeral:
+            browser = await self._launch(config)
+            try:
+                yield browser.crawler
+            finally:
+                await self._close_browser(browser)
+            return
+
+        browser = await self._checkout(config)
+        try:
+            yield browser.crawler
+        except Exception as e:
+            if self._looks_like_browser_failure(e):
+                browser.retiring = True
+            raise
+        finally:
+            await self._checkin(browser)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool counters and the current browser inventory"""
+        browsers = [b for group in self._browsers.values() for b in group]
+        return {
+            **self._stats,
+            'size': self.size,
+            'max_pages_per_browser': self.max_pages_per_browser,
+            'recycle_after': self.recycle_after,
+            'browsers': len(browsers),
+            'active_pages': sum(b.active for b in browsers),
+            'configurations': len([g for g in self._browsers.values() if g]),
+        }
+
+    async def _checkout(self, config: Dict[str, Any]) -> PooledBrowser:
+        """Reserve a page slot on a healthy browser, launching one if allowed"""
+        self._bind_to_running_loop()
+        key = self._config_key(config)
+        is_default = key == self._config_key(DEFAULT_BROWSER_CONFIG)
+        max_browsers = self.size if is_default else 1
+
+        async with self._condition:
+            while True:
+                candidates = [
+                    b for b in self._browsers.get(key, [])
+                    if not b.retiring and b.active < self.max_pages_per_browser
+                ]
+                if candidates:
+                    browser = min(candidates, key=lambda b: b.active)
+                    browser.active += 1
+                    self._stats['leases'] += 1
+                    return browser
+
+                live = [b for b in self._browsers.get(key, []) if not b.retiring]
+                launched = len(live) + self._launching.get(key, 0)
+                if launched < max_browsers:
+                    self._launching[key] = self._launching.get(key, 0) + 1
+                    break
+
+                await self._condition.wait()
+
+        try:
+            browser = await self._launch(config)
+        finally:
+            async with self._condition:
+                self._launching[key] -= 1
+                self._condition.notify_all()
+
+        async with self._condition:
+            browser.active = 1
+            self._browsers.setdefault(key, []).append(browser)
+            self._stats['leases'] += 1
+        return browser
+
+    async def _checkin(self, browser: PooledBrowser):
+        """Return a page slot and retire the browser if it is due for recycling"""
+        to_close = None
+        stale_contexts: List[Any] = []
+        async with self._condition:
+            browser.active -= 1
+            browser.pages_served += 1
+            browser.last_used = time.monotonic()
+            if browser.pages_served >= self.recycle_after:
+                browser.retiring = True
+            if browser.retiring and browser.active == 0:
+                to_close = browser
+                self._remove(browser)
+            elif browser.active == 0:
+                # Idle: drop the contexts past requests left behind before anyone borrows it again
+                stale_contexts = self._take_contexts(browser)
+            self._condition.notify_all()
+
+        if to_close is not None:
+            self._stats['recycled'] += 1
+            await self._close_browser(to_close)
+        elif stale_contexts:
+            await asyncio.gather(*[context.close() for context in stale_contexts], return_exceptions=True)
+
+    @staticmethod
+    def _take_contexts(browser: PooledBrowser) -> List[Any]:
+        """Detach the browser contexts crawl4ai cached for earlier runs
+
+        The next ``arun`` then creates a fresh context; the caller closes the
+        returned ones.
+        """
+        strategy = getattr(browser.crawler, 'crawler_strategy', None)
+        manager = getattr(strategy, 'browser_manager', None)
+        contexts = getattr(manager, 'contexts_by_config', None)
+        if not isinstance(contexts, dict) or not contexts:
+            return []
+        stale = list(contexts.values())
+        contexts.clear()
+        return stale
+
+    def _remove(self, browser: PooledBrowser):
+        group = self._browsers.get(browser.key, [])
+        if browser in group:
+            group.remove(browser)
+        if not group:
+            self._browsers.pop(browser.key, None)
+
+    async def _launch(self, config: Dict[str, Any]) -> PooledBrowser:
+        """Launch and start a new crawler"""
+        crawler = AsyncWebCrawler(**config)
+        try:
+            with suppress_stdout_stderr():
+                await crawler.start()
+        except Exception:
+            self._stats['launch_failures'] += 1
+            raise
+        self._stats['launched'] += 1
+        return PooledBrowser(self._config_key(config), crawler)
+
+    async def _close_browser(self, browser: PooledBrowser):
+        try:
+            with suppress_stdout_stderr():
+                await browser.crawler.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled browser: {e}")
+
+    @staticmethod
+    def _looks_like_browser_failure(error: Exception) -> bool:
+        message = str(error).lower()
+        return any(marker in message for marker in (
+            "target closed", "browser has been closed", "browser closed",
+            "connection closed", "has been disconnected",
+        ))
+
+    @staticmethod
+    def _is_healthy(browser: PooledBrowser) -> bool:
+        """Check that the underlying Playwright browser is still connected"""
+        crawler = browser.crawler
+        if getattr(crawler, 'ready', True) is False:
+            return False
+        strategy = getattr(crawler, 'crawler_strategy', None)
+        manager = getattr(strategy, 'browser_manager', None)
+        playwright_browser = getattr(manager, 'browser', None)
+        if playwright_browser is not None and hasattr(playwright_browser, 'is_connected'):
+            try:
+                return playwright_browser.is_connected()
+            except Exception:
+                return False
+        return True
+
+    @staticmethod
+    def _memory_usage_mb() -> Optional[float]:
+        """Resident memory of the browser processes started by this server
+
+        The server process itself and non-browser children (e.g. conversion
+        workers) are left out, so only browsers count against the limit.
+        """
+        if not PSUTIL_AVAILABLE:
+            return None
+        try:
+            total = 0
+            for child in psutil.Process().children(recursive=True):
+                try:
+                    name = child.name().lower()
+                    if any(marker in name for marker in BROWSER_PROCESS_MARKERS):
+                        total += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return total / (1024 * 1024)
+        except Exception:
+            return None
+
+    async def _maintenance_loop(self):
+        """Periodically run health checks, recycling and re-warming"""
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self._run_maintenance()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Browser pool maintenance error: {e}")
+
+    async def _run_maintenance(self):
+        now = time.monotonic()
+        default_key = self._config_key(DEFAULT_BROWSER_CONFIG)
+        memory_mb = self._memory_usage_mb()
+        over_memory = bool(self.max_memory_mb and memory_mb and memory_mb > self.max_memory_mb)
+
+        to_close = []
+        async with self._condition:
+            browsers = [b for group in self._browsers.values() for b in group]
+
+            for browser in browsers:
+                if not browser.retiring and not self._is_healthy(browser):
+                    browser.retiring = True
+                    self._stats['unhealthy'] += 1
+                if browser.key != default_key and browser.active == 0 \
+                        and now - browser.last_used > self.idle_timeout:
+                    browser.retiring = True
+
+            if over_memory and browsers:
+                # Retire the most heavily used browser; it has accumulated the most state
+                busiest = max(browsers, key=lambda b: b.pages_served)
+                busiest.retiring = True
+
+            for browser in browsers:
+                if browser.retiring and browser.active == 0:
+                    self._remove(browser)
+                    to_close.append(browser)
+
+            if to_close:
+                self._condition.notify_all()
+
+        for browser in to_close:
+            self._stats['recycled'] += 1
+            await self._close_browser(browser)
+
+        # Keep the default browsers warm after recycling
+        await self.start(warm=True)
+
@@ -0,0 +1,157 @@
+"""
+Concurrency Utilities
+Bounded-parallelism and rate-limiting helpers shared by the batch-style tools
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+from urllib.parse import urlparse
+
+
+class HostLimiter:
+    """Limit concurrent work globally and per host
+
+    A task first waits for a slot on its own host and only then takes a
+    global slot, so requests queued behind a busy origin never hold global
+    capacity that other hosts could use.
+    """
+
+    def __init__(self, max_concurrent: int = 5, max_per_host: int = 2):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_per_host = max(1, min(max_per_host, self.max_concurrent))
+        self._global = asyncio.Semaphore(self.max_concurrent)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """Get the normalized host for a URL"""
+        try:
+            return urlparse(url).netloc.lower()
+        except Exception:
+            return ""
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[None]:
+        """Hold a per-host slot and a global slot for the duration of the context"""
+        host = self.host_of(url)
+        host_semaphore = self._hosts.get(host)
+        if host_semaphore is None:
+            host_semaphore = asyncio.Semaphore(self.max_per_host)
+            self._hosts[host] = host_semaphore
+
+        async with host_semaphore:
+            async with self._global:
+                yield
+
+
+class TokenBucket:
+    """Token bucket rate limiter
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``; each
+    acquire takes one token.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = max(rate, 1e-6)
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate: float):
+        """Change the refill rate, keeping tokens earned at the old rate"""
+        self._refill(time.monotonic())
+        self.rate = max(rate, 1e-6)
+
+    async def acquire(self, tokens: float = 1.0):
+        """Take tokens, waiting for the refill when the bucket is empty
+
+        Tokens are reserved up front (the balance may go negative), so
+        waiters are served in arrival order without a lock that would tie
+        the bucket to one event loop.
+        """
+        self._refill(time.monotonic())
+        self._tokens -= tokens
+        if self._tokens < 0:
+            try:
+                await asyncio.sleep(-self._tokens / self.rate)
+            except asyncio.CancelledError:
+                # Give the reservation back to later callers
+                self._tokens += tokens
+                raise
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose rate adapts to throttling (AIMD)
+
+    Every success raises the rate additively up to ``max_rate``; a throttling
+    signal halves it (down to ``min_rate``) and pauses all callers for a
+    cooldown that doubles while throttling persists.
+    """
+
+    def __init__(
+        self,
+        rate: float = 2.0,
+        min_rate: float = 0.2,
+        max_rate: float = 8.0,
+        burst: float = 4.0,
+        increase_step: float = 0.1,
+        cooldown: float = 5.0,
+        max_cooldown: float = 120.0
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        self.increase_step = increase_step
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.bucket = TokenBucket(min(max(rate, min_rate), self.max_rate), burst)
+
+        self._cooldown = cooldown
+        self._paused_until = 0.0
+        self._stats = {'acquired': 0, 'throttled': 0, 'successes': 0}
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    async def acquire(self):
+        """Wait for a cooldown to pass and for a token"""
+        delay = self._paused_until - time.monotonic()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self._paused_until - time.monotonic()
+        await self.bucket.acquire()
+        self._stats['acquired'] += 1
+
+    def on_success(self):
+        """Additive increase after a request went through"""
+        self._stats['successes'] += 1
+        self._cooldown = self.base_cooldown
+        if self.bucket.rate < self.max_rate:
+            self.bucket.set_rate(min(self.max_rate, self.bucket.rate + self.increase_step))
+
+    def on_throttle(self):
+        """Multiplicative decrease and a pause after a throttling signal"""
+        self._stats['throttled'] += 1
+        now = time.monotonic()
+        if self._paused_until > now:
+            # Requests already in flight when throttling started report it too
+            return
+        self.bucket.set_rate(max(self.min_rate, self.bucket.rate / 2))
+        self._paused_until = now + self._cooldown
+        self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the current rate and counters"""
+        return {
+            **self._stats,
+            'rate_per_second': round(self.bucket.rate, 3),
+            'min_rate': self.min_rate,
+            'max_rate': self.max_rate,
+            'paused_for_seconds': round(max(0.0, self._paused_until - time.monotonic()), 1),
+        }
@@ -28,6 +28,8 @@ class LLMProviderConfig:
     base_url_env: Optional[str] = None  # Environment variable name for base URL (AOAI)
     api_version: Optional[str] = None  # API version for Azure OpenAI
     models: list = None
+    max_concurrent: Optional[int] = None  # Concurrent requests (LLM_MAX_CONCURRENT if unset)
+    requests_per_second: Optional[float] = None  # Request rate (LLM_REQUESTS_PER_SECOND if unset)
 
 
 @dataclass
@@ -136,7 +138,9 @@ class ConfigManager:
                 base_url=provider_data.get('base_url'),
                 base_url_env=provider_data.get('base_url_env'),  # Environment variable for base URL
                 api_version=provider_data.get('api_version'),  # API version for Azure
-                models=provider_data.get('models', [])
+                models=provider_data.get('models', []),
+                max_concurrent=provider_data.get('max_concurrent'),  # Per-provider concurrency limit
+                requests_per_second=provider_data.get('requests_per_second')  # Per-provider rate limit
             )
         
         return MCPLLMConfig(
@@ -0,0 +1,356 @@
+"""
+Content Router Module
+Detects what a URL serves (from its extension, a HEAD request or the first
+bytes of the body) so non-HTML content is handled without a browser
+"""
+
+import asyncio
+import html
+import logging
+import os
+import re
+import time
+import xml.etree.ElementTree as ElementTree
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, unquote
+
+import aiohttp
+
+from .http_client import http_pool
+
+
+logger = logging.getLogger(__name__)
+
+# Routes a URL can be dispatched to
+ROUTE_DOCUMENT = "document"  # MarkItDown (PDF, Office, ZIP, plain text ...)
+ROUTE_JSON = "json"
+ROUTE_FEED = "feed"  # RSS / Atom
+ROUTE_IMAGE = "image"
+ROUTE_HTML = "html"  # Browser
+
+# MIME types converted by MarkItDown, with the suffix the converter expects
+DOCUMENT_MIME_TYPES = {
+    'application/pdf': '.pdf',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
+    'application/vnd.openxmlformats-officedocument.presentationml.presentation': '.pptx',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': '.xlsx',
+    'application/vnd.ms-excel': '.xls',
+    'application/zip': '.zip',
+    'application/x-zip-compressed': '.zip',
+    'application/epub+zip': '.epub',
+    'application/rtf': '.rtf',
+    'text/rtf': '.rtf',
+    'text/csv': '.csv',
+    'text/markdown': '.md',
+    'text/x-markdown': '.md',
+    'text/plain': '.txt',
+}
+
+FEED_MIME_TYPES = {'application/rss+xml', 'application/atom+xml', 'application/rdf+xml'}
+HTML_MIME_TYPES = {'text/html', 'application/xhtml+xml'}
+
+# Extensions that are routed without probing the server
+EXTENSION_ROUTES = {
+    **{suffix: ROUTE_DOCUMENT for suffix in ('.pdf', '.docx', '.pptx', '.xlsx', '.xls', '.zip', '.epub', '.rtf', '.csv', '.md', '.txt')},
+    '.json': ROUTE_JSON,
+    '.rss': ROUTE_FEED,
+    '.atom': ROUTE_FEED,
+    **{suffix: ROUTE_IMAGE for suffix in ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg', '.bmp', '.ico', '.avif')},
+    '.html': ROUTE_HTML,
+    '.htm': ROUTE_HTML,
+}
+
+# Bytes requested when the headers do not tell the content type
+SNIFF_BYTES = 2048
+
+# OLE2 directory stream names of legacy Office formats (.doc and .ppt are not convertible).
+# Documents and slides come first: they may embed workbooks, which have their own Workbook stream
+_OLE_STREAM_SUFFIXES = (
+    ('WordDocument', '.doc'),
+    ('PowerPoint Document', '.ppt'),
+    ('Workbook', '.xls'),
+    ('Book', '.xls'),
+)
+
+_FILENAME_PATTERN = re.compile(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', re.IGNORECASE)
+
+
+def _url_suffix(url: str) -> str:
+    """Lowercase file extension of a URL's path"""
+    try:
+        return Path(unquote(urlparse(url).path)).suffix.lower()
+    except Exception:
+        return ""
+
+
+def sniff_content(data: bytes) -> Tuple[Optional[str], Optional[str]]:
+    """Guess (route, suffix) from the first bytes of a response body"""
+    head = data.lstrip()[:512]
+    lowered = head.lower()
+    if head.startswith(b'%PDF'):
+        return ROUTE_DOCUMENT, '.pdf'
+    if head.startswith(b'PK\x03\x04'):
+        # Office documents are ZIP containers; name the part that identifies them
+        if b'word/' in data:
+            return ROUTE_DOCUMENT, '.docx'
+        if b'ppt/' in data:
+            return ROUTE_DOCUMENT, '.pptx'
+        if b'xl/' in data:
+            return ROUTE_DOCUMENT, '.xlsx'
+        return ROUTE_DOCUMENT, '.zip'
+    if head.startswith(b'\xd0\xcf\x11\xe0'):
+        # Legacy Office (OLE2) files share one header; the stream names tell them apart
+        # when the directory falls within the sniffed bytes, otherwise the URL's suffix decides
+        for stream, suffix in _OLE_STREAM_SUFFIXES:
+            if stream.encode('utf-16-le') in data:
+                return ROUTE_DOCUMENT, suffix
+        return ROUTE_DOCUMENT, None
+    if head.startswith(b'{\\rtf'):
+        return ROUTE_DOCUMENT, '.rtf'
+    if head.startswith((b'\x89PNG', b'GIF8', b'\xff\xd8\xff')) or (head[:4] == b'RIFF' and head[8:12] == b'WEBP'):
+        return ROUTE_IMAGE, None
+    if lowered.startswith((b'<!doctype html', b'<html')):
+        return ROUTE_HTML, None
+    if b'<rss' in lowered or b'<feed' in lowered or b'<rdf:rdf' in lowered:
+        return ROUTE_FEED, None
+    if b'<svg' in lowered:
+        return ROUTE_IMAGE, None
+    if b'<html' in lowered:
+        return ROUTE_HTML, None
+    if head[:1] in (b'{', b'['):
+        return ROUTE_JSON, None
+    return None, None
+
+
+def route_for_mime(mime_type: str) -> Tuple[Optional[str], Optional[str]]:
+    """Map a MIME type to (route, suffix); (None, None) when the body must be sniffed"""
+    if mime_type in HTML_MIME_TYPES:
+        return ROUTE_HTML, None
+    if mime_type in DOCUMENT_MIME_TYPES:
+        return ROUTE_DOCUMENT, DOCUMENT_MIME_TYPES[mime_type]
+    if mime_type == 'application/json' or mime_type.endswith('+json'):
+        return ROUTE_JSON, None
+    if mime_type in FEED_MIME_TYPES:
+        return ROUTE_FEED, None
+    if mime_type.startswith('image/'):
+        return ROUTE_IMAGE, None
+    # Generic XML and binary types need a look at the body
+    return None, None
+
+
+def _local_name(tag: str) -> str:
+    """Tag name without its XML namespace"""
+    return tag.rsplit('}', 1)[-1].lower()
+
+
+def _child_text(element: ElementTree.Element, *names: str) -> Optional[str]:
+    for child in element:
+        if _local_name(child.tag) in names and (child.text or '').strip():
+            return child.text.strip()
+    return None
+
+
+def _strip_markup(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return text
+    return re.sub(r'\s+', ' ', html.unescape(re.sub(r'<[^>]+>', ' ', text))).strip()
+
+
+def parse_feed(data: bytes, max_items: int = 100) -> Dict[str, Any]:
+    """Parse an RSS 2.0, RSS 1.0 (RDF) or Atom document into title, link and items"""
+    root = ElementTree.fromstring(data)
+    channel = next((el for el in root.iter() if _local_name(el.tag) == 'channel'), root)
+
+    def entry_link(element: ElementTree.Element) -> Optional[str]:
+        for child in element:
+            if _local_name(child.tag) != 'link':
+                continue
+            # Atom links carry the URL in href; RSS links in the element text
+            if child.get('href') and child.get('rel', 'alternate') == 'alternate':
+                return child.get('href')
+            if (child.text or '').strip():
+                return child.text.strip()
+        return None
+
+    items: List[Dict[str, Any]] = []
+    for element in root.iter():
+        if _local_name(element.tag) not in ('item', 'entry'):
+            continue
+        items.append({
+            'title': _strip_markup(_child_text(element, 'title')),
+            'link': entry_link(element),
+            'published': _child_text(element, 'pubdate', 'published', 'updated', 'date'),
+            'summary': _strip_markup(_child_text(element, 'description', 'summary', 'content')),
+        })
+        if len(items) >= max_items:
+            break
+
+    return {
+        'format': 'atom' if _local_name(root.tag) == 'feed' else 'rss',
+        'title': _strip_markup(_child_text(channel, 'title')),
+        'link': entry_link(channel),
+        'description': _strip_markup(_child_text(channel, 'description', 'subtitle')),
+        'items': items,
+    }
+
+
+def feed_to_markdown(feed: Dict[str, Any]) -> str:
+    """Render a parsed feed as a markdown list of entries"""
+    lines = [f"# {feed.get('title') or 'Feed'}"]
+    if feed.get('description'):
+        lines.extend(["", feed['description']])
+    for item in feed['items']:
+        title = item.get('title') or item.get('link') or 'Untitled'
+        lines.extend(["", f"## [{title}]({item['link']})" if item.get('link') else f"## {title}"])
+        if item.get('published'):
+            lines.append(f"*{item['published']}*")
+        if item.get('summary'):
+            lines.extend(["", item['summary']])
+    return "\n".join(lines)
+
+
+class ContentRouter:
+    """Decide which engine should handle a URL
+
+    URLs with a well-known extension are routed without any request. Others
+    get a HEAD request, and when the Content-Type is missing or generic
+    (``application/octet-stream``, plain XML) a GET for the first
+    SNIFF_BYTES bytes whose magic bytes decide. Results are kept in a small
+    LRU per URL. Anything that cannot be determined goes to the browser, as
+    before.
+    """
+
+    def __init__(self, enabled: bool = True, cache_size: int = 2048, cache_ttl: float = 3600.0, probe_timeout: float = 10.0):
+        self.enabled = enabled
+        self.cache_size = max(1, cache_size)
+        self.cache_ttl = cache_ttl
+        self.probe_timeout = probe_timeout
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'probes': 0, 'probe_errors': 0}
+        self._route_counts: Dict[str, int] = {}
+
+    @classmethod
+    def from_env(cls) -> "ContentRouter":
+        """Create a router configured from CONTENT_ROUTER_* environment variables"""
+        return cls(
+            enabled=os.getenv("CONTENT_ROUTER_ENABLED", "true").lower() == "true",
+            cache_size=int(os.getenv("CONTENT_ROUTER_CACHE_SIZE", "2048")),
+            cache_ttl=float(os.getenv("CONTENT_ROUTER_CACHE_TTL", "3600")),
+            probe_timeout=float(os.getenv("CONTENT_ROUTER_PROBE_TIMEOUT", "10")),
+        )
+
+    def _cache_get(self, url: str) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(url)
+        if entry is None:
+            return None
+        stored_at, decision = entry
+        if time.monotonic() - stored_at > self.cache_ttl:
+            del self._cache[url]
+            return None
+        self._cache.move_to_end(url)
+        return decision
+
+    def _cache_put(self, url: str, decision: Dict[str, Any]):
+        self._cache[url] = (time.monotonic(), decision)
+        self._cache.move_to_end(url)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _decision(route: str, mime_type: Optional[str], suffix: Optional[str], source: str, final_url: str) -> Dict[str, Any]:
+        return {
+            'route': route,
+            'mime_type': mime_type,
+            'suffix': suffix,
+            'source': source,
+            'final_url': final_url,
+        }
+
+    async def _probe(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Detect the content type with a HEAD request, falling back to a ranged GET"""
+        session = http_pool.get_session()
+        timeout = aiohttp.ClientTimeout(total=self.probe_timeout)
+        mime_type = None
+        final_url = url
+        suffix = None
+
+        try:
+            async with session.head(url, headers=headers, allow_redirects=True, timeout=timeout) as response:
+                final_url = str(response.url)
+                if response.status < 400:
+                    mime_type = response.content_type
+                    disposition = response.headers.get('Content-Disposition', '')
+                    match = _FILENAME_PATTERN.search(disposition)
+                    if match:
+                        suffix = Path(unquote(match.group(1))).suffix.lower() or None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Some servers reject HEAD; the ranged GET below still works
+            logger.debug(f"HEAD {url} failed: {e}")
+
+        if suffix and EXTENSION_ROUTES.get(suffix, ROUTE_HTML) != ROUTE_HTML:
+            return self._decision(EXTENSION_ROUTES[suffix], mime_type, suffix, "content_disposition", final_url)
+        if mime_type:
+            route, mime_suffix = route_for_mime(mime_type)
+            if route is not None:
+                return self._decision(route, mime_type, mime_suffix, "content_type", final_url)
+
+        request_headers = dict(headers or {})
+        request_headers['Range'] = f'bytes=0-{SNIFF_BYTES - 1}'
+        async with session.get(final_url, headers=request_headers, allow_redirects=True, timeout=timeout) as response:
+            final_url = str(response.url)
+            mime_type = mime_type or response.content_type
+            data = await response.content.read(SNIFF_BYTES)
+        route, sniffed_suffix = sniff_content(data)
+        if route is None:
+            # Unknown or unreadable content is left to the browser
+            route = ROUTE_HTML
+        return self._decision(route, mime_type, sniffed_suffix, "sniffed", final_url)
+
+    async def route(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Return the routing decision for a URL: route, mime_type, suffix, source and final_url"""
+        suffix = _url_suffix(url)
+        if not self.enabled or not url.startswith(('http://', 'https://')):
+            decision = self._decision(EXTENSION_ROUTES.get(suffix, ROUTE_HTML), None, suffix or None, "extension", url)
+        elif suffix in EXTENSION_ROUTES:
+            decision = self._decision(EXTENSION_ROUTES[suffix], None, suffix, "extension", url)
+        else:
+            decision = self._cache_get(url)
+            if decision is not None:
+                self._stats['hits'] += 1
+            else:
+                self._stats['misses'] += 1
+                self._stats['probes'] += 1
+                try:
+                    decision = await self._probe(url, headers)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    self._stats['probe_errors'] += 1
+                    logger.debug(f"Content probe for {url} failed: {e}")
+                    decision = self._decision(ROUTE_HTML, None, None, "probe_failed", url)
+                else:
+                    self._cache_put(url, decision)
+
+        self._route_counts[decision['route']] = self._route_counts.get(decision['route'], 0) + 1
+        return decision
+
+    def clear(self) -> int:
+        """Forget all cached routing decisions; returns the count removed"""
+        count = len(self._cache)
+        self._cache.clear()
+        return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache counters and how often each route was chosen"""
+        return {
+            **self._stats,
+            'enabled': self.enabled,
+            'cached_urls': len(self._cache),
+            'cache_size': self.cache_size,
+            'cache_ttl': self.cache_ttl,
+            'routes': dict(self._route_counts),
+        }
+
+
+# Global content router instance
+content_router = ContentRouter.from_env()
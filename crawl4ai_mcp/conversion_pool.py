@@ -0,0 +1,239 @@
+"""
+Conversion Pool Module
+Runs MarkItDown conversions in worker processes so CPU-heavy document
+parsing never blocks the server's event loop
+"""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+# resource is POSIX-only; memory limits are skipped where it is unavailable
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+# MarkItDown instance owned by the current worker process
+_worker_markitdown = None
+
+
+def _init_worker(max_memory_mb: int):
+    """Apply the memory limit and load MarkItDown once per worker process"""
+    global _worker_markitdown
+    if max_memory_mb and RESOURCE_AVAILABLE:
+        limit = max_memory_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+
+    from markitdown import MarkItDown
+    _worker_markitdown = MarkItDown()
+
+
+def _get_markitdown():
+    global _worker_markitdown
+    if _worker_markitdown is None:
+        from markitdown import MarkItDown
+        _worker_markitdown = MarkItDown()
+    return _worker_markitdown
+
+
+def _convert_stream(markitdown, data: bytes, suffix: str):
+    """Convert from memory with MarkItDown's stream API, or None if it is unavailable"""
+    convert_stream = getattr(markitdown, 'convert_stream', None)
+    if convert_stream is None:
+        return None
+    try:
+        from markitdown import StreamInfo
+    except ImportError:
+        # MarkItDown < 0.1 takes the extension as a keyword argument
+        return convert_stream(io.BytesIO(data), file_extension=suffix)
+    return convert_stream(io.BytesIO(data), stream_info=StreamInfo(extension=suffix))
+
+
+def convert_document(data: bytes, suffix: str) -> Dict[str, Any]:
+    """Convert document bytes to markdown (runs inside a worker process)"""
+    markitdown = _get_markitdown()
+    result = _convert_stream(markitdown, data, suffix)
+
+    if result is None:
+        # Fall back to a temporary file for MarkItDown builds without streams
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_file:
+            temp_file.write(data)
+        try:
+            result = markitdown.convert(temp_file.name)
+        finally:
+            # Clean up temp file
+            try:
+                os.unlink(temp_file.name)
+            except OSError:
+                pass
+
+    return {
+        'content': result.text_content,
+        'title': getattr(result, 'title', None),
+        'metadata': getattr(result, 'metadata', {}),
+    }
+
+
+def _worker_context():
+    """Pick a start method that does not fork the threaded server process
+
+    forkserver starts workers from a clean helper process; spawn is the
+    fallback on platforms without it.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+class ConversionPool:
+    """Process pool for document conversions
+
+    Each job gets a timeout; a job that overruns it cannot be interrupted
+    inside its worker, and ProcessPoolExecutor cannot lose a single worker,
+    so the whole pool is torn down and a fresh one started. The other jobs
+    that were running or queued on it are resubmitted to the fresh pool
+    rather than failed. Workers run under an address-space limit and the
+    pool is replaced after ``max_jobs_per_worker * max_workers`` jobs to
+    bound memory growth from leaky parsers.
+    """
+
+    # Times one job may be moved to a fresh pool after other jobs' timeouts
+    MAX_RESUBMISSIONS = 3
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        job_timeout: float = 120.0,
+        max_memory_mb: int = 2048,
+        max_jobs_per_worker: int = 50
+    ):
+        self.max_workers = max(1, max_workers)
+        self.job_timeout = job_timeout
+        self.max_memory_mb = max_memory_mb
+        self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs_on_executor = 0
+        # Pools torn down because one of their jobs timed out
+        self._timed_out_executors: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+        self._stats = {
+            'jobs': 0,
+            'failures': 0,
+            'timeouts': 0,
+            'crashes': 0,
+            'resubmitted': 0,
+            'recycled': 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "ConversionPool":
+        """Create a pool configured from CONVERSION_* environment variables"""
+        return cls(
+            max_workers=int(os.getenv("CONVERSION_WORKERS", str(min(4, os.cpu_count() or 2)))),
+            job_timeout=float(os.getenv("CONVERSION_TIMEOUT", "120")),
+            max_memory_mb=int(os.getenv("CONVERSION_MAX_MEMORY_MB", "2048")),
+            max_jobs_per_worker=int(os.getenv("CONVERSION_MAX_JOBS_PER_WORKER", "50")),
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is not None and self._jobs_on_executor >= self.max_jobs_per_worker * self.max_workers:
+            # Recycle workers; jobs already running on the old pool still finish
+            self._discard_executor(self._executor, kill=False)
+            self._stats['recycled'] += 1
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=_worker_context(),
+                initializer=_init_worker,
+                initargs=(self.max_memory_mb,),
+            )
+            self._jobs_on_executor = 0
+        return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor, kill: bool):
+        if self._executor is executor:
+            self._executor = None
+        if kill:
+            for process in list((getattr(executor, '_processes', None) or {}).values()):
+                try:
+                    process.terminate()
+                except Exception:
+                    pass
+        # Pending jobs are not cancelled: a killed pool fails them with
+        # BrokenProcessPool, which run() turns into a resubmission
+        executor.shutdown(wait=False)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a picklable function in a worker process with the job timeout"""
+        loop = asyncio.get_running_loop()
+        self._stats['jobs'] += 1
+        resubmissions = 0
+
+        while True:
+            executor = self._get_executor()
+            self._jobs_on_executor += 1
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(executor, fn, *args),
+                    timeout=self.job_timeout
+                )
+            except asyncio.TimeoutError:
+                self._stats['timeouts'] += 1
+                self._timed_out_executors.add(executor)
+                self._discard_executor(executor, kill=True)
+                raise TimeoutError(f"Conversion timed out after {self.job_timeout:.0f}s")
+            except BrokenProcessPool:
+                if executor in self._timed_out_executors and resubmissions < self.MAX_RESUBMISSIONS:
+                    # Another job's timeout killed the pool under this one; run it again on a fresh pool
+                    resubmissions += 1
+                    self._stats['resubmitted'] += 1
+                    continue
+                self._stats['crashes'] += 1
+                self._discard_executor(executor, kill=True)
+                raise RuntimeError("Conversion worker crashed (it may have exceeded the memory limit)")
+            except MemoryError:
+                self._stats['failures'] += 1
+                raise RuntimeError(f"Conversion exceeded the {self.max_memory_mb}MB memory limit")
+            except Exception:
+                self._stats['failures'] += 1
+                raise
+
+    async def convert(self, data: bytes, suffix: str) -> Dict[str, Any]:
+        """Convert document bytes to markdown in a worker process"""
+        return await self.run(convert_document, data, suffix)
+
+    def shutdown(self):
+        """Stop all worker processes"""
+        if self._executor is not None:
+            self._discard_executor(self._executor, kill=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool settings and job counters"""
+        return {
+            **self._stats,
+            'max_workers': self.max_workers,
+            'job_timeout': self.job_timeout,
+            'max_memory_mb': self.max_memory_mb,
+            'max_jobs_per_worker': self.max_jobs_per_worker,
+            'running': self._executor is not None,
+        }
+
+
+# Global conversion pool instance (worker processes start on first use)
+conversion_pool = ConversionPool.from_env()
@@ -0,0 +1,337 @@
+"""
+Disk Cache Module
+Size-bounded SQLite cache with per-namespace TTLs, LRU eviction and
+hit/miss counters for results that are expensive to rebuild
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "crawl4ai_mcp")
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so equivalent spellings share one cache entry
+
+    Lowercases scheme and host, drops default ports and fragments, sorts
+    query parameters and gives an empty path a trailing slash.
+    """
+    try:
+        parsed = urlparse(url.strip())
+        scheme = parsed.scheme.lower()
+        netloc = parsed.netloc.lower()
+        if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+            netloc = netloc.rsplit(':', 1)[0]
+        path = parsed.path or '/'
+        query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+        return urlunparse((scheme, netloc, path, parsed.params, query, ''))
+    except Exception:
+        return url
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Hash arbitrary JSON-serializable parts into a cache key"""
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class DiskCache:
+    """SQLite-backed cache shared by the server's tools
+
+    Entries live in namespaces (usually one per tool), each with its own TTL.
+    Values are stored as zlib-compressed JSON. When the total stored size
+    exceeds ``max_size_mb`` the least recently used entries are evicted.
+    All operations are thread safe; use the ``aget``/``aset`` variants from
+    async code so disk I/O stays off the event loop.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size_mb: int = 512,
+        default_ttl: int = 900,
+        ttls: Optional[Dict[str, int]] = None,
+        enabled: bool = True
+    ):
+        self.path = path
+        self.max_bytes = max_size_mb * 1024 * 1024
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total_bytes = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_env(
+        cls,
+        prefix: str,
+        filename: str,
+        default_ttls: Optional[Dict[str, int]] = None,
+        default_max_size_mb: int = 512
+    ) -> "DiskCache":
+        """Create a cache configured from ``{prefix}_*`` environment variables
+
+        Recognized variables: ``{prefix}_ENABLED``, ``{prefix}_PATH``,
+        ``{prefix}_MAX_MB``, ``{prefix}_TTL`` (default TTL, falls back to
+        CACHE_TTL) and ``{prefix}_TTL_<NAMESPACE>`` for per-namespace TTLs.
+        """
+        default_ttl = int(os.getenv(f"{prefix}_TTL", os.getenv("CACHE_TTL", "900")))
+        ttls = dict(default_ttls or {})
+        for namespace in list(ttls):
+            override = os.getenv(f"{prefix}_TTL_{namespace.upper()}")
+            if override:
+                ttls[namespace] = int(override)
+
+        return cls(
+            path=os.getenv(f"{prefix}_PATH", os.path.join(DEFAULT_CACHE_DIR, filename)),
+            max_size_mb=int(os.getenv(f"{prefix}_MAX_MB", str(default_max_size_mb))),
+            default_ttl=default_ttl,
+            ttls=ttls,
+            enabled=os.getenv(f"{prefix}_ENABLED", "true").lower() not in ("0", "false", "no"),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use
+
+        If the cache file cannot be created or opened (e.g. a read-only home
+        directory in a container) the cache disables itself, so every later
+        lookup is a plain miss instead of an error.
+        """
+        if self._conn is None:
+            conn = None
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    " namespace TEXT NOT NULL,"
+                    " key TEXT NOT NULL,"
+                    " value BLOB NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " created_at REAL NOT NULL,"
+                    " expires_at REAL NOT NULL,"
+                    " last_access REAL NOT NULL,"
+                    " PRIMARY KEY (namespace, key))"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_expires_at ON entries(expires_at)")
+                row = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+            except (sqlite3.Error, OSError) as e:
+                if conn is not None:
+                    conn.close()
+                self.enabled = False
+                logger.warning(f"Cache at {self.path} is unusable, caching disabled: {e}")
+                raise
+            self._total_bytes = row[0]
+            self._conn = conn
+        return self._conn
+
+    def _counter(self, namespace: str) -> Dict[str, int]:
+        counters = self._stats.get(namespace)
+        if counters is None:
+            counters = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+            self._stats[namespace] = counters
+        return counters
+
+    def ttl_for(self, namespace: str) -> int:
+        """Get the TTL in seconds for a namespace"""
+        return self.ttls.get(namespace, self.default_ttl)
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            counters = self._counter(namespace)
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, size, expires_at FROM entries WHERE namespace = ? AND key = ?",
+                    (namespace, key)
+                ).fetchone()
+                now = time.time()
+                if row is None:
+                    counters['misses'] += 1
+                    return None
+                value, size, expires_at = row
+                if expires_at <= now:
+                    conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+                    self._total_bytes -= size
+                    counters['misses'] += 1
+                    return None
+                conn.execute(
+                    "UPDATE entries SET last_access = ? WHERE namespace = ? AND key = ?",
+                    (now, namespace, key)
+                )
+                counters['hits'] += 1
+                return json.loads(zlib.decompress(value).decode('utf-8'))
+            except (sqlite3.Error, OSError, zlib.error, ValueError) as e:
+                logger.debug(f"Cache read failed for {namespace}: {e}")
+                counters['misses'] += 1
+                return None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Store a JSON-serializable value; returns False if it was not stored"""
+        if not self.enabled:
+            return False
+        ttl = self.ttl_for(namespace) if ttl is None else ttl
+        if ttl <= 0:
+            return False
+        try:
+            blob = zlib.compress(json.dumps(value, default=str, ensure_ascii=False).encode('utf-8'))
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Cache value for {namespace} is not serializable: {e}")
+            return False
+        size = len(blob)
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            try:
+                conn = self._connect()
+                now = time.time()
+                previous = conn.execute(
+                    "SELECT size FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+                ).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries"
+                    " (namespace, key, value, size, created_at, expires_at, last_access)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (namespace, key, sqlite3.Binary(blob), size, now, now + ttl, now)
+                )
+                self._total_bytes += size - (previous[0] if previous else 0)
+                self._counter(namespace)['writes'] += 1
+                if self._total_bytes > self.max_bytes:
+                    self._evict(conn, now)
+                return True
+            except (sqlite3.Error, OSError) as e:
+                logger.debug(f"Cache write failed for {namespace}: {e}")
+                return False
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then least recently used ones until under the size limit"""
+        expired = conn.execute(
+            "SELECT namespace, size FROM entries WHERE expires_at <= ?", (now,)
+        ).fetchall()
+        if expired:
+            conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+            for namespace, size in expired:
+                self._total_bytes -= size
+                self._counter(namespace)['evictions'] += 1
+
+        # Evict down to 90% of the limit so we do not evict on every write
+        target = int(self.max_bytes * 0.9)
+        while self._total_bytes > target:
+            rows = conn.execute(
+                "SELECT namespace, key, size FROM entries ORDER BY last_access ASC LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+            for namespace, key, size in rows:
+                conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+                self._total_bytes -= size
+                self._counter(namespace)['evictions'] += 1
+                if self._total_bytes <= target:
+                    break
+
+    def delete(self, namespace: str, key: str):
+        """Remove a single entry"""
+        if not self.enabled:
+            return
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT size FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+                ).fetchone()
+                if row:
+                    conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+                    self._total_bytes -= row[0]
+            except (sqlite3.Error, OSError) as e:
+                logger.debug(f"Cache delete failed for {namespace}: {e}")
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        """Remove all entries, or only those of one namespace; returns the count removed"""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            try:
+                conn = self._connect()
+                if namespace:
+                    cursor = conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+                else:
+                    cursor = conn.execute("DELETE FROM entries")
+                row = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+                self._total_bytes = row[0]
+                return cursor.rowcount
+            except (sqlite3.Error, OSError) as e:
+                logger.debug(f"Cache clear failed: {e}")
+                return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and storage usage per namespace"""
+        with self._lock:
+            namespaces: Dict[str, Dict[str, Any]] = {}
+            if self.enabled:
+                try:
+                    conn = self._connect()
+                    for namespace, count, size in conn.execute(
+                        "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) FROM entries GROUP BY namespace"
+                    ):
+                        namespaces[namespace] = {'entries': count, 'size_bytes': size}
+                except (sqlite3.Error, OSError) as e:
+                    logger.debug(f"Cache stats failed: {e}")
+
+            for namespace, counters in self._stats.items():
+                info = namespaces.setdefault(namespace, {'entries': 0, 'size_bytes': 0})
+                lookups = counters['hits'] + counters['misses']
+                info.update(counters)
+                info['hit_rate'] = round(counters['hits'] / lookups, 3) if lookups else 0.0
+                info['ttl_seconds'] = self.ttl_for(namespace)
+
+            return {
+                'enabled': self.enabled,
+                'path': self.path,
+                'size_bytes': self._total_bytes,
+                'max_size_bytes': self.max_bytes,
+                'namespaces': namespaces,
+            }
+
+    async def aget(self, namespace: str, key: str) -> Optional[Any]:
+        """Async variant of get that runs the lookup in a worker thread"""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self.get, namespace, key)
+
+    async def aset(self, namespace: str, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Async variant of set that runs the write in a worker thread"""
+        if not self.enabled:
+            return False
+        return await asyncio.to_thread(self.set, namespace, key, value, ttl)
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -6,21 +6,26 @@ Handles conversion of PDF, Office, and ZIP files to Markdown format
 import asyncio
 import io
 import os
-import tempfile
 import zipfile
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any
 from pathlib import Path
-import requests
-from markitdown import MarkItDown
+import aiohttp
 import base64
 from urllib.parse import urlparse, unquote
 import logging
 
+from .http_client import http_pool
+from .conversion_pool import conversion_pool
+
 class FileProcessor:
     """Process various file formats using MarkItDown"""
     
-    def __init__(self):
-        self.markitdown = MarkItDown()
+    def __init__(self, max_archive_members: int = 500, max_archive_size_mb: int = 500):
+        # MarkItDown runs in the conversion pool's worker processes
+        self.conversion_pool = conversion_pool
+        # Caps that keep large or malicious archives from exhausting memory
+        self.max_archive_members = max(1, max_archive_members)
+        self.max_archive_bytes = max_archive_size_mb * 1024 * 1024
         self.supported_extensions = {
             # PDF files
             '.pdf': 'PDF Document',
@@ -57,9 +62,7 @@ class FileProcessor:
             # If no extension found but it might be a known format, try to infer
             if not is_supported and file_path_or_url.startswith('http'):
                 # Check for common patterns
-                if '/html' in file_path_or_url or 'html' in file_path_or_url:
-                    return True
-                elif 'README' in file_path_or_url.upper() and not ext:
+                if 'README' in file_path_or_url.upper() and not ext:
                     return True
             
             return is_supported
@@ -81,130 +84,300 @@ class FileProcessor:
             # If no extension found but it might be a known format, try to infer
             if not file_type and file_path_or_url.startswith('http'):
                 # Check for common patterns
-                if '/html' in file_path_or_url or 'html' in file_path_or_url:
-                    return 'HTML Document'
-                elif 'README' in file_path_or_url.upper() and not ext:
+                if 'README' in file_path_or_url.upper() and not ext:
                     return 'Text File'
             
             return file_type
         except Exception:
             return None
     
-    async def download_file(self, url: str, max_size_mb: int = 100) -> bytes:
-        """Download file from URL with size limit"""
-        try:
-            response = requests.get(url, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            # Check content length
-            content_length = response.headers.get('content-length')
-            if content_length:
-                size_mb = int(content_length) / (1024 * 1024)
-                if size_mb > max_size_mb:
-                    raise ValueError(f"File too large: {size_mb:.1f}MB (max: {max_size_mb}MB)")
-            
-            # Download with size limit
-            content = b""
-            max_bytes = max_size_mb * 1024 * 1024
-            
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    content += chunk
-                    if len(content) > max_bytes:
-                        raise ValueError(f"File too large: exceeds {max_size_mb}MB limit")
-            
-            return content
+    async def download_file(
+        self,
+        url: str,
+        max_size_mb: int = 100,
+        max_retries: int = 3,
+        headers: Optional[Dict[str, str]] = None,
+        cookies: Optional[Dict[str, str]] = None
+    ) -> bytearray:
+        """Download file from URL with size limit, resuming interrupted transfers
+        
+        headers and cookies are sent with every request, e.g. for authenticated endpoints.
+        """
+        max_bytes = max_size_mb * 1024 * 1024
+        session = http_pool.get_session()
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30)
+        
+        buffer = bytearray()
+        received = 0
+        expected_size = None
+        resumable = True
+        attempt = 0
+        
+        while True:
+            # Ask for the raw bytes: with a content coding, Content-Length and Range
+            # offsets count encoded bytes while aiohttp hands back decoded ones
+            request_headers = {**(headers or {}), 'Accept-Encoding': 'identity'}
+            if received:
+                request_headers['Range'] = f'bytes={received}-'
+            try:
+                async with session.get(
+                    url, headers=request_headers, cookies=cookies, timeout=timeout, allow_redirects=True
+                ) as response:
+                    if received and response.status == 200:
+                        # Server ignored the range request; start over
+                        received = 0
+                    elif response.status == 416 and expected_size == received:
+                        # Everything was already received before the connection dropped
+                        break
+                    response.raise_for_status()
+                    
+                    if not received:
+                        # Servers that encode anyway can only be re-downloaded from the start
+                        resumable = response.headers.get('content-encoding', 'identity').lower() == 'identity'
+                        # Check content length (only meaningful for unencoded bodies)
+                        content_length = response.headers.get('content-length') if resumable else None
+                        expected_size = int(content_length) if content_length else None
+                        if expected_size is not None and expected_size > max_bytes:
+                            size_mb = expected_size / (1024 * 1024)
+                            raise ValueError(f"File too large: {size_mb:.1f}MB (max: {max_size_mb}MB)")
+                        # Preallocate when the size is known so chunks are copied in place
+                        buffer = bytearray(expected_size) if expected_size else bytearray()
+                    
+                    # Download with size limit
+                    async for chunk in response.content.iter_chunked(65536):
+                        end = received + len(chunk)
+                        if end > max_bytes:
+                            raise ValueError(f"File too large: exceeds {max_size_mb}MB limit")
+                        if end <= len(buffer):
+                            buffer[received:end] = chunk
+                        else:
+                            del buffer[received:]
+                            buffer.extend(chunk)
+                        received = end
+                    
+                    if expected_size is None or received >= expected_size:
+                        break
+                    raise aiohttp.ClientPayloadError(f"Connection closed after {received} of {expected_size} bytes")
             
-        except requests.RequestException as e:
-            raise ValueError(f"Failed to download file: {str(e)}")
+            except (aiohttp.ClientPayloadError, aiohttp.ServerDisconnectedError, asyncio.TimeoutError) as e:
+                attempt += 1
+                if attempt > max_retries:
+                    raise ValueError(f"Failed to download file: {str(e) or type(e).__name__}")
+                if not resumable:
+                    received = 0
+                # Resume from the last received byte with a Range request
+                await asyncio.sleep(0.5 * attempt)
+            except aiohttp.ClientError as e:
+                raise ValueError(f"Failed to download file: {str(e)}")
+        
+        # Drop any unused preallocated tail
+        del buffer[received:]
+        return buffer
     
-    def extract_zip_contents(self, zip_data: bytes) -> Dict[str, Any]:
-        """Extract and process contents of ZIP file"""
-        extracted_files = []
+    @staticmethod
+    def _read_zip_member(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, limit: int) -> bytes:
+        """Decompress one member, refusing to inflate past limit bytes"""
+        with zip_ref.open(info) as file:
+            data = file.read(limit + 1)
+        if len(data) > limit:
+            raise ValueError("Member exceeds the remaining archive size limit")
+        return data
+    
+    async def iter_zip_contents(
+        self,
+        zip_data: bytes,
+        summary: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Convert archive members in parallel, yielding each result as it completes
         
+        Members are decompressed one at a time and handed to the conversion
+        pool; at most two per worker are held in memory. Processing stops
+        after max_archive_members members or max_archive_bytes of
+        decompressed data, and the optional summary dict records the totals.
+        """
         try:
-            with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_ref:
-                file_list = zip_ref.namelist()
-                
-                for file_name in file_list:
-                    # Skip directories and hidden files
-                    if file_name.endswith('/') or file_name.startswith('.'):
+            zip_ref = zipfile.ZipFile(io.BytesIO(zip_data), 'r')
+        except zipfile.BadZipFile:
+            raise ValueError("Invalid ZIP file format")
+        
+        summary = summary if summary is not None else {}
+        summary.update({'total_files': len(zip_ref.infolist()), 'skipped_files': 0, 'limit_reached': None})
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        slots = asyncio.Semaphore(self.conversion_pool.max_workers * 2)
+        conversions = set()
+        
+        async def convert_member(index: int, file_name: str, file_content: bytes):
+            try:
+                # Convert to markdown in a worker process
+                result = await self.conversion_pool.convert(file_content, Path(file_name).suffix)
+                entry = {
+                    'index': index,
+                    'name': file_name,
+                    'type': self.get_file_type(file_name),
+                    'size': len(file_content),
+                    'content': result['content'],
+                    'title': result['title'],
+                    'metadata': result['metadata'],
+                    'error': None
+                }
+            except Exception as e:
+                entry = {
+                    'index': index,
+                    'name': file_name,
+                    'type': self.get_file_type(file_name),
+                    'size': len(file_content),
+                    'content': None,
+                    'error': f"Conversion failed: {str(e)}"
+                }
+            finally:
+                slots.release()
+            await queue.put(entry)
+        
+        async def produce():
+            remaining_bytes = self.max_archive_bytes
+            members = [
+                info for info in zip_ref.infolist()
+                # Skip directories and hidden files
+                if not info.is_dir() and not info.filename.startswith('.')
+            ]
+            
+            try:
+                for index, info in enumerate(members):
+                    file_name = info.filename
+                    if index >= self.max_archive_members:
+                        summary['skipped_files'] = len(members) - index
+                        summary['limit_reached'] = f"member limit ({self.max_archive_members})"
+                        break
+                    
+                    # Check if file is supported
+                    if not self.is_supported_file(file_name):
+                        await queue.put({
+                            'index': index,
+                            'name': file_name,
+                            'type': 'unsupported',
+                            'size': info.file_size,
+                            'content': None,
+                            'error': 'Unsupported file format'
+                        })
                         continue
                     
-                    try:
-                        # Check if file is supported
-                        if not self.is_supported_file(file_name):
-                            extracted_files.append({
-                                'name': file_name,
-                                'type': 'unsupported',
-                                'size': zip_ref.getinfo(file_name).file_size,
-                                'content': None,
-                                'error': 'Unsupported file format'
-                            })
-                            continue
-                        
-                        # Extract file content
-                        with zip_ref.open(file_name) as file:
-                            file_content = file.read()
-                            
-                            # Create temporary file for MarkItDown processing
-                            with tempfile.NamedTemporaryFile(suffix=Path(file_name).suffix, delete=False) as temp_file:
-                                temp_file.write(file_content)
-                                temp_file.flush()
-                                
-                                try:
-                                    # Convert to markdown
-                                    result = self.markitdown.convert(temp_file.name)
-                                    extracted_files.append({
-                                        'name': file_name,
-                                        'type': self.get_file_type(file_name),
-                                        'size': len(file_content),
-                                        'content': result.text_content,
-                                        'title': getattr(result, 'title', None),
-                                        'metadata': getattr(result, 'metadata', {}),
-                                        'error': None
-                                    })
-                                except Exception as e:
-                                    extracted_files.append({
-                                        'name': file_name,
-                                        'type': self.get_file_type(file_name),
-                                        'size': len(file_content),
-                                        'content': None,
-                                        'error': f"Conversion failed: {str(e)}"
-                                    })
-                                finally:
-                                    # Clean up temp file
-                                    try:
-                                        os.unlink(temp_file.name)
-                                    except:
-                                        pass
+                    if info.file_size > remaining_bytes:
+                        summary['limit_reached'] = f"size limit ({self.max_archive_bytes // (1024 * 1024)}MB)"
+                        await queue.put({
+                            'index': index,
+                            'name': file_name,
+                            'type': self.get_file_type(file_name),
+                            'size': info.file_size,
+                            'content': None,
+                            'error': 'Skipped: archive size limit reached'
+                        })
+                        continue
                     
+                    await slots.acquire()
+                    try:
+                        # Extract file content off the event loop, bounded by the remaining budget
+                        file_content = await asyncio.to_thread(self._read_zip_member, zip_ref, info, remaining_bytes)
                     except Exception as e:
-                        extracted_files.append({
+                        slots.release()
+                        await queue.put({
+                            'index': index,
                             'name': file_name,
                             'type': 'error',
                             'size': 0,
                             'content': None,
                             'error': f"Extraction failed: {str(e)}"
                         })
+                        continue
+                    
+                    remaining_bytes -= len(file_content)
+                    conversions.add(asyncio.create_task(convert_member(index, file_name, file_content)))
                 
-                return {
-                    'total_files': len(file_list),
-                    'processed_files': len(extracted_files),
-                    'files': extracted_files
-                }
+                if conversions:
+                    await asyncio.gather(*conversions)
+            finally:
+                await queue.put(finished)
         
-        except zipfile.BadZipFile:
-            raise ValueError("Invalid ZIP file format")
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                entry = await queue.get()
+                if entry is finished:
+                    break
+                yield entry
+            # Surface unexpected producer errors
+            await producer
+        finally:
+            for task in [producer, *conversions]:
+                if not task.done():
+                    task.cancel()
+            zip_ref.close()
+    
+    async def extract_zip_contents(
+        self,
+        zip_data: bytes,
+        on_member: Optional[Callable[[Dict[str, Any], int], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """Extract and process contents of ZIP file
+        
+        Args:
+            zip_data: Archive bytes
+            on_member: Optional coroutine called with each member result and the
+                number of members finished so far, as soon as that member is done.
+                The returned listing then holds only member metadata, so converted
+                content is not accumulated for the whole archive.
+        """
+        extracted_files = []
+        summary: Dict[str, Any] = {}
+        
+        try:
+            async for entry in self.iter_zip_contents(zip_data, summary):
+                if on_member is None:
+                    extracted_files.append(entry)
+                    continue
+                extracted_files.append({
+                    'index': entry['index'],
+                    'name': entry['name'],
+                    'type': entry['type'],
+                    'size': entry['size'],
+                    'success': entry['error'] is None,
+                    'error': entry['error']
+                })
+                await on_member(entry, len(extracted_files))
+            
+            # Report members in archive order regardless of completion order
+            extracted_files.sort(key=lambda entry: entry['index'])
+            return {
+                'total_files': summary['total_files'],
+                'processed_files': len(extracted_files),
+                'skipped_files': summary['skipped_files'],
+                'limit_reached': summary['limit_reached'],
+                'files': extracted_files
+            }
+        
+        except ValueError:
+            raise
         except Exception as e:
             raise ValueError(f"ZIP processing failed: {str(e)}")
     
-    async def process_file_from_url(self, url: str, max_size_mb: int = 100) -> Dict[str, Any]:
-        """Process file from URL"""
+    async def process_file_from_url(
+        self,
+        url: str,
+        max_size_mb: int = 100,
+        on_member: Optional[Callable[[Dict[str, Any], int], Awaitable[None]]] = None,
+        suffix: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Process file from URL (on_member receives ZIP member results as they finish)
+        
+        suffix overrides the extension taken from the URL, e.g. when the
+        format was detected from the response of ``/download?id=123``.
+        """
         # Get file type early to avoid reference errors
-        file_type = self.get_file_type(url)
+        suffix = suffix or Path(unquote(urlparse(url).path)).suffix.lower()
+        file_type = self.supported_extensions.get(suffix) or self.get_file_type(url)
         
-        if not self.is_supported_file(url):
+        if suffix not in self.supported_extensions and not self.is_supported_file(url):
             return {
                 'success': False,
                 'error': f"Unsupported file format. Supported: {', '.join(self.supported_extensions.keys())}",
@@ -216,8 +389,8 @@ class FileProcessor:
             file_data = await self.download_file(url, max_size_mb)
             
             # Handle ZIP files specially
-            if url.lower().endswith('.zip'):
-                zip_contents = self.extract_zip_contents(file_data)
+            if suffix == '.zip':
+                zip_contents = await self.extract_zip_contents(file_data, on_member)
                 return {
                     'success': True,
                     'url': url,
@@ -228,29 +401,18 @@ class FileProcessor:
                     'archive_contents': zip_contents
                 }
             
-            # Process single file
-            with tempfile.NamedTemporaryFile(suffix=Path(url).suffix, delete=False) as temp_file:
-                temp_file.write(file_data)
-                temp_file.flush()
-                
-                try:
-                    result = self.markitdown.convert(temp_file.name)
-                    return {
-                        'success': True,
-                        'url': url,
-                        'file_type': file_type,
-                        'size_bytes': len(file_data),
-                        'is_archive': False,
-                        'content': result.text_content,
-                        'title': getattr(result, 'title', None),
-                        'metadata': getattr(result, 'metadata', {})
-                    }
-                finally:
-                    # Clean up temp file
-                    try:
-                        os.unlink(temp_file.name)
-                    except:
-                        pass
+            # Process single file in a worker process
+            result = await self.conversion_pool.convert(file_data, suffix)
+            return {
+                'success': True,
+                'url': url,
+                'file_type': file_type,
+                'size_bytes': len(file_data),
+                'is_archive': False,
+                'content': result['content'],
+                'title': result['title'],
+                'metadata': result['metadata']
+            }
         
         except Exception as e:
             return {
@@ -260,8 +422,13 @@ class FileProcessor:
                 'file_type': file_type
             }
     
-    async def process_file_from_data(self, file_data: bytes, filename: str) -> Dict[str, Any]:
-        """Process file from binary data"""
+    async def process_file_from_data(
+        self,
+        file_data: bytes,
+        filename: str,
+        on_member: Optional[Callable[[Dict[str, Any], int], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """Process file from binary data (on_member receives ZIP member results as they finish)"""
         # Get file type early to avoid reference errors
         file_type = self.get_file_type(filename)
         
@@ -276,7 +443,7 @@ class FileProcessor:
             
             # Handle ZIP files specially
             if filename.lower().endswith('.zip'):
-                zip_contents = self.extract_zip_contents(file_data)
+                zip_contents = await self.extract_zip_contents(file_data, on_member)
                 return {
                     'success': True,
                     'filename': filename,
@@ -287,29 +454,18 @@ class FileProcessor:
                     'archive_contents': zip_contents
                 }
             
-            # Process single file
-            with tempfile.NamedTemporaryFile(suffix=Path(filename).suffix, delete=False) as temp_file:
-                temp_file.write(file_data)
-                temp_file.flush()
-                
-                try:
-                    result = self.markitdown.convert(temp_file.name)
-                    return {
-                        'success': True,
-                        'filename': filename,
-                        'file_type': file_type,
-                        'size_bytes': len(file_data),
-                        'is_archive': False,
-                        'content': result.text_content,
-                        'title': getattr(result, 'title', None),
-                        'metadata': getattr(result, 'metadata', {})
-                    }
-                finally:
-                    # Clean up temp file
-                    try:
-                        os.unlink(temp_file.name)
-                    except:
-                        pass
+            # Process single file in a worker process
+            result = await self.conversion_pool.convert(file_data, Path(filename).suffix)
+            return {
+                'success': True,
+                'filename': filename,
+                'file_type': file_type,
+                'size_bytes': len(file_data),
+                'is_archive': False,
+                'content': result['content'],
+                'title': result['title'],
+                'metadata': result['metadata']
+            }
         
         except Exception as e:
             return {
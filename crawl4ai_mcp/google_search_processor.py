@@ -5,18 +5,25 @@ Handles Google search queries and result processing
 
 import asyncio
 import re
-from typing import Dict, List, Optional, Any, Union, Tuple
+import threading
+from typing import AsyncIterator, Dict, List, Optional, Any, Union, Tuple
 from urllib.parse import urlparse, urljoin
 from googlesearch import search
 import aiohttp
 import logging
 from bs4 import BeautifulSoup
 
+from .http_client import http_pool
+
 
 class GoogleSearchProcessor:
     """Process Google search queries and return structured results"""
     
-    def __init__(self):
+    def __init__(self, max_concurrent_enrichment: int = 16, max_enrichment_bytes: int = 65536):
+        # Title/snippet lookups run concurrently over the shared HTTP session
+        self.max_concurrent_enrichment = max(1, max_concurrent_enrichment)
+        # Stop reading a page after this many bytes even if no paragraphs were seen
+        self.max_enrichment_bytes = max_enrichment_bytes
         self.search_patterns = [
             # Domain-specific search patterns
             r'site:([^\s]+)',
@@ -89,58 +96,17 @@ class GoogleSearchProcessor:
                     'query': query
                 }
             
-            # Apply genre-specific query modifications
-            enhanced_query = self._enhance_query_with_genre(query, search_genre)
-            
-            # Limit results to reasonable range
-            num_results = max(1, min(100, num_results))
-            
             # Perform search
-            search_results = []
             try:
-                # Run search in executor to avoid blocking
-                loop = asyncio.get_event_loop()
-                
-                def do_search():
-                    return list(search(
-                        enhanced_query,
+                urls = [
+                    url async for url in self.stream_search_urls(
+                        query,
                         num_results=num_results,
-                        lang=language,
-                        sleep_interval=1.0,  # Respectful delay between requests
+                        language=language,
                         region=region,
-                        safe='active'  # Always use safe search as requested
-                    ))
-                
-                urls = await loop.run_in_executor(None, do_search)
-                
-                # Process results and try to get titles/snippets
-                for i, url in enumerate(urls):
-                    if not url:
-                        continue
-                        
-                    try:
-                        parsed_url = urlparse(url)
-                        domain = parsed_url.netloc
-                        
-                        # Try to extract title and snippet with a lightweight request
-                        title, snippet = await self._extract_title_and_snippet(url)
-                        
-                        # Extract basic information
-                        result = {
-                            'rank': i + 1,
-                            'url': url,
-                            'domain': domain,
-                            'title': title,
-                            'snippet': snippet,
-                            'type': self._classify_url(url)
-                        }
-                        
-                        search_results.append(result)
-                        
-                    except Exception as e:
-                        # Skip malformed URLs but continue processing
-                        continue
-                
+                        search_genre=search_genre
+                    )
+                ]
             except Exception as search_error:
                 return {
                     'success': False,
@@ -149,50 +115,14 @@ class GoogleSearchProcessor:
                     'suggestion': 'Try a different search query or check your internet connection'
                 }
             
-            if not search_results:
-                return {
-                    'success': False,
-                    'error': 'No search results found',
-                    'query': query,
-                    'suggestion': 'Try a broader or different search query'
-                }
-            
-            # Generate search statistics
-            domains = [result['domain'] for result in search_results]
-            unique_domains = list(set(domains))
-            domain_counts = {domain: domains.count(domain) for domain in unique_domains}
-            
-            # Classify result types
-            type_counts = {}
-            for result in search_results:
-                result_type = result['type']
-                type_counts[result_type] = type_counts.get(result_type, 0) + 1
-            
-            return {
-                'success': True,
-                'query': query,
-                'enhanced_query': enhanced_query,
-                'total_results': len(search_results),
-                'results': search_results,
-                'search_metadata': {
-                    'query_info': validation,
-                    'search_params': {
-                        'num_results_requested': num_results,
-                        'language': language,
-                        'region': region,
-                        'safe_search': True,  # Always enabled
-                        'search_genre': search_genre,
-                        'enhanced_query': enhanced_query
-                    },
-                    'result_stats': {
-                        'total_results': len(search_results),
-                        'unique_domains': len(unique_domains),
-                        'domain_distribution': domain_counts,
-                        'result_types': type_counts
-                    }
-                },
-                'processing_method': 'googlesearch-python'
-            }
+            return await self.build_search_response(
+                query,
+                urls,
+                num_results=num_results,
+                language=language,
+                region=region,
+                search_genre=search_genre
+            )
             
         except Exception as e:
             return {
@@ -201,6 +131,161 @@ class GoogleSearchProcessor:
                 'query': query
             }
     
+    async def stream_search_urls(
+        self,
+        query: str,
+        num_results: int = 10,
+        language: str = 'en',
+        region: str = 'us',
+        search_genre: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Yield result URLs as soon as Google returns them, so callers can start work early"""
+        validation = self.validate_query(query)
+        if not validation['valid']:
+            raise ValueError(validation['error'])
+        
+        # Apply genre-specific query modifications
+        enhanced_query = self._enhance_query_with_genre(query, search_genre)
+        
+        # Limit results to reasonable range
+        num_results = max(1, min(100, num_results))
+        
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        stop = threading.Event()
+        
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # Event loop already closed; nobody is listening any more
+                stop.set()
+        
+        def do_search():
+            # The search generator fetches result pages lazily, so URLs are
+            # handed over as each page arrives instead of after the last one
+            try:
+                for url in search(
+                    enhanced_query,
+                    num_results=num_results,
+                    lang=language,
+                    sleep_interval=1.0,  # Respectful delay between requests
+                    region=region,
+                    safe='active'  # Always use safe search as requested
+                ):
+                    if stop.is_set():
+                        break
+                    put(url)
+            except Exception as e:
+                put(e)
+            finally:
+                put(finished)
+        
+        # Run search in executor to avoid blocking
+        loop.run_in_executor(None, do_search)
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if item:
+                    yield item
+        finally:
+            stop.set()
+    
+    async def build_search_response(
+        self,
+        query: str,
+        urls: List[str],
+        num_results: int = 10,
+        language: str = 'en',
+        region: str = 'us',
+        search_genre: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Enrich search result URLs with titles/snippets and compute result statistics"""
+        validation = self.validate_query(query)
+        enhanced_query = self._enhance_query_with_genre(query, search_genre)
+        num_results = max(1, min(100, num_results))
+        
+        # Fetch titles/snippets for all results concurrently
+        semaphore = asyncio.Semaphore(self.max_concurrent_enrichment)
+        
+        async def enrich(rank: int, url: str) -> Optional[Dict[str, Any]]:
+            try:
+                parsed_url = urlparse(url)
+                domain = parsed_url.netloc
+                
+                # Try to extract title and snippet with a lightweight request
+                async with semaphore:
+                    title, snippet = await self._extract_title_and_snippet(url)
+                
+                # Extract basic information
+                return {
+                    'rank': rank,
+                    'url': url,
+                    'domain': domain,
+                    'title': title,
+                    'snippet': snippet,
+                    'type': self._classify_url(url)
+                }
+                
+            except Exception as e:
+                # Skip malformed URLs but continue processing
+                return None
+        
+        enriched = await asyncio.gather(*[
+            enrich(i + 1, url) for i, url in enumerate(urls) if url
+        ])
+        search_results = [result for result in enriched if result is not None]
+        
+        if not search_results:
+            return {
+                'success': False,
+                'error': 'No search results found',
+                'query': query,
+                'suggestion': 'Try a broader or different search query'
+            }
+        
+        # Generate search statistics
+        domains = [result['domain'] for result in search_results]
+        unique_domains = list(set(domains))
+        domain_counts = {domain: domains.count(domain) for domain in unique_domains}
+        
+        # Classify result types
+        type_counts = {}
+        for result in search_results:
+            result_type = result['type']
+            type_counts[result_type] = type_counts.get(result_type, 0) + 1
+        
+        return {
+            'success': True,
+            'query': query,
+            'enhanced_query': enhanced_query,
+            'total_results': len(search_results),
+            'results': search_results,
+            'search_metadata': {
+                'query_info': validation,
+                'search_params': {
+                    'num_results_requested': num_results,
+                    'language': language,
+                    'region': region,
+                    'safe_search': True,  # Always enabled
+                    'search_genre': search_genre,
+                    'enhanced_query': enhanced_query
+                },
+                'result_stats': {
+                    'total_results': len(search_results),
+                    'unique_domains': len(unique_domains),
+                    'domain_distribution': domain_counts,
+                    'result_types': type_counts
+                }
+            },
+            'processing_method': 'googlesearch-python'
+        }
+    
     def _enhance_query_with_genre(self, query: str, genre: Optional[str]) -> str:
         """Enhance search query based on specified genre"""
         if not genre:
@@ -320,77 +405,89 @@ class GoogleSearchProcessor:
             'advanced': 'Advanced and expert-level content'
         }
     
+    async def _read_head_and_paragraphs(self, response: aiohttp.ClientResponse, paragraphs: int = 3) -> bytes:
+        """Read a page only until its <head> and first few paragraphs have arrived"""
+        buffer = bytearray()
+        
+        async for chunk in response.content.iter_chunked(4096):
+            buffer.extend(chunk)
+            if len(buffer) >= self.max_enrichment_bytes:
+                break
+            
+            lowered = bytes(buffer).lower()
+            head_end = lowered.find(b'</head>')
+            if head_end < 0:
+                continue
+            # A meta description makes the paragraphs unnecessary
+            if b'description' in lowered[:head_end]:
+                break
+            if lowered.count(b'</p>', head_end) >= paragraphs:
+                break
+        
+        return bytes(buffer[:self.max_enrichment_bytes])
+    
     async def _extract_title_and_snippet(self, url: str, timeout: int = 5) -> Tuple[str, str]:
-        """Extract title and snippet from URL with lightweight HEAD/GET request"""
+        """Extract title and snippet from URL with a lightweight GET over the shared session"""
         try:
-            # Set up headers to appear as a regular browser
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
-            
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-                async with session.get(url, headers=headers, allow_redirects=True) as response:
-                    # Only process if we get a successful response
-                    if response.status != 200:
-                        return "Unable to fetch title", "Page not accessible"
-                    
-                    # Check content type
-                    content_type = response.headers.get('content-type', '').lower()
-                    if 'text/html' not in content_type:
-                        # For non-HTML content, generate descriptive title/snippet
-                        if 'pdf' in content_type:
-                            return "PDF Document", "PDF file content"
-                        elif 'json' in content_type:
-                            return "JSON Data", "JSON API response"
-                        else:
-                            return "File Content", f"Content type: {content_type}"
-                    
-                    # Read only first 8KB to get title and meta description
-                    content_bytes = await response.content.read(8192)
-                    content = content_bytes.decode('utf-8', errors='ignore')
-                    
-                    # Parse HTML with BeautifulSoup
-                    soup = BeautifulSoup(content, 'html.parser')
-                    
-                    # Extract title
-                    title = "No title"
-                    title_tag = soup.find('title')
-                    if title_tag and title_tag.string:
-                        title = title_tag.string.strip()
-                        # Clean up title (remove extra whitespace, limit length)
-                        title = ' '.join(title.split())
-                        if len(title) > 100:
-                            title = title[:97] + "..."
-                    
-                    # Extract snippet from meta description or first paragraph
-                    snippet = "No description available"
-                    
-                    # Try meta description first
-                    meta_desc = soup.find('meta', attrs={'name': 'description'})
-                    if not meta_desc:
-                        meta_desc = soup.find('meta', attrs={'property': 'og:description'})
-                    
-                    if meta_desc and meta_desc.get('content'):
-                        snippet = meta_desc.get('content').strip()
+            session = http_pool.get_session()
+            async with session.get(url, allow_redirects=True, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                # Only process if we get a successful response
+                if response.status != 200:
+                    return "Unable to fetch title", "Page not accessible"
+                
+                # Check content type
+                content_type = response.headers.get('content-type', '').lower()
+                if 'text/html' not in content_type:
+                    # For non-HTML content, generate descriptive title/snippet
+                    if 'pdf' in content_type:
+                        return "PDF Document", "PDF file content"
+                    elif 'json' in content_type:
+                        return "JSON Data", "JSON API response"
                     else:
-                        # Fallback to first paragraph
-                        paragraphs = soup.find_all('p')
-                        for p in paragraphs[:3]:  # Check first 3 paragraphs
-                            text = p.get_text().strip()
-                            if len(text) > 20:  # Must have substantial content
-                                snippet = text
-                                break
-                    
-                    # Clean up snippet
-                    snippet = ' '.join(snippet.split())
-                    if len(snippet) > 200:
-                        snippet = snippet[:197] + "..."
-                    
-                    return title, snippet
+                        return "File Content", f"Content type: {content_type}"
+                
+                # Read only the head and first paragraphs to get title and description
+                content_bytes = await self._read_head_and_paragraphs(response)
+                content = content_bytes.decode(response.charset or 'utf-8', errors='ignore')
+                
+                # Parse HTML with BeautifulSoup
+                soup = BeautifulSoup(content, 'html.parser')
+                
+                # Extract title
+                title = "No title"
+                title_tag = soup.find('title')
+                if title_tag and title_tag.string:
+                    title = title_tag.string.strip()
+                    # Clean up title (remove extra whitespace, limit length)
+                    title = ' '.join(title.split())
+                    if len(title) > 100:
+                        title = title[:97] + "..."
+                
+                # Extract snippet from meta description or first paragraph
+                snippet = "No description available"
+                
+                # Try meta description first
+                meta_desc = soup.find('meta', attrs={'name': 'description'})
+                if not meta_desc:
+                    meta_desc = soup.find('meta', attrs={'property': 'og:description'})
+                
+                if meta_desc and meta_desc.get('content'):
+                    snippet = meta_desc.get('content').strip()
+                else:
+                    # Fallback to first paragraph
+                    paragraphs = soup.find_all('p')
+                    for p in paragraphs[:3]:  # Check first 3 paragraphs
+                        text = p.get_text().strip()
+                        if len(text) > 20:  # Must have substantial content
+                            snippet = text
+                            break
+                
+                # Clean up snippet
+                snippet = ' '.join(snippet.split())
+                if len(snippet) > 200:
+                    snippet = snippet[:197] + "..."
+                
+                return title, snippet
                     
         except asyncio.TimeoutError:
             return "Timeout loading page", "Page took too long to load"
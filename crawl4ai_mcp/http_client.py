@@ -0,0 +1,110 @@
+"""
+HTTP Client Module
+Long-lived aiohttp session with connection pooling, keep-alive and DNS
+caching for the plain HTTP requests made outside the browser
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+
+logger = logging.getLogger(__name__)
+
+# Headers that make plain HTTP requests look like a regular browser
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+
+class HttpSessionPool:
+    """Process-wide aiohttp session shared by the processors
+
+    The session (and its TCP connector) is created lazily on the running
+    event loop and recreated if the loop changes, e.g. when the RunPod
+    handler runs each job on a fresh loop.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 8,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sessions_created = 0
+
+    @classmethod
+    def from_env(cls) -> "HttpSessionPool":
+        """Create a session pool configured from HTTP_* environment variables"""
+        return cls(
+            limit=int(os.getenv("HTTP_POOL_LIMIT", "100")),
+            limit_per_host=int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "8")),
+            dns_cache_ttl=int(os.getenv("HTTP_DNS_CACHE_TTL", "300")),
+            keepalive_timeout=float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30")),
+        )
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is not None and (self._session.closed or self._loop is not loop):
+            if not self._session.closed:
+                # Connections belong to the old loop and cannot be closed from here
+                logger.debug("HTTP session moved to a new event loop; discarding stale session")
+            self._session = None
+
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=DEFAULT_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=10),
+            )
+            self._loop = loop
+            self._sessions_created += 1
+
+        return self._session
+
+    async def close(self):
+        """Close the shared session if it belongs to the running event loop"""
+        session, self._session = self._session, None
+        if session is None or session.closed:
+            return
+        try:
+            if self._loop is asyncio.get_running_loop():
+                await session.close()
+        except Exception as e:
+            logger.debug(f"Error closing HTTP session: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return connection pool settings and usage"""
+        return {
+            'limit': self.limit,
+            'limit_per_host': self.limit_per_host,
+            'dns_cache_ttl': self.dns_cache_ttl,
+            'keepalive_timeout': self.keepalive_timeout,
+            'sessions_created': self._sessions_created,
+            'open': self._session is not None and not self._session.closed,
+        }
+
+
+# Global session pool instance
+http_pool = HttpSessionPool.from_env()
@@ -0,0 +1,127 @@
+"""
+LLM Cache Module
+On-disk cache of LLM results keyed by provider, model, prompt and content,
+so identical extraction and summary requests are answered without a call
+"""
+
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .disk_cache import DiskCache, make_cache_key
+
+
+logger = logging.getLogger(__name__)
+
+# Results depend only on the key, so they stay valid as long as the model does
+LLM_CACHE_TTLS = {
+    "intelligent_extract": 7 * 24 * 3600,
+    "extract_structured_data": 7 * 24 * 3600,
+    "extract_entities": 7 * 24 * 3600,
+    "youtube_summary": 7 * 24 * 3600,
+    "batch_extract": 7 * 24 * 3600,
+}
+
+
+class LLMCache:
+    """LLM results stored per namespace (one per calling tool)
+
+    Keys hash the provider/model, endpoint, prompt, generation parameters
+    and a digest of the content, so a result is reused only when the call
+    would have been byte-identical. Identical calls that are already in
+    flight are coalesced into one.
+    """
+
+    def __init__(self, cache: DiskCache):
+        self.cache = cache
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._coalesced = 0
+
+    @classmethod
+    def from_env(cls) -> "LLMCache":
+        """Create a cache configured from LLM_CACHE_* environment variables"""
+        return cls(DiskCache.from_env(
+            "LLM_CACHE",
+            "llm.sqlite3",
+            default_ttls=LLM_CACHE_TTLS,
+            default_max_size_mb=256,
+        ))
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        prompt: str,
+        content: str = "",
+        base_url: Optional[str] = None,
+        **params: Any
+    ) -> str:
+        """Build the key for one LLM call; params are generation settings such as max_tokens"""
+        content_digest = hashlib.sha256(content.encode('utf-8', errors='replace')).hexdigest()
+        return make_cache_key(provider, base_url or "", prompt, content_digest, params)
+
+    async def get_or_call(
+        self,
+        namespace: str,
+        key: str,
+        producer: Callable[[], Awaitable[Any]],
+        should_cache: Optional[Callable[[Any], bool]] = None,
+        use_cache: bool = True
+    ) -> Any:
+        """Return the cached result for key, or await producer and cache what it returns
+
+        Results that are None, or rejected by should_cache (e.g. unparseable
+        responses), are returned but not stored. With use_cache=False the
+        stored result is ignored and the fresh one replaces it.
+        """
+        if use_cache:
+            cached = await self.cache.aget(namespace, key)
+            if cached is not None:
+                return cached
+
+        inflight = self._inflight.get((namespace, key))
+        if inflight is not None:
+            self._coalesced += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[(namespace, key)] = future
+        try:
+            value = await producer()
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved so a lone caller does not log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            self._inflight.pop((namespace, key), None)
+
+        if value is not None and (should_cache is None or should_cache(value)):
+            await self.cache.aset(namespace, key, value)
+        return value
+
+    async def aget(self, namespace: str, key: str) -> Any:
+        """Return a cached result, or None"""
+        return await self.cache.aget(namespace, key)
+
+    async def aset(self, namespace: str, key: str, value: Any):
+        """Store a result produced outside get_or_call (e.g. one page of a batched call)"""
+        await self.cache.aset(namespace, key, value)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit rates and storage usage per namespace"""
+        return {**self.cache.get_stats(), 'coalesced_calls': self._coalesced}
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        """Remove cached results; returns the count removed"""
+        return self.cache.clear(namespace)
+
+    def close(self):
+        """Close the database connection (reopened on next use)"""
+        self.cache.close()
+
+
+# Global LLM cache instance
+llm_cache = LLMCache.from_env()
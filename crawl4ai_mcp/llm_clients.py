@@ -0,0 +1,214 @@
+"""
+LLM Clients Module
+Long-lived per-provider LLM access: credentials passed per call, concurrency
+and rate limits per provider, and retries with backoff on throttling and
+server errors
+"""
+
+import asyncio
+import logging
+import os
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from .concurrency import AdaptiveRateLimiter
+
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: throttling, server errors and overload
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+RETRYABLE_ERROR_NAMES = {
+    'RateLimitError', 'InternalServerError', 'ServiceUnavailableError',
+    'APIConnectionError', 'APITimeoutError', 'Timeout',
+}
+
+
+class ProviderClient:
+    """Concurrency slots and an adaptive request rate for one provider"""
+
+    def __init__(self, name: str, max_concurrent: int, requests_per_second: float):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.rate_limiter = AdaptiveRateLimiter(
+            rate=requests_per_second,
+            min_rate=requests_per_second / 10,
+            max_rate=requests_per_second,
+            burst=max(1.0, min(float(self.max_concurrent), requests_per_second * 2)),
+            increase_step=requests_per_second / 20,
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.in_flight = 0
+        self._stats = {'calls': 0, 'retries': 0, 'failures': 0}
+
+    def semaphore(self) -> asyncio.Semaphore:
+        """Concurrency semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+        return self._semaphore
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            'in_flight': self.in_flight,
+            'max_concurrent': self.max_concurrent,
+            'rate_limiter': self.rate_limiter.get_stats(),
+        }
+
+
+class LLMClientPool:
+    """Registry of provider clients shared by all LLM tools
+
+    Providers are registered from ConfigManager on first use; a provider's
+    ``max_concurrent`` and ``requests_per_second`` settings override the
+    defaults. API key, base URL and API version travel with each call
+    instead of through litellm's module globals, so concurrent calls to
+    different providers cannot pick up each other's credentials. litellm
+    keeps one SDK client per provider, key and base URL, so connections stay
+    alive between calls without any shared module state.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        requests_per_second: float = 5.0,
+        max_retries: int = 4,
+        retry_base_delay: float = 1.0,
+        max_retry_delay: float = 30.0
+    ):
+        self.max_concurrent = max_concurrent
+        self.requests_per_second = requests_per_second
+        self.max_retries = max(0, max_retries)
+        self.retry_base_delay = retry_base_delay
+        self.max_retry_delay = max_retry_delay
+
+        self._providers: Dict[str, ProviderClient] = {}
+        self._output_limits: Dict[str, Optional[int]] = {}
+
+    @classmethod
+    def from_env(cls) -> "LLMClientPool":
+        """Create a pool configured from LLM_* environment variables"""
+        return cls(
+            max_concurrent=int(os.getenv("LLM_MAX_CONCURRENT", "8")),
+            requests_per_second=float(os.getenv("LLM_REQUESTS_PER_SECOND", "5")),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "4")),
+            retry_base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "1")),
+        )
+
+    def provider(self, name: str) -> ProviderClient:
+        """Get the client for a provider name such as 'openai', registering it on first use"""
+        client = self._providers.get(name)
+        if client is None:
+            from .config import config_manager
+
+            provider_config = config_manager.get_provider_config(name)
+            client = ProviderClient(
+                name,
+                max_concurrent=getattr(provider_config, 'max_concurrent', None) or self.max_concurrent,
+                requests_per_second=getattr(provider_config, 'requests_per_second', None) or self.requests_per_second,
+            )
+            self._providers[name] = client
+        return client
+
+    def max_output_tokens(self, llm_config, default: int) -> int:
+        """Output token limit of the config's model from litellm's model table, or default if unknown"""
+        model = llm_config.provider
+        if model not in self._output_limits:
+            limit = None
+            try:
+                import litellm
+                info = litellm.get_model_info(model)
+                limit = info.get('max_output_tokens') or info.get('max_tokens')
+            except Exception:
+                # Unknown or custom models (e.g. Ollama, Azure deployments)
+                pass
+            self._output_limits[model] = int(limit) if limit else None
+        return self._output_limits[model] or default
+
+    @staticmethod
+    def _retry_info(error: Exception) -> Tuple[bool, Optional[float]]:
+        """Whether an error is worth retrying, and the server's Retry-After in seconds if given"""
+        status = getattr(error, 'status_code', None)
+        retryable = status in RETRYABLE_STATUS_CODES or type(error).__name__ in RETRYABLE_ERROR_NAMES
+        retry_after = None
+        headers = getattr(getattr(error, 'response', None), 'headers', None)
+        if headers:
+            try:
+                retry_after = float(headers.get('retry-after'))
+            except (TypeError, ValueError):
+                pass
+        return retryable, retry_after
+
+    @staticmethod
+    def _is_throttle(error: Exception) -> bool:
+        return getattr(error, 'status_code', None) == 429 or type(error).__name__ == 'RateLimitError'
+
+    async def acompletion(self, llm_config, messages: List[Dict[str, Any]], **params) -> Any:
+        """Call litellm.acompletion for an LLMConfig within its provider's limits, retrying transient errors"""
+        import litellm
+        from .config import config_manager
+
+        provider_name = llm_config.provider.split('/', 1)[0]
+        client = self.provider(provider_name)
+        provider_config = config_manager.get_provider_config(provider_name)
+        call_params = {
+            'model': llm_config.provider,
+            'messages': messages,
+            'api_key': llm_config.api_token,
+            'base_url': llm_config.base_url,
+            **params,
+        }
+        if provider_config is not None and provider_config.api_version:
+            call_params['api_version'] = provider_config.api_version
+
+        attempt = 0
+        while True:
+            async with client.semaphore():
+                await client.rate_limiter.acquire()
+                client.in_flight += 1
+                client._stats['calls'] += 1
+                try:
+                    response = await litellm.acompletion(**call_params)
+                except Exception as e:
+                    error = e
+                else:
+                    client.rate_limiter.on_success()
+                    return response
+                finally:
+                    client.in_flight -= 1
+
+            retryable, retry_after = self._retry_info(error)
+            if self._is_throttle(error):
+                client.rate_limiter.on_throttle()
+            if not retryable or attempt >= self.max_retries:
+                client._stats['failures'] += 1
+                raise error
+            attempt += 1
+            client._stats['retries'] += 1
+            # Full-jitter exponential backoff, or the server's Retry-After, outside the semaphore
+            delay = retry_after if retry_after is not None else random.uniform(
+                0, min(self.max_retry_delay, self.retry_base_delay * 2 ** attempt)
+            )
+            logger.debug(f"LLM call to {provider_name} failed ({type(error).__name__}); retry {attempt} in {delay:.1f}s")
+            await asyncio.sleep(min(delay, self.max_retry_delay))
+
+    async def complete(self, llm_config, messages: List[Dict[str, Any]], **params) -> str:
+        """Like acompletion, returning the text of the first choice"""
+        response = await self.acompletion(llm_config, messages, **params)
+        return response.choices[0].message.content or ""
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return per-provider call, retry and rate statistics"""
+        return {
+            'default_max_concurrent': self.max_concurrent,
+            'default_requests_per_second': self.requests_per_second,
+            'max_retries': self.max_retries,
+            'providers': {name: client.get_stats() for name, client in self._providers.items()},
+        }
+
+
+# Global LLM client pool instance
+llm_clients = LLMClientPool.from_env()
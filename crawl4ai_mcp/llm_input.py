@@ -0,0 +1,236 @@
+"""
+LLM Input Module
+Turns crawled pages into compact text for LLM prompts: markdown instead of
+markup, boilerplate removed, and optionally only the blocks most relevant
+to a query within a token budget
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Union
+
+from .text_chunking import count_tokens, split_by_tokens
+
+# Same markdown generation crawl4ai uses for crawl results; tags are stripped without it
+try:
+    from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+    MARKDOWN_GENERATOR_AVAILABLE = True
+except ImportError:
+    MARKDOWN_GENERATOR_AVAILABLE = False
+
+
+_LINK_PATTERN = re.compile(r'(!?)\[([^\]]*)\]\(([^)\s]*)(?:\s+"[^"]*")?\)')
+_HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+_HTML_DETECT_PATTERN = re.compile(r'<(?:div|p|span|a|li|ul|table|section|article|h[1-6]|br)\b', re.IGNORECASE)
+_TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+_HEADING_PATTERN = re.compile(r'^#{1,6}\s')
+
+# Short single-line blocks matching these are site chrome rather than content
+_BOILERPLATE_PATTERN = re.compile(
+    r'\bskip to (main )?content\b|\baccept (all )?cookies\b|\bcookie (policy|settings|preferences)\b'
+    r'|\bwe use cookies\b|\ball rights reserved\b|\bprivacy policy\b|\bterms (of (use|service)|and conditions)\b'
+    r'|\bsign (in|up)\b|\blog ?in\b|\bsubscribe to (our )?newsletter\b|\bfollow us\b|\bshare (this|on)\b'
+    r'|\bback to top\b|^\s*(menu|search|home)\s*$|^\s*(©|copyright\b)',
+    re.IGNORECASE
+)
+BOILERPLATE_MAX_CHARS = 200
+
+# Blocks that are mostly link text (menus, tag clouds, footers)
+MAX_LINK_DENSITY = 0.6
+
+# Longer blocks are split so ranking and budgeting work at paragraph granularity
+BLOCK_MAX_TOKENS = 512
+
+
+def html_to_markdown(html: str) -> str:
+    """Convert HTML (or fragments of it) to markdown"""
+    if MARKDOWN_GENERATOR_AVAILABLE:
+        try:
+            result = DefaultMarkdownGenerator().generate_markdown(html)
+            return getattr(result, 'raw_markdown', None) or str(result)
+        except Exception:
+            pass
+    text = re.sub(r'(?i)<(br|/p|/div|/li|/h[1-6]|/tr)[^>]*>', '\n', html)
+    return re.sub(r'\n{3,}', '\n\n', _HTML_TAG_PATTERN.sub(' ', text))
+
+
+def split_blocks(markdown: str) -> List[str]:
+    """Split markdown into blank-line separated blocks, keeping headings with the block they introduce"""
+    blocks: List[str] = []
+    pending_heading = None
+    for block in re.split(r'\n\s*\n', markdown):
+        block = block.strip()
+        if not block:
+            continue
+        if _HEADING_PATTERN.match(block) and '\n' not in block:
+            pending_heading = f"{pending_heading}\n{block}" if pending_heading else block
+            continue
+        if pending_heading:
+            block = f"{pending_heading}\n{block}"
+            pending_heading = None
+        blocks.append(block)
+    if pending_heading:
+        blocks.append(pending_heading)
+    return blocks
+
+
+def link_density(block: str) -> float:
+    """Share of a block's visible text that is link text (URLs and images do not count)"""
+    visible = simplify_block(block)
+    if not visible:
+        return 0.0
+    linked = sum(len(text.strip()) for is_image, text, _ in _LINK_PATTERN.findall(block) if not is_image)
+    return min(1.0, linked / len(visible))
+
+
+def is_boilerplate(block: str, check_links: bool = True) -> bool:
+    """Whether a block looks like navigation, cookie banners or footer text"""
+    if check_links and link_density(block) > MAX_LINK_DENSITY:
+        return True
+    visible = simplify_block(block)
+    # Phrases only identify chrome in short standalone lines, not inside paragraphs
+    return '\n' not in visible and len(visible) <= BOILERPLATE_MAX_CHARS and bool(_BOILERPLATE_PATTERN.search(visible))
+
+
+def simplify_block(block: str, keep_links: bool = False) -> str:
+    """Drop images and, unless keep_links, reduce links to their text"""
+    def replace(match: re.Match) -> str:
+        is_image, text, url = match.groups()
+        if is_image:
+            return ""
+        if keep_links and url and not url.startswith(('#', 'javascript:')):
+            return f"[{text}]({url})"
+        return text
+
+    block = _LINK_PATTERN.sub(replace, block)
+    return re.sub(r'[ \t]+', ' ', block).strip()
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word terms for ranking"""
+    return _TERM_PATTERN.findall(text.lower())
+
+
+def bm25_scores(blocks: List[str], query: str, k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """Okapi BM25 score of each block for the query"""
+    query_terms = set(tokenize(query))
+    if not blocks or not query_terms:
+        return [0.0] * len(blocks)
+    documents = [Counter(tokenize(block)) for block in blocks]
+    lengths = [sum(document.values()) for document in documents]
+    average_length = (sum(lengths) / len(lengths)) or 1.0
+    document_frequency = {term: sum(1 for document in documents if term in document) for term in query_terms}
+
+    scores = []
+    for document, length in zip(documents, lengths):
+        score = 0.0
+        for term in query_terms:
+            frequency = document.get(term, 0)
+            if not frequency:
+                continue
+            idf = math.log(1 + (len(documents) - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+            score += idf * frequency * (k1 + 1) / (frequency + k1 * (1 - b + b * length / average_length))
+        scores.append(score)
+    return scores
+
+
+def schema_query(schema: Any) -> str:
+    """Flatten a JSON schema's field names and descriptions into a ranking query"""
+    terms: List[str] = []
+
+    def walk(node: Any):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key not in ('type', 'properties', 'items', 'required', '$schema'):
+                    terms.append(str(key).replace('_', ' '))
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+        elif isinstance(node, str):
+            terms.append(node)
+
+    walk(schema)
+    return " ".join(terms)
+
+
+def prepare_llm_input(
+    page: Union[str, Dict[str, Any]],
+    max_tokens: int,
+    query: Optional[str] = None,
+    model: Optional[str] = None,
+    keep_links: bool = False,
+    drop_link_lists: bool = True
+) -> Dict[str, Any]:
+    """Build compact prompt text from a page within a token budget
+
+    page is a page snapshot dict (markdown preferred over cleaned_html) or a
+    markdown/HTML string. Boilerplate blocks are dropped and links reduced to
+    their text (kept when keep_links). Blocks that are mostly link text are
+    dropped as navigation unless keep_links or drop_link_lists=False (entity
+    names are often links). If the rest does not fit in max_tokens, blocks
+    are chosen by BM25 relevance to the query (or in document order without
+    one) and emitted in their original order.
+
+    Returns the text with its token count and what was dropped.
+    """
+    if isinstance(page, dict):
+        source = page.get('markdown') or html_to_markdown(page.get('cleaned_html') or page.get('html') or "")
+    else:
+        source = html_to_markdown(page) if _HTML_DETECT_PATTERN.search(page or "") else (page or "")
+
+    blocks = split_blocks(source)
+    # Link lists are content when links are wanted (e.g. extracting product URLs)
+    check_links = drop_link_lists and not keep_links
+    kept = [simplify_block(block, keep_links) for block in blocks if not is_boilerplate(block, check_links)]
+    kept = [block for block in kept if block]
+
+    # Repeated blocks (menus rendered twice, sticky banners) only need to appear once
+    seen = set()
+    unique = []
+    for block in kept:
+        fingerprint = " ".join(block.lower().split())
+        if fingerprint not in seen:
+            seen.add(fingerprint)
+            if count_tokens(block, model) > BLOCK_MAX_TOKENS:
+                unique.extend(split_by_tokens(block, BLOCK_MAX_TOKENS, model))
+            else:
+                unique.append(block)
+
+    token_counts = [count_tokens(block, model) + 1 for block in unique]
+    total_tokens = sum(token_counts)
+    ranked = False
+
+    if total_tokens <= max_tokens:
+        selected = list(range(len(unique)))
+    else:
+        if query and query.strip():
+            scores = bm25_scores(unique, query)
+            # Earlier blocks win ties; pages tend to put the main content first
+            order = sorted(range(len(unique)), key=lambda i: (-scores[i], i))
+            ranked = True
+        else:
+            order = list(range(len(unique)))
+        selected = []
+        used = 0
+        for index in order:
+            if used + token_counts[index] > max_tokens:
+                if not ranked:
+                    break
+                continue
+            selected.append(index)
+            used += token_counts[index]
+        selected.sort()
+
+    text = "\n\n".join(unique[i] for i in selected)
+    return {
+        'text': text,
+        'tokens': sum(token_counts[i] for i in selected),
+        'source_tokens': count_tokens(source, model),
+        'blocks_total': len(blocks),
+        'blocks_kept': len(selected),
+        'boilerplate_removed': len(blocks) - len(kept),
+        'ranked': ranked,
+        'truncated': len(selected) < len(unique),
+    }
@@ -10,13 +10,14 @@ import json
 import os
 import sys
 import logging
-from typing import Any, Dict, List, Optional, Union
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse, unquote
 from pydantic import BaseModel, Field
-from fastmcp import FastMCP
-from crawl4ai import AsyncWebCrawler
+from fastmcp import FastMCP, Context
 from crawl4ai import (
     JsonCssExtractionStrategy,
-    LLMExtractionStrategy,
     JsonXPathExtractionStrategy,
     RegexExtractionStrategy,
     BM25ContentFilter,
@@ -35,8 +36,29 @@ from crawl4ai.deep_crawling import BFSDeepCrawlStrategy, DFSDeepCrawlStrategy, B
 from crawl4ai.deep_crawling.filters import FilterChain, URLPatternFilter, DomainFilter
 from crawl4ai.deep_crawling.scorers import KeywordRelevanceScorer
 from .suppress_output import suppress_stdout_stderr
+from .browser_pool import BrowserPool
+from .concurrency import HostLimiter, AdaptiveRateLimiter
+from .http_client import http_pool
+from .conversion_pool import conversion_pool
+from .disk_cache import DiskCache, normalize_url, make_cache_key
 from .file_processor import FileProcessor
+from .static_fetch import static_fetcher
+from .llm_cache import llm_cache
+from .llm_clients import llm_clients
+from .content_router import (
+    content_router,
+    parse_feed,
+    feed_to_markdown,
+    ROUTE_DOCUMENT,
+    ROUTE_FEED,
+    ROUTE_IMAGE,
+    ROUTE_JSON,
+)
 from .youtube_processor import YouTubeProcessor
+from .youtube_playlist import YouTubePlaylistResolver, parse_collection_url
+from .transcript_store import transcript_store
+from .text_chunking import count_tokens, split_by_tokens
+from .llm_input import prepare_llm_input, schema_query
 from .google_search_processor import GoogleSearchProcessor
 
 
@@ -50,6 +72,7 @@ class CrawlRequest(BaseModel):
     generate_markdown: bool = Field(True, description="Whether to generate markdown")
     wait_for_selector: Optional[str] = Field(None, description="Wait for specific element")
     timeout: int = Field(60, description="Request timeout in seconds")
+    engine: str = Field("auto", description="Fetch engine: 'auto' (plain HTTP, escalating to the browser when the page needs JavaScript), 'static' or 'browser'")
     
     # Deep crawling parameters
     max_depth: Optional[int] = Field(None, description="Maximum crawling depth (None for single page)")
@@ -92,6 +115,7 @@ class StructuredExtractionRequest(BaseModel):
     llm_provider: Optional[str] = Field("openai", description="LLM provider for LLM-based extraction")
     llm_model: Optional[str] = Field("gpt-3.5-turbo", description="LLM model name")
     instruction: Optional[str] = Field(None, description="Custom instruction for LLM extraction")
+    use_cache: bool = Field(True, description="Reuse a recently fetched copy of the page if available")
 
 
 class FileProcessRequest(BaseModel):
@@ -100,6 +124,7 @@ class FileProcessRequest(BaseModel):
     max_size_mb: int = Field(100, description="Maximum file size in MB")
     extract_all_from_zip: bool = Field(True, description="Whether to extract all files from ZIP archives")
     include_metadata: bool = Field(True, description="Whether to include file metadata")
+    stream_results: bool = Field(False, description="Send each ZIP member to the client as soon as it is converted")
 
 
 class FileProcessResponse(BaseModel):
@@ -125,6 +150,9 @@ class YouTubeTranscriptRequest(BaseModel):
     include_timestamps: bool = Field(True, description="Include timestamps in transcript")
     preserve_formatting: bool = Field(True, description="Preserve original formatting")
     include_metadata: bool = Field(True, description="Include video metadata")
+    use_cache: bool = Field(True, description="Reuse a stored transcript instead of fetching it from YouTube again")
+    include_segments: bool = Field(False, description="Include per-segment text and timing (large for long videos)")
+    include_clean_text: bool = Field(True, description="Include the transcript text without timestamps")
 
 
 class YouTubeTranscriptResponse(BaseModel):
@@ -145,7 +173,10 @@ class YouTubeBatchRequest(BaseModel):
     languages: Optional[List[str]] = Field(["ja", "en"], description="Preferred languages in order of preference")
     translate_to: Optional[str] = Field(None, description="Target language for translation")
     include_timestamps: bool = Field(True, description="Include timestamps in transcript")
-    max_concurrent: int = Field(3, description="Maximum concurrent requests (1-10)")
+    max_concurrent: int = Field(3, description="Maximum videos in flight (1-20); the request rate adapts to YouTube throttling")
+    max_retries: int = Field(3, description="Retries per video for throttling and other temporary errors (0-5)")
+    include_metadata: bool = Field(True, description="Include video metadata for each video")
+    stream_results: bool = Field(False, description="Send each video's transcript as soon as it is ready")
 
 
 class YouTubeBatchResponse(BaseModel):
@@ -225,20 +256,392 @@ for logger_name in ["crawl4ai", "playwright", "asyncio", "urllib3"]:
     logger.handlers.clear()
     logger.propagate = False
 
+# Initialize the shared browser pool (configured via BROWSER_POOL_* env vars)
+browser_pool = BrowserPool.from_env()
+
+# Per-tool TTLs in seconds for the result cache, each overridable with
+# RESULT_CACHE_TTL_<TOOL_NAME> (e.g. RESULT_CACHE_TTL_CRAWL_URL)
+RESULT_CACHE_TTLS = {
+    "crawl_url": int(os.getenv("CACHE_TTL", "900")),
+    "extract_entities": 3600,
+    "intelligent_extract": 3600,
+    "search_and_crawl": 600,
+    "page_snapshot": int(os.getenv("CACHE_TTL", "900")),
+}
+
+# Initialize the persistent result cache (configured via RESULT_CACHE_* env vars)
+result_cache = DiskCache.from_env("RESULT_CACHE", "results.sqlite3", default_ttls=RESULT_CACHE_TTLS)
+
+# Token budget for page content in LLM prompts (after boilerplate removal and ranking)
+LLM_INPUT_MAX_TOKENS = int(os.getenv("LLM_INPUT_MAX_TOKENS", "8000"))
+
+# LLM entity extraction: tokens per chunk, chunks extracted in parallel and chunks sent per page
+ENTITY_CHUNK_TOKENS = int(os.getenv("LLM_ENTITY_CHUNK_TOKENS", "3000"))
+ENTITY_MAX_CONCURRENT = max(1, int(os.getenv("LLM_ENTITY_CONCURRENCY", "4")))
+ENTITY_MAX_CHUNKS = max(1, int(os.getenv("LLM_ENTITY_MAX_CHUNKS", "20")))
+
+# Batched LLM extraction: page tokens and pages packed into one request, and output tokens allowed per page
+BATCH_EXTRACT_PACK_TOKENS = int(os.getenv("LLM_BATCH_PACK_TOKENS", "24000"))
+BATCH_EXTRACT_MAX_PAGES = max(1, int(os.getenv("LLM_BATCH_MAX_PAGES", "10")))
+BATCH_EXTRACT_OUTPUT_TOKENS = int(os.getenv("LLM_BATCH_OUTPUT_TOKENS_PER_PAGE", "800"))
+# Output limit assumed for models litellm has no limit for
+BATCH_EXTRACT_MAX_OUTPUT_TOKENS = int(os.getenv("LLM_BATCH_MAX_OUTPUT_TOKENS", "4096"))
+
+# Number of MCP sessions currently using the shared resources
+_active_sessions = 0
+
+
+async def shutdown_shared_resources():
+    """Close long-lived resources: pooled browsers, HTTP connections, workers and cache databases."""
+    await browser_pool.close()
+    await http_pool.close()
+    conversion_pool.shutdown()
+    youtube_processor.shutdown()
+    for cache in (result_cache, transcript_store, llm_cache):
+        cache.close()
+
+
+@asynccontextmanager
+async def _server_lifespan(server):
+    """Warm the browser pool on startup and close it when the last session ends."""
+    global _active_sessions
+    _active_sessions += 1
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        # Browsers are launched lazily on first use if warm-up fails
+        print(f"Warning: Browser pool warm-up failed: {e}", file=sys.stderr)
+    try:
+        yield
+    finally:
+        _active_sessions -= 1
+        if _active_sessions == 0:
+            await shutdown_shared_resources()
+
+
 # Initialize FastMCP server
-mcp = FastMCP("Crawl4AI MCP Server")
+mcp = FastMCP("Crawl4AI MCP Server", lifespan=_server_lifespan)
 
 # Initialize FileProcessor for MarkItDown integration
-file_processor = FileProcessor()
+file_processor = FileProcessor(
+    max_archive_members=int(os.getenv("ZIP_MAX_MEMBERS", "500")),
+    max_archive_size_mb=int(os.getenv("ZIP_MAX_TOTAL_MB", "500")),
+)
 
 # Initialize YouTubeProcessor for transcript extraction (youtube-transcript-api v1.1.0+)
-youtube_processor = YouTubeProcessor()
+youtube_processor = YouTubeProcessor(
+    rate_limiter=AdaptiveRateLimiter(
+        rate=float(os.getenv("YOUTUBE_RATE_LIMIT", "2")),
+        min_rate=float(os.getenv("YOUTUBE_RATE_LIMIT_MIN", "0.2")),
+        max_rate=float(os.getenv("YOUTUBE_RATE_LIMIT_MAX", "8")),
+    ),
+    max_workers=int(os.getenv("YOUTUBE_API_WORKERS", "8")),
+    call_timeout=float(os.getenv("YOUTUBE_API_TIMEOUT", "30")),
+    summary_chunk_tokens=int(os.getenv("YOUTUBE_SUMMARY_CHUNK_TOKENS", "6000")),
+    summary_max_concurrent=int(os.getenv("YOUTUBE_SUMMARY_CONCURRENCY", "4")),
+)
+
+# Playlist/channel resolution shares the YouTube rate limit with transcript requests
+playlist_resolver = YouTubePlaylistResolver(rate_limiter=youtube_processor.rate_limiter)
 
 # Initialize GoogleSearchProcessor for search functionality
 google_search_processor = GoogleSearchProcessor()
 
 
+async def _stream_result(ctx: Optional[Context], progress: int, total: Optional[int], payload: Dict[str, Any]):
+    """
+    Send one incremental result to the client while a tool is still running.
+    
+    Results travel as the message of an MCP progress notification when the client
+    supplied a progress token, and as a log notification otherwise.
+    
+    Args:
+        ctx: FastMCP request context (None when called outside MCP, e.g. RunPod)
+        progress: Number of items completed so far
+        total: Expected number of items, if known
+        payload: JSON-serializable result for the completed item
+    """
+    if ctx is None:
+        return
+    
+    message = json.dumps(payload, default=str, ensure_ascii=False)
+    try:
+        meta = getattr(ctx.request_context, 'meta', None)
+        if getattr(meta, 'progressToken', None) is not None:
+            try:
+                await ctx.report_progress(progress=progress, total=total, message=message)
+            except TypeError:
+                # Older FastMCP versions have no message field on progress notifications
+                await ctx.report_progress(progress=progress, total=total)
+                await ctx.info(message)
+        else:
+            await ctx.info(message)
+    except Exception:
+        # Streaming is best effort; the final response still carries the results
+        pass
+
+
+async def _cached_result(namespace: str, cache_key: Optional[str], producer) -> Dict[str, Any]:
+    """
+    Return a tool result from the result cache, or build it and cache it.
+    
+    Args:
+        namespace: Cache namespace, normally the tool name (selects the TTL)
+        cache_key: Key from make_cache_key, or None to skip the cache entirely
+        producer: Zero-argument coroutine function that builds the result dict
+        
+    Returns:
+        The cached or freshly built result; only complete, successful results are stored
+    """
+    if cache_key is not None:
+        cached = await result_cache.aget(namespace, cache_key)
+        if cached is not None:
+            return cached
+    
+    result = await producer()
+    # Partial results (e.g. crawls cut off by a deadline) are not worth replaying
+    if cache_key is not None and isinstance(result, dict) and result.get('success') and not result.get('partial'):
+        await result_cache.aset(namespace, cache_key, result)
+    return result
+
+
+def _parse_llm_json(llm_response: str) -> Any:
+    """Parse the JSON object in an LLM response, or the whole response if it has no braces."""
+    json_start = llm_response.find('{')
+    json_end = llm_response.rfind('}') + 1
+    if json_start != -1 and json_end > json_start:
+        return json.loads(llm_response[json_start:json_end])
+    return json.loads(llm_response)
+
+
+def _is_llm_json(llm_response: Optional[str]) -> bool:
+    """Whether an LLM response parses as JSON (only those are worth caching)."""
+    try:
+        _parse_llm_json(llm_response or "")
+        return True
+    except (json.JSONDecodeError, TypeError):
+        return False
+
+
+async def _fetch_page_snapshot(
+    url: str,
+    use_cache: bool = True,
+    page_timeout: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Fetch a page once and keep its HTML for later extraction calls on the same URL.
+    
+    Args:
+        url: URL to fetch
+        use_cache: Whether a cached snapshot may be returned (a fresh fetch is always stored)
+        page_timeout: Optional page timeout in milliseconds
+        
+    Returns:
+        Dictionary with success, html, cleaned_html, markdown and title (or error)
+    """
+    cache_key = make_cache_key(normalize_url(url))
+    if use_cache:
+        cached = await result_cache.aget("page_snapshot", cache_key)
+        if cached is not None:
+            return cached
+    
+    config_params = {"verbose": False, "log_console": False}
+    if page_timeout:
+        config_params["page_timeout"] = page_timeout
+    
+    with suppress_stdout_stderr():
+        async with browser_pool.crawler() as crawler:
+            result = await crawler.arun(url=url, config=CrawlerRunConfig(**config_params))
+    
+    if not result.success:
+        return {"success": False, "url": url, "error": result.error_message}
+    
+    snapshot = {
+        "success": True,
+        "url": url,
+        "html": result.html,
+        "cleaned_html": result.cleaned_html,
+        "markdown": str(result.markdown) if result.markdown is not None else None,
+        "title": result.metadata.get("title") if result.metadata else None,
+    }
+    await result_cache.aset("page_snapshot", cache_key, snapshot)
+    return snapshot
+
+
+def _crawl_cache_key(request: CrawlRequest) -> Optional[str]:
+    """Build the result cache key for a crawl request, or None if it must not be cached."""
+    if not request.enable_caching or request.cache_mode == "disabled":
+        return None
+    # Never persist pages fetched with the caller's credentials
+    if request.cookies or request.auth_token:
+        return None
+    options = request.model_dump(exclude={"url", "timeout", "enable_caching", "cache_mode"})
+    return make_cache_key(normalize_url(request.url), options)
+
+
 async def _internal_crawl_url(request: CrawlRequest) -> CrawlResponse:
+    """
+    Crawl a URL, answering repeat requests from the result cache.
+    
+    cache_mode 'enabled' reads and writes the cache, 'bypass' always crawls but
+    refreshes the cached entry, and 'disabled' (or enable_caching=False) skips it.
+    
+    Args:
+        request: CrawlRequest containing URL and extraction parameters
+        
+    Returns:
+        CrawlResponse with crawled content and metadata
+    """
+    cache_key = _crawl_cache_key(request)
+    if cache_key is not None and request.cache_mode != "bypass":
+        cached = await result_cache.aget("crawl_url", cache_key)
+        if cached is not None:
+            return CrawlResponse(**cached)
+    
+    response = await _crawl_url_uncached(request)
+    if cache_key is not None and response.success:
+        await result_cache.aset("crawl_url", cache_key, response.model_dump())
+    return response
+
+
+async def _crawl_without_browser(request: CrawlRequest, route: Dict[str, Any]) -> CrawlResponse:
+    """
+    Handle JSON, RSS/Atom feeds and images over plain HTTP.
+    
+    Args:
+        request: CrawlRequest for the URL
+        route: Routing decision from the content router
+        
+    Returns:
+        CrawlResponse with the parsed content
+    """
+    url = request.url
+    extracted_data = {
+        "processing_method": f"http_{route['route']}",
+        "content_type": route['mime_type'],
+        "route_source": route['source'],
+    }
+    
+    if route['route'] == ROUTE_IMAGE:
+        # The image itself is the content; nothing to download or render
+        name = Path(unquote(urlparse(route['final_url']).path)).name or url
+        return CrawlResponse(
+            success=True,
+            url=url,
+            title=name,
+            markdown=f"![{name}]({route['final_url']})",
+            media=[{"type": "image", "src": route['final_url'], "alt": name}],
+            extracted_data=extracted_data
+        )
+    
+    # Same credentials as the routing probe, so authenticated endpoints stay authenticated
+    headers = dict(request.headers or {})
+    if request.user_agent:
+        headers["User-Agent"] = request.user_agent
+    try:
+        body = await file_processor.download_file(
+            url, max_size_mb=100, headers=headers or None, cookies=request.cookies
+        )
+    except ValueError as e:
+        return CrawlResponse(success=False, url=url, error=str(e))
+    text = bytes(body).decode("utf-8", errors="replace")
+    
+    if route['route'] == ROUTE_JSON:
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            # Mislabelled content: return it as plain text
+            return CrawlResponse(success=True, url=url, content=text, markdown=text, extracted_data=extracted_data)
+        pretty = json.dumps(data, indent=2, ensure_ascii=False)
+        extracted_data["json"] = data
+        return CrawlResponse(
+            success=True,
+            url=url,
+            content=pretty,
+            markdown=f"```json\n{pretty}\n```",
+            extracted_data=extracted_data
+        )
+    
+    try:
+        feed = parse_feed(bytes(body))
+    except Exception as e:
+        return CrawlResponse(success=False, url=url, error=f"Feed parsing failed: {str(e)}")
+    markdown = feed_to_markdown(feed)
+    extracted_data["feed"] = feed
+    return CrawlResponse(
+        success=True,
+        url=url,
+        title=feed.get('title'),
+        content=markdown,
+        markdown=markdown,
+        extracted_data=extracted_data
+    )
+
+
+# CrawlerRunConfig options the static engine reproduces (used by batch_crawl)
+STATIC_COMPATIBLE_RUN_OPTIONS = {
+    "verbose", "log_console", "page_timeout", "cache_mode", "css_selector", "wait_for", "exclude_all_images",
+}
+
+
+def _browser_only_options(request: CrawlRequest) -> List[str]:
+    """Names of the request options that only the browser can honour."""
+    options = {
+        "take_screenshot": request.take_screenshot,
+        "execute_js": request.execute_js,
+        "wait_for_js": request.wait_for_js,
+        "simulate_user": request.simulate_user,
+        "max_depth": request.max_depth,
+        "content_filter": request.content_filter,
+        "chunk_content": request.chunk_content,
+    }
+    return [name for name, value in options.items() if value]
+
+
+async def _crawl_static(request: CrawlRequest) -> Tuple[Optional[CrawlResponse], Optional[str]]:
+    """
+    Crawl a page over plain HTTP.
+    
+    Args:
+        request: CrawlRequest with engine 'auto' or 'static'
+        
+    Returns:
+        (CrawlResponse, None), or (None, escalation reason) when the page should be crawled with the browser
+    """
+    headers = dict(request.headers or {})
+    if request.user_agent:
+        headers["User-Agent"] = request.user_agent
+    
+    result = await static_fetcher.crawl(
+        request.url,
+        headers=headers or None,
+        cookies=request.cookies,
+        timeout=request.timeout,
+        wait_for=request.wait_for_selector,
+        css_selector=request.css_selector,
+        include_images=request.extract_media,
+        force=request.engine == "static"
+    )
+    if not result['success']:
+        if result.get('escalate'):
+            return None, result['escalate']
+        return CrawlResponse(success=False, url=request.url, error=result.get('error')), None
+    
+    return CrawlResponse(
+        success=True,
+        url=request.url,
+        title=result.get('title'),
+        content=result.get('cleaned_html'),
+        markdown=result.get('markdown'),
+        media=result.get('media') if request.extract_media else None,
+        extracted_data={
+            "processing_method": "static_http",
+            "final_url": result.get('final_url'),
+        }
+    ), None
+
+
+async def _crawl_url_uncached(request: CrawlRequest) -> CrawlResponse:
     """
     Crawl a URL and extract content using various methods, with optional deep crawling.
     
@@ -303,13 +706,33 @@ async def _internal_crawl_url(request: CrawlRequest) -> CrawlResponse:
                     error=f"YouTube processing error: {str(e)}"
                 )
         
-        # Check if URL points to a file that should be processed with MarkItDown
-        if file_processor.is_supported_file(request.url):
+        # Route by content type so documents, JSON, feeds and images skip the browser
+        route = await content_router.route(request.url, headers=request.headers)
+        if route['route'] in (ROUTE_JSON, ROUTE_FEED, ROUTE_IMAGE):
+            return await _crawl_without_browser(request, route)
+        
+        # Server-rendered pages need no browser; static_fetcher escalates the rest
+        escalation = None
+        if request.engine != "browser" and route['route'] != ROUTE_DOCUMENT:
+            browser_options = _browser_only_options(request)
+            if request.engine == "static" and browser_options:
+                return CrawlResponse(
+                    success=False,
+                    url=request.url,
+                    error=f"engine='static' cannot be used with: {', '.join(browser_options)}"
+                )
+            if static_fetcher.enabled and not browser_options:
+                static_result, escalation = await _crawl_static(request)
+                if static_result is not None:
+                    return static_result
+        
+        if route['route'] == ROUTE_DOCUMENT:
             # Redirect to file processing for supported file formats
             try:
                 file_result = await file_processor.process_file_from_url(
                     request.url,
-                    max_size_mb=100  # Default size limit
+                    max_size_mb=100,  # Default size limit
+                    suffix=route['suffix']
                 )
                 
                 if file_result['success']:
@@ -325,7 +748,8 @@ async def _internal_crawl_url(request: CrawlRequest) -> CrawlResponse:
                             "is_archive": file_result.get('is_archive', False),
                             "metadata": file_result.get('metadata'),
                             "archive_contents": file_result.get('archive_contents'),
-                            "processing_method": "markitdown"
+                            "processing_method": "markitdown",
+                            "content_type": route['mime_type']
                         }
                     )
                 else:
@@ -444,11 +868,8 @@ async def _internal_crawl_url(request: CrawlRequest) -> CrawlResponse:
             # Fallback for older versions without content_filter support
             config = CrawlerRunConfig(**config_params)
 
-        # Setup browser configuration
-        browser_config = {
-            "headless": True,
-            "verbose": False
-        }
+        # Setup browser configuration (pool defaults cover headless/verbose)
+        browser_config = {}
         
         if request.user_agent:
             browser_config["user_agent"] = request.user_agent
@@ -456,9 +877,10 @@ async def _internal_crawl_url(request: CrawlRequest) -> CrawlResponse:
         if request.headers:
             browser_config["headers"] = request.headers
 
-        # Suppress output to avoid JSON parsing errors
+        # Suppress output to avoid JSON parsing errors.
+        # Cookies are browser-wide state, so those requests get a dedicated browser.
         with suppress_stdout_stderr():
-            async with AsyncWebCrawler(**browser_config) as crawler:
+            async with browser_pool.crawler(ephemeral=bool(request.cookies), **browser_config) as crawler:
                 # Handle authentication
                 if request.cookies:
                     # Set cookies if provided
@@ -549,6 +971,8 @@ async def _internal_crawl_url(request: CrawlRequest) -> CrawlResponse:
                     media=result.media if request.extract_media else None,
                     screenshot=result.screenshot if request.take_screenshot else None,
                 )
+            if escalation:
+                static_fetcher.browser_succeeded(request.url, escalation)
             return response
         else:
             # Handle case where result doesn't have success attribute or failed
@@ -603,6 +1027,10 @@ async def crawl_url(request: CrawlRequest) -> CrawlResponse:
     ⚠️ May fail: Heavy CAPTCHA sites, login-required pages
     🔄 If fails: Retry immediately (network issues common)
     
+    ⚡ ENGINE: Server-rendered pages are fetched over plain HTTP ("engine": "auto");
+    pages that need JavaScript are escalated to the browser automatically.
+    Set "engine": "browser" to always render, or "static" to never launch a browser.
+    
     vs deep_crawl_site: Use this for single pages; deep_crawl_site for multiple pages (max 5)
     vs intelligent_extract: Use this for full content; intelligent_extract for specific data
     
@@ -636,6 +1064,29 @@ async def crawl_url(request: CrawlRequest) -> CrawlResponse:
     return await _internal_crawl_url(request)
 
 
+def _site_map_page_info(page_result) -> Dict[str, Any]:
+    """Summarize one deep-crawl CrawlResult as a site map entry."""
+    if hasattr(page_result, 'success') and page_result.success:
+        return {
+            "url": page_result.url,
+            "title": page_result.metadata.get("title", "No title") if page_result.metadata else "No title",
+            "content_length": len(page_result.cleaned_html) if page_result.cleaned_html else 0,
+            "links_found": len(page_result.links.get("internal", [])) if hasattr(page_result, 'links') and page_result.links else 0,
+            "depth": getattr(page_result, 'depth', 0),
+            "content_preview": (page_result.cleaned_html[:200] + "...") if page_result.cleaned_html else "",
+            "markdown_preview": (page_result.markdown[:200] + "...") if page_result.markdown else ""
+        }
+    # Failed page info
+    return {
+        "url": getattr(page_result, 'url', 'Unknown URL'),
+        "title": "Failed to crawl",
+        "content_length": 0,
+        "error": getattr(page_result, 'error_message', 'Unknown error'),
+        "content_preview": "",
+        "markdown_preview": ""
+    }
+
+
 @mcp.tool
 async def deep_crawl_site(
     url: str,
@@ -646,7 +1097,9 @@ async def deep_crawl_site(
     url_pattern: Optional[str] = None,
     score_threshold: float = 0.0,  # More permissive default
     extract_media: bool = False,
-    base_timeout: int = 60
+    base_timeout: int = 60,
+    stream_results: bool = False,
+    ctx: Optional[Context] = None
 ) -> Dict[str, Any]:
     """
     🗺️ Systematically crawl multiple pages of a website (MAX 5 PAGES for stability).
@@ -676,6 +1129,10 @@ async def deep_crawl_site(
     vs crawl_url: Use this for multiple related pages; crawl_url for single page
     vs search_and_crawl: Use this when you know the starting site; search_and_crawl for discovery
     
+    📡 STREAMING: Set stream_results=true to receive each page (with full markdown)
+    as an MCP progress notification the moment it is crawled. Pages are then
+    processed one at a time instead of being buffered until the crawl ends.
+    
     Example for documentation:
     {
       "url": "https://docs.example.com/api",
@@ -757,18 +1214,20 @@ async def deep_crawl_site(
             )
 
         # Add timeout and resource limits for deep crawling
-        config = CrawlerRunConfig(
-            deep_crawl_strategy=strategy,
-            exclude_all_images=True,  # Always exclude images for performance
-            verbose=False,  # Always disable to prevent MCP connection issues
-            log_console=False,  # Always disable to prevent MCP connection issues
-            page_timeout=dynamic_timeout * 1000,  # Convert to milliseconds
-        )
+        config_params = {
+            "deep_crawl_strategy": strategy,
+            "exclude_all_images": True,  # Always exclude images for performance
+            "verbose": False,  # Always disable to prevent MCP connection issues
+            "log_console": False,  # Always disable to prevent MCP connection issues
+            "page_timeout": dynamic_timeout * 1000,  # Convert to milliseconds
+        }
+        if stream_results:
+            # Yield pages one by one instead of buffering the whole crawl
+            config_params["stream"] = True
+        config = CrawlerRunConfig(**config_params)
         
         # Enhanced browser configuration
         browser_config = {
-            "headless": True,
-            "verbose": False,
             "viewport_width": 1280,
             "viewport_height": 720,
             "user_agent": "Mozilla/5.0 (compatible; Crawl4AI-DeepCrawler/1.0)",
@@ -786,22 +1245,38 @@ async def deep_crawl_site(
             "url_pattern": url_pattern
         }
         
+        streamed_pages: List[Dict[str, Any]] = []
+        
+        async def consume_stream(crawler) -> List[Dict[str, Any]]:
+            async for page_result in await crawler.arun(url=url, config=config):
+                page_info = _site_map_page_info(page_result)
+                streamed_pages.append(page_info)
+                page_payload = {"type": "deep_crawl_page", **page_info}
+                if "error" not in page_info:
+                    page_payload["markdown"] = str(page_result.markdown or "")
+                await _stream_result(ctx, len(streamed_pages), max_pages, page_payload)
+            return streamed_pages
+        
         try:
             with suppress_stdout_stderr():
-                async with AsyncWebCrawler(**browser_config) as crawler:
+                async with browser_pool.crawler(**browser_config) as crawler:
                     # Reduced overall timeout for MCP stability (90 seconds)
                     result = await asyncio.wait_for(
-                        crawler.arun(url=url, config=config),
+                        consume_stream(crawler) if stream_results else crawler.arun(url=url, config=config),
                         timeout=90
                     )
         except asyncio.TimeoutError:
-            return {
+            timeout_response = {
                 "success": False,
                 "error": "Deep crawling operation timed out after 90 seconds",
                 "starting_url": url,
                 "timeout_reason": "Operation exceeded maximum allowed time",
                 "config_info": config_info
             }
+            if stream_results:
+                # Pages crawled before the timeout were already delivered
+                timeout_response["pages"] = streamed_pages
+            return timeout_response
         except Exception as crawler_error:
             return {
                 "success": False,
@@ -823,32 +1298,16 @@ async def deep_crawl_site(
         
         # Check if result is a list (multiple pages) or single result object
         if isinstance(result, list):
-            # Deep crawling returns a list of CrawlResult objects
+            # Deep crawling returns a list of CrawlResult objects; the streaming
+            # path has already converted each page into its site map entry
             site_map["total_pages_crawled"] = len(result)
+            if stream_results:
+                site_map["streamed"] = True
             
             for page_result in result:
-                if hasattr(page_result, 'success') and page_result.success:
-                    page_info = {
-                        "url": page_result.url,
-                        "title": page_result.metadata.get("title", "No title") if page_result.metadata else "No title",
-                        "content_length": len(page_result.cleaned_html) if page_result.cleaned_html else 0,
-                        "links_found": len(page_result.links.get("internal", [])) if hasattr(page_result, 'links') and page_result.links else 0,
-                        "depth": getattr(page_result, 'depth', 0),
-                        "content_preview": (page_result.cleaned_html[:200] + "...") if page_result.cleaned_html else "",
-                        "markdown_preview": (page_result.markdown[:200] + "...") if page_result.markdown else ""
-                    }
-                    site_map["pages"].append(page_info)
-                else:
-                    # Add failed page info
-                    failed_page_info = {
-                        "url": getattr(page_result, 'url', 'Unknown URL'),
-                        "title": "Failed to crawl",
-                        "content_length": 0,
-                        "error": getattr(page_result, 'error_message', 'Unknown error'),
-                        "content_preview": "",
-                        "markdown_preview": ""
-                    }
-                    site_map["pages"].append(failed_page_info)
+                site_map["pages"].append(
+                    page_result if stream_results else _site_map_page_info(page_result)
+                )
             
             # Create content summary
             successful_pages = [p for p in site_map["pages"] if "error" not in p]
@@ -909,7 +1368,8 @@ async def get_llm_config_info() -> Dict[str, Any]:
     can cause temporary failures, but retry often succeeds.
     
     Returns:
-        Dictionary with LLM configuration details including available providers and models
+        Dictionary with LLM configuration details including available providers and models,
+        plus hit rates of the LLM result cache per tool
     """
     try:
         from .config import config_manager
@@ -936,7 +1396,9 @@ async def get_llm_config_info() -> Dict[str, Any]:
                 "api_key_env_var": provider_config.api_key_env,
                 "api_key_available": api_key_available,
                 "base_url": provider_config.base_url,
-                "models": provider_config.models
+                "models": provider_config.models,
+                "max_concurrent": provider_config.max_concurrent or llm_clients.max_concurrent,
+                "requests_per_second": provider_config.requests_per_second or llm_clients.requests_per_second
             }
         
         return {
@@ -944,7 +1406,9 @@ async def get_llm_config_info() -> Dict[str, Any]:
             "default_provider": config_manager.get_default_provider(),
             "default_model": config_manager.get_default_model(),
             "providers": provider_status,
-            "config_source": "MCP configuration"
+            "config_source": "MCP configuration",
+            "llm_cache": await asyncio.to_thread(llm_cache.get_stats),
+            "llm_clients": llm_clients.get_stats()
         }
         
     except Exception as e:
@@ -964,7 +1428,8 @@ async def _internal_intelligent_extract(
     use_llm: bool = True,
     llm_provider: Optional[str] = None,
     llm_model: Optional[str] = None,
-    custom_instructions: Optional[str] = None
+    custom_instructions: Optional[str] = None,
+    use_cache: bool = True
 ) -> Dict[str, Any]:
     """
     Perform intelligent content extraction with advanced filtering and AI analysis.
@@ -979,6 +1444,7 @@ async def _internal_intelligent_extract(
         llm_provider: LLM provider (auto-detected from config if not specified)
         llm_model: Specific model to use (auto-detected from config if not specified)
         custom_instructions: Custom instructions for extraction
+        use_cache: Whether a cached page snapshot and cached LLM answers may be reused
         
     Returns:
         Dictionary with extracted content and metadata
@@ -986,25 +1452,82 @@ async def _internal_intelligent_extract(
     try:
         from .config import get_llm_config, config_manager
         
+        # Fetch the page once; filtering and LLM extraction run on the snapshot
+        page = await _fetch_page_snapshot(url, use_cache=use_cache)
+        if not page["success"]:
+            return {
+                "url": url,
+                "extraction_goal": extraction_goal,
+                "success": False,
+                "error": f"Extraction failed: {page.get('error')}",
+                "metadata": {"filter_used": content_filter, "llm_used": use_llm}
+            }
+        
+        cleaned_html = page["cleaned_html"] or ""
+        markdown = page["markdown"] or ""
+        content: Union[str, Dict[str, Any]] = page
+        llm_config = get_llm_config(llm_provider, llm_model) if use_llm else None
+        
         # Setup content filter
         content_filter_strategy = None
         if content_filter == "bm25" and filter_query:
             content_filter_strategy = BM25ContentFilter(query=filter_query)
         elif content_filter == "pruning":
             content_filter_strategy = PruningContentFilter(threshold=0.5)
+        
+        if content_filter_strategy is not None and cleaned_html:
+            blocks = await asyncio.to_thread(content_filter_strategy.filter_content, cleaned_html)
+            if blocks:
+                content = "\n\n".join(blocks)
         elif content_filter == "llm" and use_llm:
-            instructions = custom_instructions or f"Extract content related to: {extraction_goal}"
-            llm_config = get_llm_config(llm_provider, llm_model)
-            # Use ONLY llm_config parameter, avoid mixing with legacy params
-            content_filter_strategy = LLMContentFilter(
-                llm_config=llm_config,
-                instruction=instructions,
-                verbose=False
+            # The LLM filter goes through the shared clients like every other LLM call
+            filter_instructions = custom_instructions or f"Extract content related to: {extraction_goal}"
+            filter_input = await asyncio.to_thread(
+                prepare_llm_input, page, LLM_INPUT_MAX_TOKENS, extraction_goal, llm_config.provider
             )
+            if filter_input["text"]:
+                filter_prompt = f"""{filter_instructions}
+
+Return only the parts of the web page below that are relevant, as markdown, without commentary.
 
+Web page content:
+{filter_input["text"]}"""
+                filter_key = llm_cache.make_key(
+                    llm_config.provider, filter_prompt, base_url=llm_config.base_url, step="content_filter"
+                )
+                filtered = await llm_cache.get_or_call(
+                    "intelligent_extract",
+                    filter_key,
+                    lambda: llm_clients.complete(llm_config, [{"role": "user", "content": filter_prompt}], temperature=0),
+                    should_cache=bool,
+                    use_cache=use_cache
+                )
+                if filtered and filtered.strip():
+                    content = filtered
+        
+        # Compact text for the LLM: markdown without boilerplate, ranked against the goal if too long
+        prepared = await asyncio.to_thread(
+            prepare_llm_input,
+            content,
+            LLM_INPUT_MAX_TOKENS,
+            filter_query or extraction_goal,
+            llm_config.provider if llm_config else None
+        )
+        content = prepared["text"]
+        
+        # Configure chunking
+        sections = [content]
+        if chunk_content and content:
+            from crawl4ai.chunking_strategy import SlidingWindowChunking
+            chunking_strategy = SlidingWindowChunking(
+                window_size=1000,
+                step=900  # 10% overlap
+            )
+            sections = chunking_strategy.chunk(content) or [content]
+        
         # Setup extraction strategy
-        extraction_strategy = None
-        if use_llm:
+        extracted_data = None
+        if use_llm and content:
             schema = {
                 "extracted_content": extraction_goal,
                 "summary": "Brief summary of extracted content",
@@ -1021,94 +1544,75 @@ async def _internal_intelligent_extract(
             4. Any relevant metadata
             """
             
-            llm_config = get_llm_config(llm_provider, llm_model)
-            # Use ONLY llm_config parameter, avoid mixing with legacy params
-            extraction_strategy = LLMExtractionStrategy(
-                llm_config=llm_config,
-                schema=schema,
-                extraction_type="schema",
-                instruction=instructions,
-                verbose=False
-            )
-
-        # Configure chunking
-        chunking_strategy = None
-        if chunk_content:
-            from crawl4ai.chunking_strategy import SlidingWindowChunking
-            chunking_strategy = SlidingWindowChunking(
-                window_size=1000,
-                step=900  # 10% overlap
-            )
-
-        # Setup crawler configuration
-        config_params = {
-            "extraction_strategy": extraction_strategy,
-            "verbose": False,
-            "log_console": False,
-        }
-        
-        if chunking_strategy:
-            config_params["chunking_strategy"] = chunking_strategy
-        
-        # Add content filter if supported by current crawl4ai version
-        try:
-            config = CrawlerRunConfig(**config_params, content_filter=content_filter_strategy)
-        except TypeError:
-            # Fallback for older versions without content_filter support
-            config = CrawlerRunConfig(**config_params)
+            schema_str = json.dumps(schema, indent=2)
+            
+            async def extract_section(index: int, section: str) -> List[Dict[str, Any]]:
+                """Extract one section into blocks shaped like LLMExtractionStrategy output (index, error)"""
+                prompt = f"""{instructions}
 
-        with suppress_stdout_stderr():
-            async with AsyncWebCrawler(headless=True, verbose=False) as crawler:
-                result = await crawler.arun(url=url, config=config)
+Schema to follow:
+{schema_str}
 
-        if result.success:
-            response_data = {
-                "url": url,
-                "extraction_goal": extraction_goal,
-                "success": True,
-                "content": {
-                    "raw_content": result.cleaned_html[:2000] + "..." if len(result.cleaned_html or "") > 2000 else result.cleaned_html,
-                    "markdown": result.markdown[:2000] + "..." if len(result.markdown or "") > 2000 else result.markdown,
-                    "extracted_data": None,
-                    "chunks": []
-                },
-                "metadata": {
-                    "title": result.metadata.get("title") if result.metadata else None,
-                    "content_length": len(result.cleaned_html) if result.cleaned_html else 0,
-                    "filter_used": content_filter,
-                    "llm_used": use_llm,
-                    "chunked": chunk_content
-                }
-            }
+Web page content:
+{section}
 
-            # Add extracted structured data if available
-            if result.extracted_content:
+Return valid JSON that matches the schema."""
                 try:
-                    response_data["content"]["extracted_data"] = json.loads(result.extracted_content)
-                except json.JSONDecodeError:
-                    response_data["content"]["extracted_data"] = result.extracted_content
-
-            # Add chunk information if chunking was used
-            if chunk_content and hasattr(result, 'content_chunks'):
-                response_data["content"]["chunks"] = [
+                    data = _parse_llm_json(await llm_clients.complete(
+                        llm_config, [{"role": "user", "content": prompt}], temperature=0.1
+                    ))
+                except json.JSONDecodeError as e:
+                    return [{"index": index, "error": True, "tags": ["error"], "content": f"Unparseable LLM response: {e}"}]
+                except Exception as e:
+                    return [{"index": index, "error": True, "tags": ["error"], "content": str(e)}]
+                items = data if isinstance(data, list) else [data]
+                return [{"index": index, "error": False, **item} if isinstance(item, dict) else item for item in items]
+            
+            async def extract_sections() -> List[Dict[str, Any]]:
+                results = await asyncio.gather(*[extract_section(i, section) for i, section in enumerate(sections)])
+                return [block for blocks in results for block in blocks]
+            
+            # Identical sections, schema and instructions reuse the earlier extraction
+            extraction_key = llm_cache.make_key(
+                llm_config.provider, instructions, "\x00".join(sections), base_url=llm_config.base_url, schema=schema
+            )
+            extracted_data = await llm_cache.get_or_call(
+                "intelligent_extract",
+                extraction_key,
+                extract_sections,
+                should_cache=lambda blocks: bool(blocks) and not any(
+                    isinstance(block, dict) and block.get("error") for block in blocks
+                ),
+                use_cache=use_cache
+            )
+        
+        return {
+            "url": url,
+            "extraction_goal": extraction_goal,
+            "success": True,
+            "content": {
+                "raw_content": cleaned_html[:2000] + "..." if len(cleaned_html) > 2000 else cleaned_html,
+                "markdown": markdown[:2000] + "..." if len(markdown) > 2000 else markdown,
+                "extracted_data": extracted_data,
+                "chunks": [
                     {
                         "index": i,
                         "content": chunk[:200] + "..." if len(chunk) > 200 else chunk,
                         "length": len(chunk)
                     }
-                    for i, chunk in enumerate(result.content_chunks or [])
-                ]
-
-            return response_data
-
-        else:
-            return {
-                "url": url,
-                "extraction_goal": extraction_goal,
-                "success": False,
-                "error": f"Extraction failed: {result.error_message}",
-                "metadata": {"filter_used": content_filter, "llm_used": use_llm}
+                    for i, chunk in enumerate(sections)
+                ] if chunk_content else []
+            },
+            "metadata": {
+                "title": page["title"],
+                "content_length": len(cleaned_html),
+                "filter_used": content_filter,
+                "llm_used": use_llm,
+                "chunked": chunk_content,
+                "llm_input_tokens": prepared["tokens"],
+                "source_tokens": prepared["source_tokens"]
             }
+        }
 
     except Exception as e:
         return {
@@ -1130,7 +1634,8 @@ async def intelligent_extract(
     use_llm: bool = True,
     llm_provider: Optional[str] = None,
     llm_model: Optional[str] = None,
-    custom_instructions: Optional[str] = None
+    custom_instructions: Optional[str] = None,
+    use_cache: bool = True
 ) -> Dict[str, Any]:
     """
     🤖 AI-powered extraction of specific data points from web pages.
@@ -1177,39 +1682,342 @@ async def intelligent_extract(
       "filter_query": "email phone contact hours"
     }
     
+    Set use_cache=false to force a fresh extraction instead of reusing a recent result.
+    
     IMPORTANT: All parameters are passed directly, NOT as a nested 'request' object.
     Returns: Dictionary with extracted content and metadata
     """
-    return await _internal_intelligent_extract(
-        url=url,
-        extraction_goal=extraction_goal,
-        content_filter=content_filter,
-        filter_query=filter_query,
-        chunk_content=chunk_content,
-        use_llm=use_llm,
-        llm_provider=llm_provider,
-        llm_model=llm_model,
-        custom_instructions=custom_instructions
+    cache_key = None
+    if use_cache:
+        cache_key = make_cache_key(
+            normalize_url(url), extraction_goal, content_filter, filter_query,
+            chunk_content, use_llm, llm_provider, llm_model, custom_instructions
+        )
+    
+    return await _cached_result(
+        "intelligent_extract",
+        cache_key,
+        lambda: _internal_intelligent_extract(
+            url=url,
+            extraction_goal=extraction_goal,
+            content_filter=content_filter,
+            filter_query=filter_query,
+            chunk_content=chunk_content,
+            use_llm=use_llm,
+            llm_provider=llm_provider,
+            llm_model=llm_model,
+            custom_instructions=custom_instructions,
+            use_cache=use_cache
+        )
     )
 
 
-async def _internal_extract_entities(
-    url: str,
-    entity_types: List[str],
-    custom_patterns: Optional[Dict[str, str]] = None,
-    include_context: bool = True,
-    deduplicate: bool = True
-) -> Dict[str, Any]:
-    """
-    Extract specific entities (emails, phones, URLs, dates, etc.) from web content using regex patterns.
+def _batch_extract_prompt(instructions: str, schema: Dict[str, Any], pages: List[Dict[str, Any]]) -> str:
+    """Build one prompt extracting the same schema from several pages, each tagged with its id."""
+    page_sections = "\n\n".join(
+        f"=== PAGE {number} ===\nURL: {page['url']}\nTitle: {page.get('title') or ''}\n\n{page['text']}"
+        for number, page in enumerate(pages, 1)
+    )
+    return f"""{instructions}
+
+Schema for each page's data:
+{json.dumps(schema, indent=2)}
+
+The content of {len(pages)} web page(s) follows, each introduced by a line "=== PAGE <number> ===".
+Extract from each page independently and never mix data between pages.
+Return only JSON of the form {{"pages": [{{"page": <number>, "data": <data matching the schema>}}]}}
+with one entry for every page.
+
+{page_sections}"""
+
+
+def _split_batch_response(llm_response: str, page_count: int) -> Dict[int, Any]:
+    """Map page numbers to their data in a batched LLM response; pages that are missing are left out."""
+    text = (llm_response or "").strip()
+    try:
+        parsed = json.loads(text) if text.startswith('[') else _parse_llm_json(text)
+    except (json.JSONDecodeError, TypeError):
+        return {}
     
-    Args:
-        url: URL to extract entities from
-        entity_types: Types of entities to extract (emails, phones, urls, dates, social_media, etc.)
-        custom_patterns: Custom regex patterns for entity extraction
-        include_context: Whether to include surrounding context for each entity
-        deduplicate: Whether to remove duplicate entities
-        
+    entries = parsed.get("pages") if isinstance(parsed, dict) else parsed
+    if not isinstance(entries, list):
+        # A single page may come back as its data without the wrapper
+        return {1: parsed} if page_count == 1 and isinstance(parsed, dict) else {}
+    
+    results = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            number = int(entry.get("page"))
+        except (TypeError, ValueError):
+            continue
+        if 1 <= number <= page_count and "data" in entry:
+            results[number] = entry["data"]
+    return results
+
+
+@mcp.tool
+async def batch_intelligent_extract(
+    urls: List[str],
+    extraction_goal: str,
+    schema: Optional[Dict[str, Any]] = None,
+    filter_query: Optional[str] = None,
+    llm_provider: Optional[str] = None,
+    llm_model: Optional[str] = None,
+    custom_instructions: Optional[str] = None,
+    max_concurrent: int = 5,
+    max_per_domain: int = 2,
+    max_pages_per_request: int = BATCH_EXTRACT_MAX_PAGES,
+    max_tokens_per_request: int = BATCH_EXTRACT_PACK_TOKENS,
+    stream_results: bool = False,
+    use_cache: bool = True,
+    ctx: Optional[Context] = None
+) -> Dict[str, Any]:
+    """
+    🤖 AI-powered extraction of the same data points from many web pages at once.
+    
+    ⚠️ REQUIRES: LLM configuration (check with get_llm_config_info first)
+    
+    USE WHEN:
+    - Running one extraction goal or schema over a list of pages (products, listings, profiles)
+    - Would otherwise call intelligent_extract once per URL
+    
+    Pages are crawled concurrently and reduced to the text relevant to the goal.
+    Small pages are then packed into shared LLM requests (up to
+    max_pages_per_request pages and max_tokens_per_request page tokens each, and
+    no more pages than the model's output limit has room for), so instructions
+    and schema are sent once per request rather than once per page.
+    Each request's answer is split back per URL; pages the model skipped are
+    retried on their own. Per-page results are cached, so repeat runs only send
+    new or changed pages.
+    
+    With stream_results=true each page's result is sent as an MCP progress
+    notification as soon as its request completes.
+    
+    Args:
+        urls: URLs to extract from
+        extraction_goal: What to extract from every page (e.g. "product name, price, availability")
+        schema: Optional JSON schema each page's data should follow
+        filter_query: Optional query for selecting relevant page text (defaults to the goal and schema)
+        llm_provider: LLM provider (auto-detected from config if not specified)
+        llm_model: Specific model to use (auto-detected from config if not specified)
+        custom_instructions: Custom instructions for extraction
+        max_concurrent: Maximum number of pages crawled at once (1-20, default: 5)
+        max_per_domain: Maximum concurrent pages per domain (default: 2)
+        max_pages_per_request: Most pages packed into one LLM request
+        max_tokens_per_request: Page tokens packed into one LLM request (keep within the model's context window)
+        stream_results: Send each page's result as a progress notification when it completes
+        use_cache: Reuse cached pages and per-page extraction results
+        
+    Example MCP Call:
+        {
+          "urls": ["https://shop.com/p/1", "https://shop.com/p/2", "https://shop.com/p/3"],
+          "extraction_goal": "product name, price, availability",
+          "schema": {"name": "string", "price": "number", "in_stock": "boolean"}
+        }
+        
+    IMPORTANT: All parameters are passed directly, NOT as a nested 'request' object.
+    Returns: Dictionary with per-URL results (in input order) and batching statistics
+    """
+    try:
+        from .config import get_llm_config
+        llm_config = get_llm_config(llm_provider, llm_model)
+    except Exception as e:
+        return {"success": False, "error": f"LLM configuration error: {str(e)}"}
+    
+    max_concurrent = max(1, min(20, max_concurrent))
+    # Shrink packs so each page's share of the answer fits in the model's output limit
+    output_limit = llm_clients.max_output_tokens(llm_config, BATCH_EXTRACT_MAX_OUTPUT_TOKENS)
+    max_pages_per_request = max(1, min(max_pages_per_request, output_limit // BATCH_EXTRACT_OUTPUT_TOKENS))
+    max_tokens_per_request = max(1000, max_tokens_per_request)
+    page_max_tokens = min(LLM_INPUT_MAX_TOKENS, max_tokens_per_request)
+    limiter = HostLimiter(max_concurrent=max_concurrent, max_per_host=max_per_domain)
+    
+    page_schema = schema or {
+        "extracted_content": extraction_goal,
+        "summary": "Brief summary of extracted content",
+        "key_points": "List of key points"
+    }
+    instructions = custom_instructions or f"Extract content related to: {extraction_goal}"
+    query = filter_query or f"{extraction_goal} {schema_query(schema) if schema else ''}"
+    # Per-page results are keyed on everything that shapes the answer except the other pages in the request
+    prompt_key = f"{instructions}\x00{json.dumps(page_schema, sort_keys=True)}"
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+    completed = 0
+    stats = {"llm_requests": 0, "failed_requests": 0, "retried_pages": 0, "cached_pages": 0}
+    last_request_error = None
+    
+    async def finish(index: int, result: Dict[str, Any]):
+        nonlocal completed
+        results[index] = {"url": urls[index], **result}
+        completed += 1
+        if stream_results:
+            await _stream_result(ctx, completed, len(urls), {
+                "type": "batch_extract_result",
+                "index": index,
+                **results[index]
+            })
+    
+    def page_result(entry: Dict[str, Any], data: Any, pages_in_request: int, cached: bool = False) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "title": entry["title"],
+            "extracted_data": data,
+            "llm_input_tokens": entry["tokens"],
+            "source_tokens": entry["source_tokens"],
+            "content_truncated": entry["truncated"],
+            "pages_in_request": pages_in_request,
+            "cached": cached,
+        }
+    
+    async def prepare(index: int, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch and compact one page; returns it for packing, or None once it is finished"""
+        try:
+            async with limiter.limit(url):
+                page = await _fetch_page_snapshot(url, use_cache=use_cache)
+            if not page["success"]:
+                await finish(index, {"success": False, "error": f"Failed to crawl URL: {page.get('error')}"})
+                return None
+            
+            prepared = await asyncio.to_thread(
+                prepare_llm_input, page, page_max_tokens, query, llm_config.provider, schema is not None
+            )
+            if not prepared["text"].strip():
+                await finish(index, {"success": False, "error": "No content found on the webpage"})
+                return None
+            
+            entry = {
+                "index": index,
+                "url": url,
+                "title": page.get("title"),
+                "text": prepared["text"],
+                "tokens": prepared["tokens"],
+                "source_tokens": prepared["source_tokens"],
+                "truncated": prepared["truncated"],
+                "cache_key": llm_cache.make_key(
+                    llm_config.provider, prompt_key, prepared["text"], base_url=llm_config.base_url, step="batch_page"
+                ),
+            }
+            if use_cache:
+                cached = await llm_cache.aget("batch_extract", entry["cache_key"])
+                if cached is not None:
+                    stats["cached_pages"] += 1
+                    await finish(index, page_result(entry, cached, 0, cached=True))
+                    return None
+            return entry
+        except Exception as e:
+            await finish(index, {"success": False, "error": f"Error extracting {url}: {str(e)}"})
+            return None
+    
+    async def extract_pack(pack: List[Dict[str, Any]]):
+        """Extract one packed request and finish its pages; pages without an answer are retried alone"""
+        nonlocal last_request_error
+        stats["llm_requests"] += 1
+        error = None
+        try:
+            llm_response = await llm_clients.complete(
+                llm_config,
+                [{"role": "user", "content": _batch_extract_prompt(instructions, page_schema, pack)}],
+                max_tokens=min(output_limit, BATCH_EXTRACT_OUTPUT_TOKENS * len(pack)),
+                temperature=0.1,
+            )
+            extracted = _split_batch_response(llm_response, len(pack))
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            stats["failed_requests"] += 1
+            last_request_error = error
+            extracted = {}
+        
+        missing = []
+        for number, entry in enumerate(pack, 1):
+            if number not in extracted:
+                missing.append(entry)
+                continue
+            try:
+                await llm_cache.aset("batch_extract", entry["cache_key"], extracted[number])
+            except Exception:
+                # Caching is best effort; the result is still returned
+                pass
+            await finish(entry["index"], page_result(entry, extracted[number], len(pack)))
+        
+        if len(pack) > 1:
+            stats["retried_pages"] += len(missing)
+            await asyncio.gather(*[extract_pack([entry]) for entry in missing])
+        elif missing:
+            await finish(missing[0]["index"], {
+                "success": False,
+                "title": missing[0]["title"],
+                "error": f"LLM extraction failed: {error}" if error else "LLM response contained no data for this page"
+            })
+    
+    async def extract_pack_safely(pack: List[Dict[str, Any]]):
+        """Run extract_pack so one request's failure cannot lose the results of the others"""
+        try:
+            await extract_pack(pack)
+        except Exception as e:
+            for entry in pack:
+                if results[entry["index"]] is None:
+                    await finish(entry["index"], {
+                        "success": False,
+                        "title": entry["title"],
+                        "error": f"LLM extraction failed: {str(e)}"
+                    })
+    
+    # Pack pages into requests as they arrive instead of waiting for the whole batch
+    llm_tasks = []
+    pack: List[Dict[str, Any]] = []
+    pack_tokens = 0
+    for next_page in asyncio.as_completed([prepare(i, url) for i, url in enumerate(urls)]):
+        entry = await next_page
+        if entry is None:
+            continue
+        if pack and (len(pack) >= max_pages_per_request or pack_tokens + entry["tokens"] > max_tokens_per_request):
+            llm_tasks.append(asyncio.create_task(extract_pack_safely(pack)))
+            pack, pack_tokens = [], 0
+        pack.append(entry)
+        pack_tokens += entry["tokens"]
+    if pack:
+        llm_tasks.append(asyncio.create_task(extract_pack_safely(pack)))
+    await asyncio.gather(*llm_tasks)
+    
+    succeeded = sum(1 for result in results if result and result["success"])
+    return {
+        "success": succeeded > 0 or not urls,
+        "extraction_goal": extraction_goal,
+        "results": results,
+        "stats": {
+            "pages": len(urls),
+            "succeeded": succeeded,
+            "failed": len(urls) - succeeded,
+            **stats,
+            "last_request_error": last_request_error,
+            "max_pages_per_request": max_pages_per_request,
+            "output_token_limit": output_limit,
+        }
+    }
+
+
+async def _internal_extract_entities(
+    url: str,
+    entity_types: List[str],
+    custom_patterns: Optional[Dict[str, str]] = None,
+    include_context: bool = True,
+    deduplicate: bool = True,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Extract specific entities (emails, phones, URLs, dates, etc.) from web content using regex patterns.
+    
+    Args:
+        url: URL to extract entities from
+        entity_types: Types of entities to extract (emails, phones, urls, dates, social_media, etc.)
+        custom_patterns: Custom regex patterns for entity extraction
+        include_context: Whether to include surrounding context for each entity
+        deduplicate: Whether to remove duplicate entities
+        use_cache: Whether a cached page snapshot may be reused
+        
     Returns:
         Dictionary with extracted entities organized by type
     """
@@ -1247,22 +2055,15 @@ async def _internal_extract_entities(
                 "available_types": list(builtin_patterns.keys())
             }
 
-        # Use the same successful configuration as intelligent_extract
-        config = CrawlerRunConfig(
-            verbose=False,
-            log_console=False
-        )
-
-        with suppress_stdout_stderr():
-            async with AsyncWebCrawler(headless=True, verbose=False) as crawler:
-                result = await crawler.arun(url=url, config=config)
+        # Reuse a recent fetch of the same page when one is cached
+        page = await _fetch_page_snapshot(url, use_cache=use_cache)
 
-        if result.success:
+        if page["success"]:
             import re
             extracted_entities = {}
             
             # Get text content for pattern matching
-            content = result.cleaned_html or result.markdown or ""
+            content = page["cleaned_html"] or page["markdown"] or ""
             
             # Process each entity type pattern
             for entity_type, pattern in patterns.items():
@@ -1310,8 +2111,8 @@ async def _internal_extract_entities(
                 "total_entities_found": sum(data.get("count", 0) for data in extracted_entities.values()),
                 "entities": extracted_entities,
                 "metadata": {
-                    "title": result.metadata.get("title") if result.metadata else None,
-                    "content_length": len(result.cleaned_html) if result.cleaned_html else 0,
+                    "title": page["title"],
+                    "content_length": len(page["cleaned_html"]) if page["cleaned_html"] else 0,
                     "deduplicated": deduplicate,
                     "context_included": include_context
                 }
@@ -1321,7 +2122,7 @@ async def _internal_extract_entities(
             return {
                 "url": url,
                 "success": False,
-                "error": f"Entity extraction failed: {result.error_message}",
+                "error": f"Entity extraction failed: {page.get('error')}",
                 "entity_types_requested": entity_types
             }
 
@@ -1343,7 +2144,8 @@ async def extract_entities(
     deduplicate: bool = True,
     use_llm: bool = False,
     llm_provider: Optional[str] = None,
-    llm_model: Optional[str] = None
+    llm_model: Optional[str] = None,
+    use_cache: bool = True
 ) -> Dict[str, Any]:
     """
     Find and extract specific types of data (emails, phones, URLs, dates) from web pages.
@@ -1369,6 +2171,7 @@ async def extract_entities(
         use_llm: If True, use LLM for named entity recognition instead of regex
         llm_provider: LLM provider to use (openai, anthropic, ollama) when use_llm=True
         llm_model: LLM model to use when use_llm=True
+        use_cache: Reuse a recent result and page fetch for identical parameters (set False to force a fresh crawl)
         
     Example MCP Call:
         {
@@ -1387,59 +2190,125 @@ async def extract_entities(
     Returns:
         Dictionary with extracted entities organized by type
     """
-    if use_llm and "names" in entity_types:
+    use_llm_ner = use_llm and "names" in entity_types
+    
+    cache_key = None
+    if use_cache:
+        if use_llm_ner:
+            cache_key = make_cache_key(normalize_url(url), "llm", llm_provider, llm_model)
+        else:
+            cache_key = make_cache_key(
+                normalize_url(url), "regex", entity_types, custom_patterns,
+                include_context, deduplicate
+            )
+    
+    if use_llm_ner:
         # Use LLM-based extraction for named entities
-        return await _internal_llm_extract_entities(url, llm_provider, llm_model)
+        producer = lambda: _internal_llm_extract_entities(url, llm_provider, llm_model, use_cache=use_cache)
     else:
         # Use regex-based extraction
-        return await _internal_extract_entities(
+        producer = lambda: _internal_extract_entities(
             url=url,
             entity_types=entity_types,
             custom_patterns=custom_patterns,
             include_context=include_context,
-            deduplicate=deduplicate
+            deduplicate=deduplicate,
+            use_cache=use_cache
         )
+    
+    return await _cached_result("extract_entities", cache_key, producer)
+
+
+def _normalize_entity_name(name: str) -> str:
+    """Normalize an entity name for deduplication (case, whitespace, surrounding punctuation)."""
+    return " ".join(str(name).split()).strip(" .,;:!?\"'()[]{}").casefold()
+
+
+def _merge_entities(chunk_entities: List[List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Merge entities found in several chunks, deduplicated by normalized name and type.
+    
+    Args:
+        chunk_entities: Entity lists in chunk order
+        
+    Returns:
+        Entities grouped by type; each keeps the first name and context seen,
+        the highest confidence and the number of chunks that mentioned it
+    """
+    merged: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for entities in chunk_entities:
+        for entity in entities:
+            if not isinstance(entity, dict) or not entity.get("name"):
+                continue
+            entity_type = str(entity.get("type") or "MISC").upper()
+            key = (_normalize_entity_name(entity["name"]), entity_type)
+            if not key[0]:
+                continue
+            confidence = entity.get("confidence", 1.0)
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = {
+                    "name": str(entity["name"]).strip(),
+                    "type": entity_type,
+                    "context": entity.get("context", ""),
+                    "confidence": confidence,
+                    "mentions": 1
+                }
+                continue
+            existing["mentions"] += 1
+            if not existing["context"] and entity.get("context"):
+                existing["context"] = entity["context"]
+            try:
+                existing["confidence"] = max(float(existing["confidence"]), float(confidence))
+            except (TypeError, ValueError):
+                pass
+    
+    entities_by_type: Dict[str, List[Dict[str, Any]]] = {}
+    for entity in merged.values():
+        entities_by_type.setdefault(entity.pop("type"), []).append(entity)
+    return entities_by_type
 
 
 async def _internal_llm_extract_entities(
     url: str,
     provider: Optional[str] = None,
     model: Optional[str] = None,
-    instruction: Optional[str] = None
+    instruction: Optional[str] = None,
+    use_cache: bool = True
 ) -> Dict[str, Any]:
     """
-    Internal implementation for LLM-based entity extraction using direct LiteLLM approach
+    Internal implementation for LLM-based entity extraction using direct LiteLLM approach.
+    
+    The page text is split into token-bounded chunks that are extracted
+    concurrently (at most LLM_ENTITY_CONCURRENCY at a time), and the results
+    are merged and deduplicated by normalized name and type.
     """
     try:
         from .config import config_manager
-        import json
-        import litellm
         
         # Create LLM configuration
         llm_config = config_manager.create_llm_config(provider, model)
         
-        # First, crawl the webpage to get content
-        config = CrawlerRunConfig(
-            verbose=False,
-            log_console=False
-        )
-        
-        with suppress_stdout_stderr():
-            async with AsyncWebCrawler(headless=True, verbose=False) as crawler:
-                result = await crawler.arun(url=url, config=config)
+        # First, fetch the webpage (shared with other extraction tools)
+        page = await _fetch_page_snapshot(url, use_cache=use_cache)
         
-        if not result.success:
+        if not page["success"]:
             return {
                 "url": url,
                 "success": False,
-                "error": f"Failed to crawl URL: {result.error_message}",
+                "error": f"Failed to crawl URL: {page.get('error')}",
                 "extraction_method": "llm_direct"
             }
         
-        # Get content for LLM processing
-        content = result.cleaned_html or result.markdown or result.html or ""
+        # Compact page text for LLM processing: markdown without boilerplate, links or images.
+        # Link-dense blocks stay, since entity names are usually links
+        prepared = await asyncio.to_thread(
+            prepare_llm_input, page, ENTITY_CHUNK_TOKENS * ENTITY_MAX_CHUNKS, None, llm_config.provider,
+            False, False
+        )
+        content = prepared["text"]
         
-        if not content:
+        if not content.strip():
             return {
                 "url": url,
                 "success": False,
@@ -1447,11 +2316,10 @@ async def _internal_llm_extract_entities(
                 "extraction_method": "llm_direct"
             }
         
-        # Limit content size to avoid token limits and reduce processing time
-        # GPT-4.1 models support 1M token context but become less reliable with more tokens
-        max_content_length = 6000  # Optimized for GPT-4.1 models
-        if len(content) > max_content_length:
-            content = content[:max_content_length] + "..."
+        # Split the whole page into token-bounded chunks instead of truncating it
+        chunks = split_by_tokens(content, ENTITY_CHUNK_TOKENS, llm_config.provider)
+        truncated = prepared["truncated"] or len(chunks) > ENTITY_MAX_CHUNKS
+        chunks = chunks[:ENTITY_MAX_CHUNKS]
         
         # Default instruction if not provided
         if not instruction:
@@ -1459,73 +2327,73 @@ async def _internal_llm_extract_entities(
             {"entities": [{"name": "entity name", "type": "PERSON|ORGANIZATION|LOCATION|MISC"}]}
             Only extract clearly identifiable entities."""
         
-        # Prepare LiteLLM call
-        messages = [
-            {"role": "user", "content": f"{instruction}\n\nWeb page content:\n{content}"}
-        ]
-        
-        # Configure LiteLLM
-        if llm_config.api_token:
-            litellm.api_key = llm_config.api_token
-        if llm_config.base_url:
-            litellm.api_base = llm_config.base_url
+        semaphore = asyncio.Semaphore(ENTITY_MAX_CONCURRENT)
+        
+        async def extract_chunk(chunk: str) -> str:
+            async def call_llm() -> str:
+                # Credentials go with the call; the provider client applies rate limits and retries
+                async with semaphore:
+                    return await llm_clients.complete(
+                        llm_config,
+                        [{"role": "user", "content": f"{instruction}\n\nWeb page content:\n{chunk}"}],
+                        max_tokens=1000, # Room for the entities of a full chunk
+                        temperature=0.1, # Slightly more creative for better extractions
+                        timeout=25,      # 25 second timeout
+                    )
             
-        # Call LLM with GPT-4.1 optimized settings
-        response = await litellm.acompletion(
-            model=llm_config.provider,
-            messages=messages,
-            max_tokens=500,  # Increased for GPT-4.1's better output capacity
-            temperature=0.1, # Slightly more creative for better extractions
-            timeout=25,      # 25 second timeout
-        )
+            # Identical chunk text and instruction reuse the earlier answer
+            llm_key = llm_cache.make_key(
+                llm_config.provider, instruction, chunk, base_url=llm_config.base_url, max_tokens=1000, temperature=0.1
+            )
+            return await llm_cache.get_or_call(
+                "extract_entities", llm_key, call_llm, should_cache=_is_llm_json, use_cache=use_cache
+            )
         
-        llm_response = response.choices[0].message.content
+        responses = await asyncio.gather(*[extract_chunk(chunk) for chunk in chunks], return_exceptions=True)
         
-        # Parse LLM response
-        try:
-            # Try to extract JSON from the response
-            json_start = llm_response.find('{')
-            json_end = llm_response.rfind('}') + 1
-            
-            if json_start != -1 and json_end > json_start:
-                json_text = llm_response[json_start:json_end]
-                extracted_json = json.loads(json_text)
-            else:
-                # If no JSON found, try to parse the entire response
-                extracted_json = json.loads(llm_response)
-            
-            entities = extracted_json.get("entities", [])
-            
-            # Organize entities by type
-            entities_by_type = {}
-            for entity in entities:
-                entity_type = entity.get("type", "MISC")
-                if entity_type not in entities_by_type:
-                    entities_by_type[entity_type] = []
-                entities_by_type[entity_type].append({
-                    "name": entity.get("name", ""),
-                    "context": entity.get("context", ""),
-                    "confidence": entity.get("confidence", 1.0)
+        # Parse LLM responses; a failed chunk does not sink the others
+        chunk_entities = []
+        chunk_errors = []
+        for index, llm_response in enumerate(responses):
+            try:
+                if isinstance(llm_response, BaseException):
+                    raise llm_response
+                entities = _parse_llm_json(llm_response).get("entities", [])
+                chunk_entities.append(entities if isinstance(entities, list) else [])
+            except Exception as e:
+                raw = llm_response if isinstance(llm_response, str) else None
+                chunk_errors.append({
+                    "chunk": index,
+                    "error": str(e),
+                    "raw_llm_response": raw[:500] + "..." if raw and len(raw) > 500 else raw
                 })
-            
-            return {
-                "url": url,
-                "success": True,
-                "entities_by_type": entities_by_type,
-                "total_entities": len(entities),
-                "llm_provider": llm_config.provider,
-                "extraction_method": "llm_direct",
-                "content_length": len(content)
-            }
-            
-        except (json.JSONDecodeError, KeyError) as e:
+        
+        if not chunk_entities:
             return {
                 "url": url,
                 "success": False,
-                "error": f"Failed to parse LLM response as JSON: {str(e)}",
-                "raw_llm_response": llm_response[:500] + "..." if len(llm_response) > 500 else llm_response,
+                "error": f"LLM entity extraction failed for all {len(chunks)} chunks: {chunk_errors[0]['error']}",
+                "chunk_errors": chunk_errors,
                 "extraction_method": "llm_direct"
             }
+        
+        entities_by_type = _merge_entities(chunk_entities)
+        
+        return {
+            "url": url,
+            "success": True,
+            "entities_by_type": entities_by_type,
+            "total_entities": sum(len(entities) for entities in entities_by_type.values()),
+            "llm_provider": llm_config.provider,
+            "extraction_method": "llm_direct",
+            "content_length": len(content),
+            "content_tokens": prepared["tokens"],
+            "source_tokens": prepared["source_tokens"],
+            "chunk_count": len(chunks),
+            "failed_chunks": len(chunk_errors),
+            "chunk_errors": chunk_errors or None,
+            "content_truncated": truncated
+        }
             
     except Exception as e:
         return {
@@ -1544,22 +2412,8 @@ async def _internal_extract_structured_data(request: StructuredExtractionRequest
         if request.extraction_type == "css" and request.css_selectors:
             strategy = JsonCssExtractionStrategy(request.css_selectors)
         elif request.extraction_type == "llm":
-            # Create LLM config using our config manager
-            from .config import config_manager
-            llm_config = config_manager.create_llm_config(
-                provider=request.llm_provider,
-                model=request.llm_model
-            )
-            
-            strategy = LLMExtractionStrategy(
-                llm_config=llm_config,
-                schema=request.schema,
-                extraction_type="schema",
-                instruction=request.instruction or "Extract data according to the provided schema.",
-                chunk_token_threshold=2000,  # Smaller chunks for faster processing
-                apply_chunking=True,
-                verbose=False
-            )
+            # Extracted below with a direct call through the shared LLM clients
+            strategy = None
         else:
             return CrawlResponse(
                 success=False,
@@ -1567,36 +2421,23 @@ async def _internal_extract_structured_data(request: StructuredExtractionRequest
                 error="Invalid extraction type or missing CSS selectors"
             )
             
-        config = CrawlerRunConfig(
-            extraction_strategy=strategy,
-            page_timeout=30000,  # 30 seconds in milliseconds
-            verbose=False,
-            log_console=False,
+        # Fetch the page once; both extraction paths work from this snapshot
+        page = await _fetch_page_snapshot(
+            request.url,
+            use_cache=request.use_cache,
+            page_timeout=30000  # 30 seconds in milliseconds
         )
         
-        # First crawl without extraction to get content
-        with suppress_stdout_stderr():
-            async with AsyncWebCrawler(verbose=False) as crawler:
-                initial_result = await crawler.arun(url=request.url)
-        
-        if not initial_result.success:
+        if not page["success"]:
             return CrawlResponse(
                 success=False,
                 url=request.url,
-                error=f"Failed to crawl URL: {initial_result.error_message}"
+                error=f"Failed to crawl URL: {page.get('error')}"
             )
         
-        # For LLM extraction, truncate content to avoid token limits
+        # For LLM extraction, send compact page text within the token budget
         if request.extraction_type == "llm":
-            # Get content and truncate to manageable size
-            content = initial_result.cleaned_html or initial_result.markdown or initial_result.html or ""
-            max_content_length = 10000  # Increased for GPT-4.1's 1M token context
-            
-            if len(content) > max_content_length:
-                content = content[:max_content_length] + "..."
-            
             # Create a simple text-based extraction instead of using the full HTML
-            import litellm
             from .config import config_manager
             
             llm_config = config_manager.create_llm_config(
@@ -1604,14 +2445,19 @@ async def _internal_extract_structured_data(request: StructuredExtractionRequest
                 model=request.llm_model
             )
             
-            # Configure LiteLLM
-            if llm_config.api_token:
-                litellm.api_key = llm_config.api_token
-            if llm_config.base_url:
-                litellm.api_base = llm_config.base_url
-            
             # Create prompt for structured extraction
             instruction = request.instruction or "Extract data according to the provided schema."
+            
+            # Keep the blocks most relevant to the schema; links stay since schemas often ask for URLs
+            prepared = await asyncio.to_thread(
+                prepare_llm_input,
+                page,
+                LLM_INPUT_MAX_TOKENS,
+                f"{instruction} {schema_query(request.schema)}",
+                llm_config.provider,
+                True
+            )
+            content = prepared["text"]
             schema_str = json.dumps(request.schema, indent=2)
             
             prompt = f"""{instruction}
@@ -1624,37 +2470,35 @@ Web page content:
 
 Return valid JSON that matches the schema."""
             
-            try:
+            async def call_llm() -> str:
                 # Call LLM directly with GPT-4.1 optimized settings
-                response = await litellm.acompletion(
-                    model=llm_config.provider,
-                    messages=[{"role": "user", "content": prompt}],
+                return await llm_clients.complete(
+                    llm_config,
+                    [{"role": "user", "content": prompt}],
                     max_tokens=1200, # Increased for GPT-4.1's better output capacity
                     temperature=0.1, # Slightly more creative for better structured output
                     timeout=30,      # 30 second timeout for complex schemas
                 )
-                
-                llm_response = response.choices[0].message.content
+            
+            try:
+                llm_key = llm_cache.make_key(
+                    llm_config.provider, prompt, base_url=llm_config.base_url, max_tokens=1200, temperature=0.1
+                )
+                llm_response = await llm_cache.get_or_call(
+                    "extract_structured_data", llm_key, call_llm,
+                    should_cache=_is_llm_json, use_cache=request.use_cache
+                )
                 
                 # Parse LLM response
                 try:
-                    # Try to extract JSON from the response
-                    json_start = llm_response.find('{')
-                    json_end = llm_response.rfind('}') + 1
-                    
-                    if json_start != -1 and json_end > json_start:
-                        json_text = llm_response[json_start:json_end]
-                        extracted_data = json.loads(json_text)
-                    else:
-                        # If no JSON found, try to parse the entire response
-                        extracted_data = json.loads(llm_response)
+                    extracted_data = _parse_llm_json(llm_response)
                     
                     return CrawlResponse(
                         success=True,
                         url=request.url,
-                        title=initial_result.metadata.get("title"),
-                        content=initial_result.cleaned_html,
-                        markdown=initial_result.markdown,
+                        title=page["title"],
+                        content=page["cleaned_html"],
+                        markdown=page["markdown"],
                         extracted_data=extracted_data,
                     )
                     
@@ -1663,8 +2507,8 @@ Return valid JSON that matches the schema."""
                         success=False,
                         url=request.url,
                         error=f"Failed to parse LLM response as JSON: {str(e)}",
-                        content=initial_result.cleaned_html,
-                        markdown=initial_result.markdown
+                        content=page["cleaned_html"],
+                        markdown=page["markdown"]
                     )
                     
             except Exception as e:
@@ -1672,43 +2516,30 @@ Return valid JSON that matches the schema."""
                     success=False,
                     url=request.url,
                     error=f"LLM extraction error: {str(e)}",
-                    content=initial_result.cleaned_html,
-                    markdown=initial_result.markdown
+                    content=page["cleaned_html"],
+                    markdown=page["markdown"]
                 )
         
-        # For CSS extraction, use the original approach
+        # For CSS extraction, run the strategy over the fetched HTML off the event loop
         else:
-            with suppress_stdout_stderr():
-                async with AsyncWebCrawler(verbose=False) as crawler:
-                    result = await crawler.arun(url=request.url, config=config)
+            extracted_items = await asyncio.to_thread(strategy.run, request.url, [page["html"] or ""])
             
-            if result.success:
-                extracted_data = None
-                if result.extracted_content:
-                    try:
-                        parsed_content = json.loads(result.extracted_content)
-                        # Handle case where result is a list instead of dict
-                        if isinstance(parsed_content, list) and len(parsed_content) > 0:
-                            extracted_data = parsed_content[0]  # Take first item
-                        elif isinstance(parsed_content, dict):
-                            extracted_data = parsed_content
-                    except (json.JSONDecodeError, TypeError):
-                        extracted_data = {"raw_content": result.extracted_content}
-                
-                return CrawlResponse(
-                    success=True,
-                    url=request.url,
-                    title=result.metadata.get("title"),
-                    content=result.cleaned_html,
-                    markdown=result.markdown,
-                    extracted_data=extracted_data,
-                )
-            else:
-                return CrawlResponse(
-                    success=False,
-                    url=request.url,
-                    error=f"Failed to extract data: {result.error_message}"
-                )
+            extracted_data = None
+            if extracted_items:
+                # Handle case where result is a list instead of dict
+                if isinstance(extracted_items, list):
+                    extracted_data = extracted_items[0]  # Take first item
+                elif isinstance(extracted_items, dict):
+                    extracted_data = extracted_items
+            
+            return CrawlResponse(
+                success=True,
+                url=request.url,
+                title=page["title"],
+                content=page["cleaned_html"],
+                markdown=page["markdown"],
+                extracted_data=extracted_data,
+            )
                 
     except Exception as e:
         return CrawlResponse(
@@ -1748,14 +2579,37 @@ async def extract_structured_data(request: StructuredExtractionRequest) -> Crawl
 
 
 @mcp.tool
-async def batch_crawl(urls: List[str], config: Optional[Dict[str, Any]] = None, base_timeout: int = 30) -> List[CrawlResponse]:
+async def batch_crawl(
+    urls: List[str],
+    config: Optional[Dict[str, Any]] = None,
+    base_timeout: int = 30,
+    max_concurrent: int = 5,
+    max_per_domain: int = 2,
+    stream_results: bool = False,
+    engine: str = "auto",
+    ctx: Optional[Context] = None
+) -> List[CrawlResponse]:
     """
     Crawl multiple URLs in batch.
     
+    URLs are crawled concurrently on pooled browsers. A global limit caps the
+    number of pages in flight and a per-domain limit keeps the batch from
+    hammering a single origin. Results are returned in the same order as urls.
+    With engine="auto", server-rendered pages are fetched over plain HTTP and
+    only pages that need JavaScript are rendered in a browser.
+    
+    With stream_results=true each page's full CrawlResponse is sent as an MCP
+    progress notification as soon as it completes, and the final list only
+    carries success/url/title/error so large pages are not buffered twice.
+    
     Args:
         urls: List of URLs to crawl
         config: Optional configuration parameters
         base_timeout: Base timeout in seconds (default: 30), adjusted based on URL count
+        max_concurrent: Maximum number of pages crawled at once (1-20, default: 5)
+        max_per_domain: Maximum concurrent pages per domain (default: 2)
+        stream_results: Send each result as a progress notification when it completes
+        engine: 'auto' (default), 'static' (HTTP only) or 'browser'
         
     Example MCP Call:
         {
@@ -1765,7 +2619,9 @@ async def batch_crawl(urls: List[str], config: Optional[Dict[str, Any]] = None,
             "https://example.com/page3"
           ],
           "config": {"generate_markdown": true},
-          "base_timeout": 45
+          "base_timeout": 45,
+          "max_concurrent": 5,
+          "max_per_domain": 2
         }
         
     IMPORTANT: All parameters are passed directly, NOT as a nested 'request' object.
@@ -1776,55 +2632,111 @@ async def batch_crawl(urls: List[str], config: Optional[Dict[str, Any]] = None,
     Returns:
         List of CrawlResponse objects for each URL
     """
-    results = []
+    max_concurrent = max(1, min(20, max_concurrent))
+    limiter = HostLimiter(max_concurrent=max_concurrent, max_per_host=max_per_domain)
+    
+    # Calculate dynamic timeout based on the number of concurrent waves
+    # Base timeout + additional time per wave (5s per additional wave after the first)
+    waves = -(-len(urls) // max_concurrent) if urls else 0
+    dynamic_timeout = base_timeout + max(0, (waves - 1) * 5)
+    completed = 0
     
-    # Calculate dynamic timeout based on URL count
-    # Base timeout + additional time per URL (5s per additional URL after the first)
-    dynamic_timeout = base_timeout + max(0, (len(urls) - 1) * 5)
+    # Only plain page fetches can skip the browser
+    static_options = set(config or {}) - STATIC_COMPATIBLE_RUN_OPTIONS
+    if engine == "static" and static_options:
+        error = f"engine='static' cannot be used with: {', '.join(sorted(static_options))}"
+        return [CrawlResponse(success=False, url=url, error=error) for url in urls]
+    use_static = engine != "browser" and static_fetcher.enabled and not static_options
+    
+    async def finish(index: int, response: CrawlResponse) -> CrawlResponse:
+        nonlocal completed
+        if not stream_results:
+            return response
+        completed += 1
+        await _stream_result(ctx, completed, len(urls), {
+            "type": "batch_crawl_result",
+            "index": index,
+            **response.model_dump()
+        })
+        # The full result has been delivered; keep only the summary
+        return CrawlResponse(
+            success=response.success,
+            url=response.url,
+            title=response.title,
+            error=response.error
+        )
+    
+    async def crawl_single(url: str) -> CrawlResponse:
+        try:
+            default_config = {"verbose": False, "log_console": False, "page_timeout": dynamic_timeout * 1000}
+            crawl_config = CrawlerRunConfig(**{**default_config, **(config or {})})
+            
+            async with limiter.limit(url):
+                if use_static:
+                    static_result = await static_fetcher.crawl(
+                        url,
+                        timeout=dynamic_timeout,
+                        wait_for=(config or {}).get("wait_for"),
+                        css_selector=(config or {}).get("css_selector"),
+                        force=engine == "static"
+                    )
+                    if static_result['success']:
+                        return CrawlResponse(
+                            success=True,
+                            url=url,
+                            title=static_result.get('title'),
+                            content=static_result.get('cleaned_html'),
+                            markdown=static_result.get('markdown'),
+                        )
+                    if not static_result.get('escalate'):
+                        return CrawlResponse(success=False, url=url, error=static_result.get('error'))
+                
+                async with browser_pool.crawler() as crawler:
+                    result = await crawler.arun(url=url, config=crawl_config)
+            
+            if result.success:
+                if use_static:
+                    static_fetcher.browser_succeeded(url, static_result.get('escalate'))
+                return CrawlResponse(
+                    success=True,
+                    url=url,
+                    title=result.metadata.get("title"),
+                    content=result.cleaned_html,
+                    markdown=result.markdown,
+                )
+            return CrawlResponse(
+                success=False,
+                url=url,
+                error=f"Failed to crawl: {result.error_message}"
+            )
+            
+        except Exception as e:
+            return CrawlResponse(
+                success=False,
+                url=url,
+                error=f"Error crawling {url}: {str(e)}"
+            )
+    
+    async def _crawl_and_finish(index: int, url: str) -> CrawlResponse:
+        return await finish(index, await crawl_single(url))
     
     try:
         with suppress_stdout_stderr():
-            async with AsyncWebCrawler(verbose=False) as crawler:
-                for url in urls:
-                    try:
-                        default_config = {"verbose": False, "log_console": False, "page_timeout": dynamic_timeout * 1000}
-                        crawl_config = CrawlerRunConfig(**{**default_config, **(config or {})})
-                        result = await crawler.arun(url=url, config=crawl_config)
-                        
-                        if result.success:
-                            response = CrawlResponse(
-                                success=True,
-                                url=url,
-                                title=result.metadata.get("title"),
-                                content=result.cleaned_html,
-                                markdown=result.markdown,
-                            )
-                        else:
-                            response = CrawlResponse(
-                                success=False,
-                                url=url,
-                                error=f"Failed to crawl: {result.error_message}"
-                            )
-                            
-                        results.append(response)
-                        
-                    except Exception as e:
-                        results.append(CrawlResponse(
-                            success=False,
-                            url=url,
-                            error=f"Error crawling {url}: {str(e)}"
-                        ))
+            results = await asyncio.gather(*[
+                _crawl_and_finish(i, url) for i, url in enumerate(urls)
+            ])
+        return list(results)
                     
     except Exception as e:
         # If crawler setup fails, return error for all URLs
-        for url in urls:
-            results.append(CrawlResponse(
+        return [
+            CrawlResponse(
                 success=False,
                 url=url,
                 error=f"Crawler initialization error: {str(e)}"
-            ))
-    
-    return results
+            )
+            for url in urls
+        ]
 
 
 @mcp.tool
@@ -1900,10 +2812,9 @@ async def crawl_url_with_fallback(request: CrawlRequest) -> CrawlResponse:
     for i, strategy in enumerate(strategies):
         try:
             with suppress_stdout_stderr():
-                async with AsyncWebCrawler(
+                async with browser_pool.crawler(
                     browser_type=strategy["browser_type"],
-                    headless=strategy["headless"],
-                    verbose=False
+                    headless=strategy["headless"]
                 ) as crawler:
                     result = await crawler.arun(url=request.url, config=strategy["config"])
             
@@ -1937,7 +2848,7 @@ async def crawl_url_with_fallback(request: CrawlRequest) -> CrawlResponse:
 
 
 @mcp.tool
-async def process_file(request: FileProcessRequest) -> FileProcessResponse:
+async def process_file(request: FileProcessRequest, ctx: Optional[Context] = None) -> FileProcessResponse:
     """
     Convert documents (PDF, Word, Excel, PowerPoint, ZIP) into readable markdown text.
     
@@ -1951,8 +2862,13 @@ async def process_file(request: FileProcessRequest) -> FileProcessResponse:
     
     Note: crawl_url automatically uses this tool when detecting file URLs.
     
+    ZIP members are converted in parallel. With stream_results=true each member is sent
+    as a progress/log notification as soon as it is converted, and the final
+    archive_contents lists members without their content.
+    
     Args:
         request: FileProcessRequest containing file URL and processing parameters
+        ctx: MCP request context (injected automatically; used for streaming)
         
     Example MCP Call:
         {
@@ -1972,10 +2888,16 @@ async def process_file(request: FileProcessRequest) -> FileProcessResponse:
         FileProcessResponse with processed content and metadata
     """
     try:
+        on_member = None
+        if request.stream_results and request.extract_all_from_zip:
+            async def on_member(entry: Dict[str, Any], finished: int):
+                await _stream_result(ctx, finished, None, {"type": "zip_member", **entry})
+        
         # Process the file
         result = await file_processor.process_file_from_url(
             request.url,
-            max_size_mb=request.max_size_mb
+            max_size_mb=request.max_size_mb,
+            on_member=on_member
         )
         
         if result['success']:
@@ -2073,6 +2995,46 @@ async def get_supported_file_formats() -> Dict[str, Any]:
         }
 
 
+def _youtube_transcript_response(result: Dict[str, Any], url: str) -> YouTubeTranscriptResponse:
+    """Convert a YouTubeProcessor result into a YouTubeTranscriptResponse."""
+    if not result.get('success'):
+        return YouTubeTranscriptResponse(
+            success=False,
+            url=url,
+            error=result.get('error', 'Unknown error during transcript extraction')
+        )
+    
+    transcript_data = result['transcript']
+    language_info = result['language_info']
+    
+    transcript = {
+        'full_text': transcript_data['full_text'],
+        'segment_count': transcript_data.get('segment_count', 0),
+        'word_count': transcript_data.get('word_count', 0),
+        'duration_seconds': transcript_data.get('duration_seconds', 0),
+        'duration_formatted': transcript_data.get('duration_formatted', '0s')
+    }
+    # Optional views are only present when requested
+    if transcript_data.get('clean_text') is not None:
+        transcript['clean_text'] = transcript_data['clean_text']
+    if transcript_data.get('segments') is not None:
+        transcript['segments'] = transcript_data['segments']
+    
+    return YouTubeTranscriptResponse(
+        success=True,
+        url=result['url'],
+        video_id=result['video_id'],
+        transcript=transcript,
+        language_info={
+            'source_language': language_info['source_language'],
+            'final_language': language_info['final_language'],
+            'is_translated': language_info['is_translated']
+        },
+        processing_method=result['processing_method'],
+        metadata=result.get('metadata')
+    )
+
+
 @mcp.tool
 async def extract_youtube_transcript(request: Dict[str, Any]) -> YouTubeTranscriptResponse:
     """
@@ -2097,6 +3059,7 @@ async def extract_youtube_transcript(request: Dict[str, Any]) -> YouTubeTranscri
     - Automatic language preference handling
     - Both manual and auto-generated captions
     - Basic video information extraction
+    - Per-segment timings only when include_segments=true (keeps long videos compact)
     
     No Setup Required:
     - Works directly with public YouTube videos that have transcripts
@@ -2149,40 +3112,13 @@ async def extract_youtube_transcript(request: Dict[str, Any]) -> YouTubeTranscri
             translate_to=transcript_request.translate_to,
             include_timestamps=transcript_request.include_timestamps,
             preserve_formatting=transcript_request.preserve_formatting,
-            include_metadata=transcript_request.include_metadata
+            include_metadata=transcript_request.include_metadata,
+            use_cache=transcript_request.use_cache,
+            include_segments=transcript_request.include_segments,
+            include_clean_text=transcript_request.include_clean_text
         )
         
-        if result['success']:
-            transcript_data = result['transcript']
-            language_info = result['language_info']
-            
-            return YouTubeTranscriptResponse(
-                success=True,
-                url=result['url'],
-                video_id=result['video_id'],
-                transcript={
-                    'full_text': transcript_data['full_text'],
-                    'clean_text': transcript_data['clean_text'],
-                    'segments': transcript_data.get('segments', []),
-                    'segment_count': transcript_data.get('segment_count', 0),
-                    'word_count': transcript_data.get('word_count', 0),
-                    'duration_seconds': transcript_data.get('duration_seconds', 0),
-                    'duration_formatted': transcript_data.get('duration_formatted', '0s')
-                },
-                language_info={
-                    'source_language': language_info['source_language'],
-                    'final_language': language_info['final_language'],
-                    'is_translated': language_info['is_translated']
-                },
-                processing_method=result['processing_method'],
-                metadata=result.get('metadata')
-            )
-        else:
-            return YouTubeTranscriptResponse(
-                success=False,
-                url=transcript_request.url,
-                error=result.get('error', 'Unknown error during transcript extraction')
-            )
+        return _youtube_transcript_response(result, transcript_request.url)
                 
     except Exception as e:
         return YouTubeTranscriptResponse(
@@ -2193,7 +3129,7 @@ async def extract_youtube_transcript(request: Dict[str, Any]) -> YouTubeTranscri
 
 
 @mcp.tool
-async def batch_extract_youtube_transcripts(request: Dict[str, Any]) -> YouTubeBatchResponse:
+async def batch_extract_youtube_transcripts(request: Dict[str, Any], ctx: Optional[Context] = None) -> YouTubeBatchResponse:
     """
     Extract transcripts from multiple YouTube videos using youtube-transcript-api.
     
@@ -2202,13 +3138,19 @@ async def batch_extract_youtube_transcripts(request: Dict[str, Any]) -> YouTubeB
     
     Features:
     - Concurrent processing with configurable limits
+    - Request rate shared by all YouTube tools, slowing down automatically when YouTube throttles
+    - Throttled or timed-out videos are retried with jittered backoff
     - youtube-transcript-api integration
     - Comprehensive error handling per video
     - Batch processing statistics
     - No authentication required
     
+    With stream_results=true each video's transcript is sent as a progress/log notification
+    as soon as it is ready, and the final results list only carries per-video status.
+    
     Args:
         request: YouTubeBatchRequest containing URLs and extraction parameters
+        ctx: MCP request context (injected automatically; used for streaming)
         
     Example MCP Call:
         {
@@ -2248,49 +3190,48 @@ async def batch_extract_youtube_transcripts(request: Dict[str, Any]) -> YouTubeB
                 }
             )
         
-        # Validate and limit concurrent requests
-        max_concurrent = min(max(1, batch_request.max_concurrent), 5)  # Conservative limit for stability
-        
-        # Create individual transcript requests
-        async def process_single_url(url: str) -> YouTubeTranscriptResponse:
-            single_request = {
-                'url': url,
-                'languages': batch_request.languages,
-                'translate_to': batch_request.translate_to,
-                'include_timestamps': batch_request.include_timestamps
-            }
-            return await extract_youtube_transcript(single_request)
+        # Throughput is set by the shared YouTube rate limiter, not by this cap
+        max_concurrent = min(max(1, batch_request.max_concurrent), 20)
+        max_retries = min(max(0, batch_request.max_retries), 5)
         
-        # Process URLs with semaphore for concurrency control
-        semaphore = asyncio.Semaphore(max_concurrent)
-        
-        async def process_with_semaphore(url: str) -> YouTubeTranscriptResponse:
-            async with semaphore:
-                return await process_single_url(url)
-        
-        # Execute all requests concurrently
-        tasks = [process_with_semaphore(url) for url in batch_request.urls]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results and handle exceptions
-        response_results = []
+        response_results: List[Optional[YouTubeTranscriptResponse]] = [None] * len(batch_request.urls)
         successful_extractions = 0
         failed_extractions = 0
-        
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                response_results.append(YouTubeTranscriptResponse(
-                    success=False,
-                    url=batch_request.urls[i],
-                    error=f"Processing exception: {str(result)}"
-                ))
-                failed_extractions += 1
+        retried_videos = 0
+        completed = 0
+        
+        async for index, result in youtube_processor.iter_batch_transcripts(
+            batch_request.urls,
+            languages=batch_request.languages,
+            translate_to=batch_request.translate_to,
+            include_timestamps=batch_request.include_timestamps,
+            max_concurrent=max_concurrent,
+            max_retries=max_retries,
+            include_metadata=batch_request.include_metadata
+        ):
+            response = _youtube_transcript_response(result, batch_request.urls[index])
+            completed += 1
+            if response.success:
+                successful_extractions += 1
             else:
-                response_results.append(result)
-                if result.success:
-                    successful_extractions += 1
-                else:
-                    failed_extractions += 1
+                failed_extractions += 1
+            if result.get('attempts', 1) > 1:
+                retried_videos += 1
+            
+            if batch_request.stream_results:
+                await _stream_result(ctx, completed, len(batch_request.urls), {
+                    "type": "youtube_transcript",
+                    "index": index,
+                    **response.model_dump()
+                })
+                # The full transcript has been delivered; keep only the summary
+                response = YouTubeTranscriptResponse(
+                    success=response.success,
+                    url=response.url,
+                    video_id=response.video_id,
+                    error=response.error
+                )
+            response_results[index] = response
         
         # Determine overall success
         overall_success = successful_extractions > 0
@@ -2305,7 +3246,9 @@ async def batch_extract_youtube_transcripts(request: Dict[str, Any]) -> YouTubeB
                 'processing_method': 'youtube_transcript_api_batch',
                 'total_processed': len(batch_request.urls),
                 'success_rate': f"{(successful_extractions/len(batch_request.urls)*100):.1f}%" if batch_request.urls else "0%",
-                'concurrent_limit': max_concurrent
+                'concurrent_limit': max_concurrent,
+                'retried_videos': retried_videos,
+                'rate_limiter': youtube_processor.rate_limiter.get_stats()
             }
         )
         
@@ -2332,6 +3275,196 @@ async def batch_extract_youtube_transcripts(request: Dict[str, Any]) -> YouTubeB
         )
 
 
+@mcp.tool
+async def extract_youtube_playlist_transcripts(
+    url: str,
+    languages: Optional[List[str]] = None,
+    translate_to: Optional[str] = None,
+    include_timestamps: bool = True,
+    max_videos: int = 200,
+    max_concurrent: int = 5,
+    skip_stored: bool = True,
+    stream_results: bool = True,
+    ctx: Optional[Context] = None
+) -> Dict[str, Any]:
+    """
+    Extract transcripts for every video of a YouTube playlist or channel.
+    
+    USE WHEN: User provides a playlist URL (youtube.com/playlist?list=...) or a channel URL
+    (youtube.com/@handle, /channel/UC..., /c/..., /user/...) and wants the videos as text.
+    OUTPUTS: One transcript per video, streamed as each finishes, plus run statistics.
+    
+    Video IDs are resolved page by page and extraction starts as soon as each page arrives,
+    through the same rate-limited, retrying pipeline as batch_extract_youtube_transcripts.
+    Videos whose transcript is already in the local transcript store are skipped
+    (skip_stored=true), so re-running on a growing playlist only fetches new videos.
+    
+    Args:
+        url: YouTube playlist or channel URL
+        languages: Preferred transcript languages in order of preference (default: ["ja", "en"])
+        translate_to: Optional target language for translation
+        include_timestamps: Include timestamps in transcripts (default: True)
+        max_videos: Maximum number of videos to resolve (default: 200)
+        max_concurrent: Maximum videos in flight (1-20, default: 5)
+        skip_stored: Skip videos already in the transcript store (default: True)
+        stream_results: Send each transcript as a progress/log notification when ready;
+            the final result then only lists per-video status (default: True)
+        ctx: MCP request context (injected automatically; used for streaming)
+        
+    Example MCP Call:
+        {
+          "url": "https://www.youtube.com/playlist?list=PLxxxxxxxx",
+          "languages": ["en"],
+          "max_videos": 50
+        }
+        
+    Returns:
+        Dictionary with per-video results and playlist statistics
+    """
+    if parse_collection_url(url) is None:
+        return {
+            "success": False,
+            "url": url,
+            "error": "URL is not a YouTube playlist or channel URL"
+        }
+    
+    languages = languages or ["ja", "en"]
+    max_concurrent = min(max(1, max_concurrent), 20)
+    results: List[Dict[str, Any]] = []
+    counts = {"extracted": 0, "skipped": 0, "failed": 0}
+    error = None
+    
+    async def video_urls():
+        async for video_id in playlist_resolver.iter_video_ids(url, max_videos=max_videos):
+            yield f"https://www.youtube.com/watch?v={video_id}"
+    
+    try:
+        async for index, result in youtube_processor.iter_batch_transcripts(
+            video_urls(),
+            languages=languages,
+            translate_to=translate_to,
+            include_timestamps=include_timestamps,
+            max_concurrent=max_concurrent,
+            skip_stored=skip_stored,
+            include_metadata=False
+        ):
+            if result.get("skipped"):
+                counts["skipped"] += 1
+                entry = {
+                    "index": index,
+                    "url": result["url"],
+                    "video_id": result.get("video_id"),
+                    "status": "already_stored"
+                }
+            else:
+                response = _youtube_transcript_response(result, result["url"])
+                counts["extracted" if response.success else "failed"] += 1
+                entry = {
+                    "index": index,
+                    "status": "extracted" if response.success else "failed",
+                    **response.model_dump(exclude_none=True)
+                }
+            
+            if stream_results:
+                await _stream_result(ctx, len(results) + 1, None, {"type": "youtube_playlist_video", **entry})
+                # The full transcript has been delivered; keep only the status
+                entry.pop("transcript", None)
+                entry.pop("metadata", None)
+            results.append(entry)
+    
+    except Exception as e:
+        # Keep the videos finished before playlist resolution failed
+        error = f"Playlist processing stopped: {str(e)}"
+    
+    results.sort(key=lambda entry: entry["index"])
+    return {
+        "success": error is None or bool(results),
+        "url": url,
+        "videos_found": len(results),
+        "extracted_videos": counts["extracted"],
+        "skipped_videos": counts["skipped"],
+        "failed_videos": counts["failed"],
+        "partial": error is not None,
+        "error": error,
+        "results": results,
+        "processing_summary": {
+            "processing_method": "youtube_transcript_api_playlist",
+            "max_videos": max_videos,
+            "concurrent_limit": max_concurrent,
+            "rate_limiter": youtube_processor.rate_limiter.get_stats()
+        }
+    }
+
+
+@mcp.tool
+async def query_youtube_transcript(
+    video_url: str,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    query: Optional[str] = None,
+    match_all: bool = True,
+    context_segments: int = 0,
+    max_results: int = 100,
+    languages: Optional[List[str]] = None,
+    translate_to: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get only part of a YouTube transcript: a time range and/or the segments mentioning a term.
+    
+    USE WHEN: Only some minutes of a long video matter ("minutes 40-55"), or you need
+    where and when something is said ("every mention of pricing").
+    OUTPUTS: Matching segments with timestamps, instead of the whole transcript.
+    
+    vs extract_youtube_transcript: Use this when the full transcript would be too large
+    or mostly irrelevant; repeated queries on the same video reuse its index.
+    
+    Args:
+        video_url: YouTube video URL
+        start_time: Range start as seconds, "MM:SS" or "HH:MM:SS" (optional)
+        end_time: Range end as seconds, "MM:SS" or "HH:MM:SS" (optional)
+        query: Words to search for; wrap in double quotes to match an exact phrase (optional)
+        match_all: Require all query words in a segment (True) or any of them (False)
+        context_segments: Neighbouring segments to include around each match (default: 0)
+        max_results: Maximum matching segments to return (default: 100)
+        languages: Preferred transcript languages in order of preference (default: ["ja", "en"])
+        translate_to: Optional target language for translation
+        
+    Example MCP Call:
+        {
+          "video_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+          "start_time": "40:00",
+          "end_time": "55:00",
+          "query": "neural network"
+        }
+        
+    IMPORTANT: All parameters are passed directly, NOT as a nested 'request' object.
+        
+    Returns:
+        Dictionary with the selected segments and match statistics
+    """
+    video_id = youtube_processor.extract_video_id(video_url)
+    if not video_id:
+        return {
+            'success': False,
+            'error': 'URL is not a valid YouTube video URL',
+            'url': video_url
+        }
+    
+    result = await youtube_processor.query_transcript(
+        video_id,
+        languages=languages or ["ja", "en"],
+        translate_to=translate_to,
+        start_time=start_time,
+        end_time=end_time,
+        query=query,
+        match_all=match_all,
+        context_segments=max(0, context_segments),
+        max_results=max(1, max_results)
+    )
+    result['url'] = video_url
+    return result
+
+
 @mcp.tool
 async def get_youtube_video_info(
     video_url: str,
@@ -2398,51 +3531,57 @@ async def get_youtube_video_info(
             }
         
         # Get video info using youtube-transcript-api
-        video_info = youtube_processor.get_video_info(video_id)
+        video_info = await youtube_processor.get_video_info(video_id)
         video_info['url'] = video_url
         video_info['success'] = not video_info.get('error')
         
         # If summarization is requested and video has transcripts, get and process transcript
         if summarize_transcript and video_info['success'] and video_info.get('has_transcripts'):
             try:
-                # Get the full transcript
-                transcript_result = await youtube_processor.process_youtube_url(
-                    video_url, 
-                    languages=['ja', 'en'], 
-                    include_timestamps=include_timestamps,
-                    format='text'
-                )
+                from .config import config_manager
+                tokenizer_model = llm_model or config_manager.get_default_model()
+                
+                # Get the full transcript (from the transcript store when available)
+                loaded = await youtube_processor.load_transcript(video_id, languages=['ja', 'en'])
+                segments = loaded['segments']
                 
-                if transcript_result.get('success') and transcript_result.get('transcript'):
-                    transcript_text = transcript_result['transcript']
+                if len(segments):
+                    transcript_text = segments.render(include_timestamps=include_timestamps)
                     
-                    # Check if transcript exceeds token limit (rough estimate: 1 token ≈ 4 chars)
-                    estimated_tokens = len(transcript_text) // 4
+                    # Count tokens with the tokenizer of the requested (or default) model
+                    token_count = count_tokens(transcript_text, tokenizer_model)
                     
-                    if estimated_tokens > max_tokens:
-                        # Summarize using LLM
+                    if token_count > max_tokens:
+                        # Summarize using LLM (map-reduce over segment-aligned chunks)
                         summary_result = await youtube_processor.summarize_transcript(
                             transcript_text,
                             summary_length=summary_length,
                             include_timestamps=include_timestamps,
                             llm_provider=llm_provider,
-                            llm_model=llm_model
+                            llm_model=llm_model,
+                            segments=segments
                         )
                         
                         if summary_result.get('success'):
                             video_info['transcript_summary'] = summary_result['summary']
-                            video_info['original_length'] = estimated_tokens
-                            video_info['summary_length'] = len(summary_result['summary']) // 4
+                            video_info['original_length'] = token_count
+                            video_info['summary_length'] = count_tokens(summary_result['summary'], tokenizer_model)
                             video_info['summarized'] = True
+                            video_info['summary_info'] = {
+                                'strategy': summary_result.get('strategy'),
+                                'chunk_count': summary_result.get('chunk_count'),
+                                'llm_calls': summary_result.get('llm_calls'),
+                                'key_timestamps': summary_result.get('key_timestamps', [])
+                            }
                         else:
                             video_info['transcript_error'] = f"Summarization failed: {summary_result.get('error', 'Unknown error')}"
                     else:
                         # Transcript is within limits, include as-is
                         video_info['transcript'] = transcript_text
-                        video_info['transcript_length'] = estimated_tokens
+                        video_info['transcript_length'] = token_count
                         video_info['summarized'] = False
                 else:
-                    video_info['transcript_error'] = f"Failed to extract transcript: {transcript_result.get('error', 'Unknown error')}"
+                    video_info['transcript_error'] = "Failed to extract transcript: No transcript data found"
                     
             except Exception as transcript_error:
                 video_info['transcript_error'] = f"Transcript processing failed: {str(transcript_error)}"
@@ -2741,8 +3880,7 @@ async def batch_search_google(request: GoogleBatchSearchRequest, include_current
         )
 
 
-@mcp.tool
-async def search_and_crawl(
+async def _internal_search_and_crawl(
     search_query: str,
     num_search_results: int = 5,
     crawl_top_results: int = 3,
@@ -2750,66 +3888,44 @@ async def search_and_crawl(
     generate_markdown: bool = True,
     search_genre: Optional[str] = None,
     base_timeout: int = 30,
-    include_current_date: bool = True
+    include_current_date: bool = True,
+    max_concurrent: int = 5
 ) -> Dict[str, Any]:
     """
-    🔍🕷️ Google search + automatic content extraction in ONE powerful step.
-    
-    ⭐ COMBINED POWER: Finds relevant pages AND extracts their full content automatically.
-    
-    USE WHEN:
-    - Research that needs both discovery AND content analysis
-    - Competitive analysis ("find competitor pricing pages and extract details")  
-    - Current events analysis ("latest AI news with full articles")
-    - Market research with comprehensive content
-    
-    🎯 SMART DEFAULTS:
-    - crawl_top_results=3 (good balance of speed vs coverage)
-    - Automatic timeout scaling based on page count
-    - 31 search genres available for targeted results
-    
-    📊 WHAT TO EXPECT:
-    ✅ Success: Search results + full page content + analysis summary
-    ⚠️ Partial success: Some pages may fail (success rate reported)
-    ⏱️ Time: ~30-90 seconds depending on page count and complexity
+    Search Google and crawl the top results.
     
-    GENRE EXAMPLES:
-    - "academic" - Research papers, scholarly articles
-    - "news" - Latest news articles  
-    - "technical" - Documentation, tutorials
-    - "shopping" - Product pages, e-commerce
+    Crawls start as soon as each result URL arrives from the search and run
+    concurrently (bounded globally and per domain). Crawls still running when
+    the overall deadline passes are cancelled and reported as timed out.
     
-    vs search_google: Use this for full content analysis; search_google for URLs only
-    vs deep_crawl_site: Use this for discovery; deep_crawl_site for known sites
-    
-    Example for research:
-    {
-      "search_query": "latest AI developments 2024",
-      "num_search_results": 8,
-      "crawl_top_results": 5,
-      "search_genre": "news",
-      "include_current_date": true
-    }
-    
-    Example for competitive analysis:
-    {
-      "search_query": "competitor pricing SaaS tools",  
-      "num_search_results": 10,
-      "crawl_top_results": 4,
-      "search_genre": "technical"
-    }
-    
-    IMPORTANT: All parameters are passed directly, NOT as a nested 'request' object.
-    Returns: Dictionary with search results and crawled content
+    Args:
+        search_query: Search query
+        num_search_results: Number of search results to fetch (1-20)
+        crawl_top_results: Number of top results to crawl (1-10)
+        extract_media: Whether to extract media from crawled pages
+        generate_markdown: Whether to generate markdown for crawled pages
+        search_genre: Optional search genre for content filtering
+        base_timeout: Per-page crawl timeout in seconds
+        include_current_date: Whether to append the current date to the query
+        max_concurrent: Maximum number of pages crawled at the same time (1-10)
+        
+    Returns:
+        Dictionary with search results and crawled content
     """
+    crawl_tasks: Dict[asyncio.Task, tuple] = {}
     try:
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        
         # Validate parameters
         num_search_results = max(1, min(20, num_search_results))
         crawl_top_results = max(1, min(10, min(crawl_top_results, num_search_results)))
+        max_concurrent = max(1, min(10, max_concurrent))
         
-        # Calculate dynamic timeout based on crawl count
-        # Base timeout + additional time per URL (10s per additional URL after the first)
-        dynamic_timeout = base_timeout + max(0, (crawl_top_results - 1) * 10)
+        # Overall deadline: one page timeout per wave of concurrent crawls,
+        # plus headroom for the search itself
+        waves = (crawl_top_results + max_concurrent - 1) // max_concurrent
+        deadline = base_timeout * waves + 10
         
         # Enhance query with current date for latest results
         enhanced_query = search_query
@@ -2818,9 +3934,43 @@ async def search_and_crawl(
             current_date = datetime.now().strftime("%Y-%m-%d")
             enhanced_query = f"{search_query} {current_date}"
         
-        # Step 1: Perform Google search
-        search_result = await google_search_processor.search_google(
-            query=enhanced_query,
+        limiter = HostLimiter(max_concurrent=max_concurrent, max_per_host=2)
+        
+        async def crawl_one(url: str) -> CrawlResponse:
+            async with limiter.limit(url):
+                return await _internal_crawl_url(CrawlRequest(
+                    url=url,
+                    extract_media=extract_media,
+                    generate_markdown=generate_markdown,
+                    timeout=base_timeout
+                ))
+        
+        # Step 1: Stream Google results, starting a crawl for each top URL as it arrives
+        urls = []
+        search_error = None
+        try:
+            async for url in google_search_processor.stream_search_urls(
+                enhanced_query,
+                num_results=num_search_results,
+                search_genre=search_genre
+            ):
+                urls.append(url)
+                if len(crawl_tasks) < crawl_top_results:
+                    crawl_tasks[asyncio.create_task(crawl_one(url))] = (len(urls), url)
+        except Exception as e:
+            search_error = e
+        
+        if not urls:
+            return {
+                'success': False,
+                'error': f"Search failed: {search_error}" if search_error else 'No search results found',
+                'search_query': search_query
+            }
+        
+        # Titles and snippets are fetched while the crawls are already running
+        search_result = await google_search_processor.build_search_response(
+            enhanced_query,
+            urls,
             num_results=num_search_results,
             search_genre=search_genre
         )
@@ -2833,65 +3983,73 @@ async def search_and_crawl(
             }
         
         search_results = search_result['results']
-        if not search_results:
-            return {
-                'success': False,
-                'error': 'No search results found',
-                'search_query': search_query
-            }
+        results_by_url = {result['url']: result for result in search_results}
         
-        # Step 2: Crawl top results
-        top_urls = [result['url'] for result in search_results[:crawl_top_results]]
+        # Step 2: Wait for the crawls until the overall deadline
+        remaining = max(0.0, deadline - (loop.time() - started_at))
+        done, pending = await asyncio.wait(crawl_tasks.keys(), timeout=remaining)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
         
         crawl_results = []
-        for i, url in enumerate(top_urls):
-            try:
-                crawl_request = CrawlRequest(
-                    url=url,
-                    extract_media=extract_media,
-                    generate_markdown=generate_markdown,
-                    timeout=dynamic_timeout
-                )
-                
-                crawl_result = await _internal_crawl_url(crawl_request)
-                
-                # Add search ranking to crawl result
-                crawl_data = {
-                    'search_rank': i + 1,
-                    'search_result': search_results[i],
+        for task, (rank, url) in sorted(crawl_tasks.items(), key=lambda item: item[1][0]):
+            search_entry = results_by_url.get(url, {'rank': rank, 'url': url})
+            
+            if task in pending:
+                crawl_results.append({
+                    'search_rank': rank,
+                    'search_result': search_entry,
                     'crawl_result': {
-                        'success': crawl_result.success,
-                        'url': crawl_result.url,
-                        'title': crawl_result.title,
-                        'content_length': len(crawl_result.content or ''),
-                        'has_content': bool(crawl_result.content),
-                        'has_markdown': bool(crawl_result.markdown),
-                        'has_media': bool(crawl_result.media),
-                        'error': crawl_result.error
-                    }
-                }
-                
-                # Include full content for successful crawls
-                if crawl_result.success:
-                    crawl_data['content'] = {
-                        'title': crawl_result.title,
-                        'content': crawl_result.content,
-                        'markdown': crawl_result.markdown,
-                        'media': crawl_result.media if extract_media else None
+                        'success': False,
+                        'url': url,
+                        'timed_out': True,
+                        'error': f"Crawling did not finish within the {deadline}s overall deadline"
                     }
-                
-                crawl_results.append(crawl_data)
-                
+                })
+                continue
+            
+            try:
+                crawl_result = task.result()
             except Exception as e:
                 crawl_results.append({
-                    'search_rank': i + 1,
-                    'search_result': search_results[i],
+                    'search_rank': rank,
+                    'search_result': search_entry,
                     'crawl_result': {
                         'success': False,
                         'url': url,
                         'error': f"Crawling failed: {str(e)}"
                     }
                 })
+                continue
+            
+            # Add search ranking to crawl result
+            crawl_data = {
+                'search_rank': rank,
+                'search_result': search_entry,
+                'crawl_result': {
+                    'success': crawl_result.success,
+                    'url': crawl_result.url,
+                    'title': crawl_result.title,
+                    'content_length': len(crawl_result.content or ''),
+                    'has_content': bool(crawl_result.content),
+                    'has_markdown': bool(crawl_result.markdown),
+                    'has_media': bool(crawl_result.media),
+                    'error': crawl_result.error
+                }
+            }
+            
+            # Include full content for successful crawls
+            if crawl_result.success:
+                crawl_data['content'] = {
+                    'title': crawl_result.title,
+                    'content': crawl_result.content,
+                    'markdown': crawl_result.markdown,
+                    'media': crawl_result.media if extract_media else None
+                }
+            
+            crawl_results.append(crawl_data)
         
         # Step 3: Generate summary
         successful_crawls = sum(1 for r in crawl_results if r['crawl_result']['success'])
@@ -2903,6 +4061,7 @@ async def search_and_crawl(
         
         return {
             'success': True,
+            'partial': bool(pending) or search_error is not None,
             'search_query': search_query,
             'search_metadata': search_result['search_metadata'],
             'crawl_summary': {
@@ -2910,8 +4069,11 @@ async def search_and_crawl(
                 'urls_crawled': len(crawl_results),
                 'successful_crawls': successful_crawls,
                 'failed_crawls': len(crawl_results) - successful_crawls,
+                'timed_out_crawls': len(pending),
                 'total_content_length': total_content_length,
-                'success_rate': f"{(successful_crawls/len(crawl_results)*100):.1f}%" if crawl_results else "0%"
+                'success_rate': f"{(successful_crawls/len(crawl_results)*100):.1f}%" if crawl_results else "0%",
+                'deadline_seconds': deadline,
+                'elapsed_seconds': round(loop.time() - started_at, 2)
             },
             'search_results': search_results,
             'crawled_content': crawl_results,
@@ -2924,6 +4086,104 @@ async def search_and_crawl(
             'error': f"Search and crawl error: {str(e)}",
             'search_query': search_query
         }
+    finally:
+        # Never leave crawls running after an early return or error
+        for task in crawl_tasks:
+            if not task.done():
+                task.cancel()
+
+
+@mcp.tool
+async def search_and_crawl(
+    search_query: str,
+    num_search_results: int = 5,
+    crawl_top_results: int = 3,
+    extract_media: bool = False,
+    generate_markdown: bool = True,
+    search_genre: Optional[str] = None,
+    base_timeout: int = 30,
+    include_current_date: bool = True,
+    max_concurrent: int = 5,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    🔍🕷️ Google search + automatic content extraction in ONE powerful step.
+    
+    ⭐ COMBINED POWER: Finds relevant pages AND extracts their full content automatically.
+    
+    USE WHEN:
+    - Research that needs both discovery AND content analysis
+    - Competitive analysis ("find competitor pricing pages and extract details")  
+    - Current events analysis ("latest AI news with full articles")
+    - Market research with comprehensive content
+    
+    🎯 SMART DEFAULTS:
+    - crawl_top_results=3 (good balance of speed vs coverage)
+    - Crawls start while the search is still returning results, max_concurrent=5 at a time
+    - Overall deadline scales with the number of crawl waves; slow pages come back as timed out
+    - 31 search genres available for targeted results
+    
+    📊 WHAT TO EXPECT:
+    ✅ Success: Search results + full page content + analysis summary
+    ⚠️ Partial success: Some pages may fail (success rate reported)
+    ⏱️ Time: ~10-40 seconds depending on page count and complexity
+    
+    GENRE EXAMPLES:
+    - "academic" - Research papers, scholarly articles
+    - "news" - Latest news articles  
+    - "technical" - Documentation, tutorials
+    - "shopping" - Product pages, e-commerce
+    
+    vs search_google: Use this for full content analysis; search_google for URLs only
+    vs deep_crawl_site: Use this for discovery; deep_crawl_site for known sites
+    
+    Example for research:
+    {
+      "search_query": "latest AI developments 2024",
+      "num_search_results": 8,
+      "crawl_top_results": 5,
+      "search_genre": "news",
+      "include_current_date": true
+    }
+    
+    Example for competitive analysis:
+    {
+      "search_query": "competitor pricing SaaS tools",  
+      "num_search_results": 10,
+      "crawl_top_results": 4,
+      "search_genre": "technical"
+    }
+    
+    Repeat queries are answered from the result cache; set use_cache=false to search again.
+    
+    IMPORTANT: All parameters are passed directly, NOT as a nested 'request' object.
+    Returns: Dictionary with search results and crawled content
+    """
+    cache_key = None
+    if use_cache:
+        from datetime import datetime
+        # The date is part of the effective query when include_current_date is set
+        query_date = datetime.now().strftime("%Y-%m-%d") if include_current_date else None
+        cache_key = make_cache_key(
+            search_query, query_date, num_search_results, crawl_top_results,
+            extract_media, generate_markdown, search_genre
+        )
+    
+    return await _cached_result(
+        "search_and_crawl",
+        cache_key,
+        lambda: _internal_search_and_crawl(
+            search_query=search_query,
+            num_search_results=num_search_results,
+            crawl_top_results=crawl_top_results,
+            extract_media=extract_media,
+            generate_markdown=generate_markdown,
+            search_genre=search_genre,
+            base_timeout=base_timeout,
+            include_current_date=include_current_date,
+            max_concurrent=max_concurrent
+        )
+    )
 
 
 @mcp.tool
@@ -3004,7 +4264,7 @@ async def get_tool_selection_guide() -> Dict[str, Any]:
         "tool_selection_guide": TOOL_SELECTION_GUIDE,
         "workflow_guide": WORKFLOW_GUIDE,
         "complexity_guide": COMPLEXITY_GUIDE,
-        "total_tools": 18,
+        "total_tools": 22,
         "guide_categories": [
             "single_content_extraction",
             "multi_page_analysis", 
@@ -3021,6 +4281,63 @@ async def get_tool_selection_guide() -> Dict[str, Any]:
     }
 
 
+@mcp.tool
+async def get_cache_stats(clear_namespace: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get result cache, transcript store, LLM cache, content router, browser pool, HTTP connection pool and file conversion pool statistics.
+    
+    USE WHEN: Checking how often repeat requests are answered without crawling,
+    or clearing cached results for one tool (e.g. after a site was updated).
+    OUTPUTS: Hit/miss counters, entry counts, sizes and TTLs per tool, plus browser, HTTP and conversion pool usage.
+    
+    Args:
+        clear_namespace: Optional tool name whose cached results should be removed first
+            (crawl_url, extract_entities, intelligent_extract, search_and_crawl, page_snapshot),
+            "youtube_transcripts" to empty the transcript store, "llm_cache" to drop cached LLM
+            results, or "content_router" to forget detected content types
+    
+    Example MCP Call:
+        {}
+    
+    Returns:
+        Dictionary with cache and browser pool statistics
+    """
+    try:
+        cleared = None
+        if clear_namespace == "youtube_transcripts":
+            cleared = await asyncio.to_thread(transcript_store.clear)
+        elif clear_namespace == "llm_cache":
+            cleared = await asyncio.to_thread(llm_cache.clear)
+        elif clear_namespace == "content_router":
+            cleared = content_router.clear()
+        elif clear_namespace:
+            cleared = await asyncio.to_thread(result_cache.clear, clear_namespace)
+        
+        stats = {
+            "success": True,
+            "result_cache": await asyncio.to_thread(result_cache.get_stats),
+            "transcript_store": await asyncio.to_thread(transcript_store.get_stats),
+            "llm_cache": await asyncio.to_thread(llm_cache.get_stats),
+            "browser_pool": browser_pool.get_stats(),
+            "http_pool": http_pool.get_stats(),
+            "llm_clients": llm_clients.get_stats(),
+            "conversion_pool": conversion_pool.get_stats(),
+            "content_router": content_router.get_stats(),
+            "static_fetch": static_fetcher.get_stats(),
+            "youtube_rate_limiter": youtube_processor.rate_limiter.get_stats(),
+        }
+        if cleared is not None:
+            stats["cleared_entries"] = {clear_namespace: cleared}
+        return stats
+    
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Failed to get cache stats: {str(e)}",
+            "error_type": type(e).__name__
+        }
+
+
 @mcp.resource("uri://crawl4ai/config")
 async def get_crawler_config() -> str:
     """
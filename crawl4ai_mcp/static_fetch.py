@@ -0,0 +1,301 @@
+"""
+Static Fetch Module
+HTTP-only page fetching for server-rendered HTML, with heuristics that
+escalate to the browser when a page needs JavaScript
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+from .http_client import http_pool
+
+# The same scraping and markdown generation crawl4ai applies to browser results
+try:
+    try:
+        from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy as ScrapingStrategy
+    except ImportError:
+        from crawl4ai.content_scraping_strategy import WebScrapingStrategy as ScrapingStrategy
+    from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+    SCRAPING_AVAILABLE = True
+except ImportError:
+    SCRAPING_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+ENGINE_STATIC = "static"
+ENGINE_BROWSER = "browser"
+
+# Escalations that say something about the site rather than one request's options or URL
+PAGE_LEVEL_REASONS = {"framework_root", "noscript_warning", "empty_body", "bot_wall"}
+# Bot walls often answer plain clients with these but let browsers through
+BOT_WALL_STATUSES = {403, 429}
+
+# Empty mount points left by client-side frameworks (React, Vue, Next, Nuxt, Svelte, Angular)
+_FRAMEWORK_ROOT_PATTERN = re.compile(
+    r'<div[^>]+id=["\'](?:root|app|__next|__nuxt|svelte|ember-app)["\'][^>]*>\s*</div>'
+    r'|<app-root[^>]*>\s*</app-root>',
+    re.IGNORECASE
+)
+_NOSCRIPT_PATTERN = re.compile(r'<noscript[^>]*>(.*?)</noscript>', re.IGNORECASE | re.DOTALL)
+_NOSCRIPT_WARNING_PATTERN = re.compile(
+    r'(enable|requires?|need|turn on|activate)\s+javascript|javascript\s+(is\s+)?(disabled|required|must be enabled)',
+    re.IGNORECASE
+)
+_INVISIBLE_PATTERN = re.compile(r'<(script|style|noscript|template|svg)[^>]*>.*?</\1>', re.IGNORECASE | re.DOTALL)
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+def visible_text_length(html: str) -> int:
+    """Approximate number of visible text characters in an HTML document"""
+    body = _INVISIBLE_PATTERN.sub(' ', html)
+    return len(re.sub(r'\s+', ' ', _TAG_PATTERN.sub(' ', body)).strip())
+
+
+def _as_dict(value: Any) -> Dict[str, Any]:
+    """Normalize crawl4ai results, which are dicts or pydantic models depending on the version"""
+    if value is None:
+        return {}
+    if isinstance(value, dict):
+        return value
+    if hasattr(value, 'model_dump'):
+        return value.model_dump()
+    return dict(vars(value))
+
+
+class StaticFetcher:
+    """Fetch pages over pooled HTTP connections instead of a browser
+
+    A fetched page is checked for signs that it only renders with JavaScript
+    (almost no visible text, an empty framework mount point, a ``noscript``
+    warning, or a requested selector that is not in the static HTML). Such
+    pages are escalated to the browser. The engine that worked is remembered
+    per domain so later requests go straight to it; the browser is only
+    remembered once it has succeeded after a page-level escalation, not for
+    one request's selector or one failing URL.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_page_mb: int = 10,
+        min_text_chars: int = 200,
+        memory_size: int = 4096,
+        memory_ttl: float = 6 * 3600.0,
+        timeout: float = 20.0
+    ):
+        self.enabled = enabled and SCRAPING_AVAILABLE
+        self.max_page_bytes = max_page_mb * 1024 * 1024
+        self.min_text_chars = min_text_chars
+        self.memory_size = max(1, memory_size)
+        self.memory_ttl = memory_ttl
+        self.timeout = timeout
+        self._domains: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._stats = {'static_pages': 0, 'escalations': 0, 'remembered_browser': 0, 'fetch_errors': 0}
+        self._escalation_reasons: Dict[str, int] = {}
+
+    @classmethod
+    def from_env(cls) -> "StaticFetcher":
+        """Create a fetcher configured from STATIC_FETCH_* environment variables"""
+        return cls(
+            enabled=os.getenv("STATIC_FETCH_ENABLED", "true").lower() == "true",
+            max_page_mb=int(os.getenv("STATIC_FETCH_MAX_PAGE_MB", "10")),
+            min_text_chars=int(os.getenv("STATIC_FETCH_MIN_TEXT_CHARS", "200")),
+            memory_size=int(os.getenv("STATIC_FETCH_MEMORY_SIZE", "4096")),
+            memory_ttl=float(os.getenv("STATIC_FETCH_MEMORY_TTL", "21600")),
+            timeout=float(os.getenv("STATIC_FETCH_TIMEOUT", "20")),
+        )
+
+    @staticmethod
+    def _domain(url: str) -> str:
+        try:
+            return urlparse(url).netloc.lower()
+        except Exception:
+            return ""
+
+    def preferred_engine(self, url: str) -> Optional[str]:
+        """Engine that last worked for the URL's domain, if still remembered"""
+        domain = self._domain(url)
+        entry = self._domains.get(domain)
+        if entry is None:
+            return None
+        remembered_at, engine = entry
+        if time.monotonic() - remembered_at > self.memory_ttl:
+            del self._domains[domain]
+            return None
+        self._domains.move_to_end(domain)
+        return engine
+
+    def remember(self, url: str, engine: str):
+        """Record which engine worked for the URL's domain"""
+        domain = self._domain(url)
+        self._domains[domain] = (time.monotonic(), engine)
+        self._domains.move_to_end(domain)
+        while len(self._domains) > self.memory_size:
+            self._domains.popitem(last=False)
+
+    async def fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        cookies: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """GET a page and return its status, final URL, content type and decoded HTML"""
+        session = http_pool.get_session()
+        async with session.get(
+            url,
+            headers=headers,
+            cookies=cookies,
+            allow_redirects=True,
+            timeout=aiohttp.ClientTimeout(total=timeout or self.timeout)
+        ) as response:
+            body = bytearray()
+            async for chunk in response.content.iter_chunked(65536):
+                body.extend(chunk)
+                if len(body) > self.max_page_bytes:
+                    raise ValueError(f"Page exceeds {self.max_page_bytes // (1024 * 1024)}MB")
+            encoding = response.charset or 'utf-8'
+            return {
+                'status': response.status,
+                'final_url': str(response.url),
+                'content_type': response.content_type,
+                'html': body.decode(encoding, errors='replace'),
+            }
+
+    def escalation_reason(
+        self,
+        html: str,
+        wait_for: Optional[str] = None,
+        css_selector: Optional[str] = None
+    ) -> Optional[str]:
+        """Why a statically fetched page needs the browser, or None if it does not"""
+        if not html.strip():
+            return "empty_body"
+        if wait_for and wait_for.startswith("js:"):
+            return "wait_for_js_condition"
+        text_length = visible_text_length(html)
+        # Text-rich pages render fine even if a widget on them wants JavaScript
+        sparse = text_length < self.min_text_chars * 5
+        if sparse and _FRAMEWORK_ROOT_PATTERN.search(html):
+            return "framework_root"
+        if sparse and any(_NOSCRIPT_WARNING_PATTERN.search(text) for text in _NOSCRIPT_PATTERN.findall(html)):
+            return "noscript_warning"
+        if text_length < self.min_text_chars:
+            return "empty_body"
+        selectors = [selector for selector in (wait_for, css_selector) if selector]
+        if selectors:
+            soup = BeautifulSoup(html, 'html.parser')
+            for selector in selectors:
+                selector = selector[4:] if selector.startswith("css:") else selector
+                try:
+                    if soup.select_one(selector) is None:
+                        return "selector_missing"
+                except Exception:
+                    # Selector syntax soupsieve does not understand; let the browser decide
+                    return "selector_missing"
+        return None
+
+    @staticmethod
+    def render(url: str, html: str, css_selector: Optional[str] = None, include_images: bool = False) -> Dict[str, Any]:
+        """Scrape cleaned HTML, metadata and media and generate markdown (CPU-bound)"""
+        scraped = ScrapingStrategy().scrap(url, html, css_selector=css_selector, exclude_all_images=not include_images)
+        scraped = _as_dict(scraped)
+        cleaned_html = scraped.get('cleaned_html') or ''
+        markdown_result = DefaultMarkdownGenerator().generate_markdown(cleaned_html, base_url=url)
+        media = _as_dict(scraped.get('media'))
+        images: List[Dict[str, str]] = [
+            {"type": "image", "src": str(image.get('src') or ''), "alt": str(image.get('alt') or '')}
+            for image in (_as_dict(item) for item in media.get('images') or [])
+            if image.get('src')
+        ]
+        return {
+            'title': (scraped.get('metadata') or {}).get('title'),
+            'cleaned_html': cleaned_html,
+            'markdown': getattr(markdown_result, 'raw_markdown', None) or str(markdown_result),
+            'media': images,
+        }
+
+    def _escalate(self, reason: str) -> Dict[str, Any]:
+        self._stats['escalations'] += 1
+        self._escalation_reasons[reason] = self._escalation_reasons.get(reason, 0) + 1
+        return {'success': False, 'escalate': reason}
+
+    def browser_succeeded(self, url: str, reason: Optional[str]):
+        """Record that the browser handled a page escalated for reason; page-level reasons pin the domain to it"""
+        if reason in PAGE_LEVEL_REASONS:
+            self.remember(url, ENGINE_BROWSER)
+
+    async def crawl(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        cookies: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        wait_for: Optional[str] = None,
+        css_selector: Optional[str] = None,
+        include_images: bool = False,
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """Fetch and render a page without a browser
+
+        Returns the rendered page with success=True, or success=False and the
+        escalation reason when the browser should handle it instead (report
+        the browser's success with browser_succeeded). With
+        force=True the heuristics and domain memory are skipped and the static
+        result is returned whatever it looks like.
+        """
+        if not force and self.preferred_engine(url) == ENGINE_BROWSER:
+            self._stats['remembered_browser'] += 1
+            return {'success': False, 'escalate': "domain_memory"}
+
+        try:
+            page = await self.fetch(url, headers=headers, cookies=cookies, timeout=timeout)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, LookupError) as e:
+            self._stats['fetch_errors'] += 1
+            if force:
+                return {'success': False, 'error': f"Static fetch failed: {str(e) or type(e).__name__}"}
+            # Not remembered: a network hiccup says nothing about the site
+            logger.debug(f"Static fetch of {url} failed, escalating: {e}")
+            return {'success': False, 'escalate': "fetch_error"}
+
+        if not force:
+            if page['status'] >= 400:
+                return self._escalate("bot_wall" if page['status'] in BOT_WALL_STATUSES else "http_status")
+            reason = await asyncio.to_thread(self.escalation_reason, page['html'], wait_for, css_selector)
+            if reason:
+                return self._escalate(reason)
+        elif page['status'] >= 400:
+            return {'success': False, 'error': f"HTTP {page['status']}"}
+
+        rendered = await asyncio.to_thread(self.render, page['final_url'], page['html'], css_selector, include_images)
+        self._stats['static_pages'] += 1
+        if not force:
+            self.remember(url, ENGINE_STATIC)
+        return {'success': True, 'url': url, 'final_url': page['final_url'], 'status': page['status'], **rendered}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return page and escalation counters and the remembered engine per domain"""
+        engines: Dict[str, int] = {}
+        for _, engine in self._domains.values():
+            engines[engine] = engines.get(engine, 0) + 1
+        return {
+            **self._stats,
+            'enabled': self.enabled,
+            'escalation_reasons': dict(self._escalation_reasons),
+            'remembered_domains': engines,
+            'memory_ttl': self.memory_ttl,
+        }
+
+
+# Global static fetcher instance
+static_fetcher = StaticFetcher.from_env()
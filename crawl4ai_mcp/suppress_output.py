@@ -4,28 +4,45 @@ Output suppression utilities for crawl4ai MCP server.
 
 import sys
 import os
+import threading
 from contextlib import contextmanager
 from io import StringIO
 
 
+# Nesting state for suppress_stdout_stderr. Concurrent tool calls enter and
+# leave the context in arbitrary order, so the original streams are saved by
+# the first entrant and restored only by the last one to leave.
+_suppress_lock = threading.Lock()
+_suppress_depth = 0
+_saved_streams = None
+
+
 @contextmanager
 def suppress_stdout_stderr():
     """Context manager to suppress stdout and stderr output."""
-    # Save the original stdout and stderr
-    original_stdout = sys.stdout
-    original_stderr = sys.stderr
-    
+    global _suppress_depth, _saved_streams
+
+    with _suppress_lock:
+        if _suppress_depth == 0:
+            # Save the original stdout and stderr and redirect both to devnull
+            devnull = open(os.devnull, 'w')
+            _saved_streams = (sys.stdout, sys.stderr, devnull)
+            sys.stdout = devnull
+            sys.stderr = devnull
+        _suppress_depth += 1
+
     try:
-        # Redirect stdout and stderr to devnull
-        sys.stdout = open(os.devnull, 'w')
-        sys.stderr = open(os.devnull, 'w')
         yield
     finally:
-        # Restore the original stdout and stderr
-        sys.stdout.close()
-        sys.stderr.close()
-        sys.stdout = original_stdout
-        sys.stderr = original_stderr
+        with _suppress_lock:
+            _suppress_depth -= 1
+            if _suppress_depth == 0 and _saved_streams is not None:
+                # Restore the original stdout and stderr
+                original_stdout, original_stderr, devnull = _saved_streams
+                sys.stdout = original_stdout
+                sys.stderr = original_stderr
+                devnull.close()
+                _saved_streams = None
 
 
 @contextmanager
@@ -34,11 +51,11 @@ def capture_output():
     # Save the original stdout and stderr
     original_stdout = sys.stdout
     original_stderr = sys.stderr
-    
+
     # Create StringIO objects to capture output
     captured_stdout = StringIO()
     captured_stderr = StringIO()
-    
+
     try:
         # Redirect stdout and stderr to our StringIO objects
         sys.stdout = captured_stdout
@@ -47,4 +64,4 @@ def capture_output():
     finally:
         # Restore the original stdout and stderr
         sys.stdout = original_stdout
-        sys.stderr = original_stderr
\ No newline at end of file
+        sys.stderr = original_stderr
@@ -0,0 +1,93 @@
+"""
+Text Chunking Module
+Token counting and token-bounded splitting of long texts for LLM prompts
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+# tiktoken ships with litellm; without it token counts are estimated
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+# Rough characters-per-token ratio used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=32)
+def _get_encoding(model: Optional[str]):
+    """Get the tiktoken encoding for a model name such as 'openai/gpt-4o'"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    name = (model or "").split("/")[-1]
+    try:
+        return tiktoken.encoding_for_model(name)
+    except Exception:
+        pass
+    try:
+        # Close enough for non-OpenAI models to size prompts safely
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Count the tokens in text for the given model"""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def group_by_tokens(
+    texts: Sequence[str],
+    max_tokens: int,
+    model: Optional[str] = None
+) -> List[Tuple[int, int]]:
+    """Group consecutive texts into ``[start, end)`` ranges of at most max_tokens each
+
+    A single text larger than max_tokens gets a range of its own; split it
+    with split_by_tokens first if that matters.
+    """
+    ranges = []
+    start = 0
+    used = 0
+    for index, text in enumerate(texts):
+        # +1 for the newline joining texts within a chunk
+        tokens = count_tokens(text, model) + 1
+        if index > start and used + tokens > max_tokens:
+            ranges.append((start, index))
+            start, used = index, 0
+        used += tokens
+    if start < len(texts):
+        ranges.append((start, len(texts)))
+    return ranges
+
+
+def split_by_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> List[str]:
+    """Split text into chunks of at most max_tokens, preferring paragraph, line and sentence boundaries"""
+    if count_tokens(text, model) <= max_tokens:
+        return [text] if text else []
+
+    pieces: List[str] = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        if count_tokens(paragraph, model) <= max_tokens:
+            pieces.append(paragraph)
+            continue
+        for sentence in re.split(r'(?<=[.!?。！？])\s+|\n', paragraph):
+            if count_tokens(sentence, model) <= max_tokens:
+                pieces.append(sentence)
+                continue
+            # Last resort: cut on words
+            words = sentence.split()
+            for start, end in group_by_tokens(words, max_tokens, model):
+                pieces.append(" ".join(words[start:end]))
+
+    return ["\n".join(pieces[start:end]) for start, end in group_by_tokens(pieces, max_tokens, model)]
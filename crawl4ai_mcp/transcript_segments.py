@@ -0,0 +1,207 @@
+"""
+Transcript Segments Module
+Columnar representation of transcript segments with text views rendered
+on demand
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# Word tokens for the term index; scripts without spaces (e.g. Japanese)
+# form long runs that are matched by substring instead
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds to MM:SS or HH:MM:SS format"""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+
+    if hours > 0:
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    else:
+        return f"{minutes:02d}:{secs:02d}"
+
+
+def parse_timestamp(value: Union[str, int, float]) -> float:
+    """Parse seconds given as a number or as SS, MM:SS or HH:MM:SS"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    seconds = 0.0
+    for part in str(value).strip().split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word terms"""
+    return _TERM_PATTERN.findall(text.lower())
+
+
+class TranscriptSegments:
+    """Transcript segments held as parallel arrays
+
+    Start times and durations live in ``array('d')`` columns; segment texts
+    are joined with newlines into one buffer and addressed by offsets. The
+    buffer doubles as the clean text view, and the timestamped view and
+    per-segment dicts are only built when a caller asks for them.
+    """
+
+    __slots__ = ('starts', 'durations', 'offsets', 'buffer', '_word_count', '_term_index')
+
+    def __init__(self, starts: array, durations: array, texts: List[str]):
+        self.starts = starts
+        self.durations = durations
+        self.offsets = array('q', [0])
+        for text in texts:
+            # +1 for the newline separating segments in the buffer
+            self.offsets.append(self.offsets[-1] + len(text) + 1)
+        self.buffer = "\n".join(texts)
+        self._word_count: Optional[int] = None
+        self._term_index: Optional[Dict[str, array]] = None
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Any]) -> "TranscriptSegments":
+        """Build from fetched transcript entries (dicts or snippet objects)"""
+        starts = array('d')
+        durations = array('d')
+        texts = []
+        for entry in entries or []:
+            try:
+                if isinstance(entry, dict):
+                    text, start, duration = entry.get('text', ''), entry.get('start', 0), entry.get('duration', 0)
+                else:
+                    text, start, duration = entry.text, entry.start, entry.duration
+                start, duration = float(start or 0), float(duration or 0)
+            except (AttributeError, TypeError, ValueError):
+                # Skip malformed entries but continue processing
+                continue
+            starts.append(start)
+            durations.append(duration)
+            texts.append(text or '')
+        if any(starts[i] > starts[i + 1] for i in range(len(starts) - 1)):
+            # Range queries bisect on start times, so keep them sorted
+            order = sorted(range(len(starts)), key=starts.__getitem__)
+            starts = array('d', (starts[i] for i in order))
+            durations = array('d', (durations[i] for i in order))
+            texts = [texts[i] for i in order]
+        return cls(starts, durations, texts)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List[Any]]) -> "TranscriptSegments":
+        """Build from the ``start``/``duration``/``text`` columns produced by to_columns"""
+        return cls(array('d', columns['start']), array('d', columns['duration']), columns['text'])
+
+    def to_columns(self) -> Dict[str, List[Any]]:
+        """Return compact JSON-serializable columns"""
+        return {
+            'start': [round(value, 3) for value in self.starts],
+            'duration': [round(value, 3) for value in self.durations],
+            'text': self.texts(),
+        }
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def text_at(self, index: int) -> str:
+        """Get the text of one segment"""
+        return self.buffer[self.offsets[index]:self.offsets[index + 1] - 1]
+
+    def texts(self) -> List[str]:
+        """Get all segment texts"""
+        return [self.text_at(i) for i in range(len(self))]
+
+    @property
+    def clean_text(self) -> str:
+        """Segment texts separated by newlines, without timestamps"""
+        return self.buffer
+
+    @property
+    def duration_seconds(self) -> float:
+        """End time of the last segment to finish"""
+        return max((start + duration for start, duration in zip(self.starts, self.durations)), default=0)
+
+    @property
+    def word_count(self) -> int:
+        if self._word_count is None:
+            self._word_count = len(self.buffer.split())
+        return self._word_count
+
+    def render(self, include_timestamps: bool = True, preserve_formatting: bool = True) -> str:
+        """Render the full text view, with one timestamped line per segment if requested"""
+        if include_timestamps and preserve_formatting:
+            return "\n".join(
+                f"[{format_timestamp(self.starts[i])}] {self.text_at(i)}" for i in range(len(self))
+            ).strip()
+        return " ".join(self.texts()).strip()
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Build per-segment dicts with text, start, duration and end"""
+        return [
+            {
+                'text': self.text_at(i),
+                'start': self.starts[i],
+                'duration': self.durations[i],
+                'end': self.starts[i] + self.durations[i]
+            }
+            for i in range(len(self))
+        ]
+
+    def range_indices(self, start_time: Optional[float] = None, end_time: Optional[float] = None) -> range:
+        """Indices of the segments overlapping [start_time, end_time), found by bisection"""
+        lo = 0
+        if start_time is not None:
+            lo = bisect_left(self.starts, start_time)
+            # Include earlier segments still running at start_time (captions overlap slightly)
+            while lo > 0 and self.starts[lo - 1] + self.durations[lo - 1] > start_time:
+                lo -= 1
+        hi = len(self) if end_time is None else bisect_left(self.starts, end_time)
+        return range(lo, max(lo, hi))
+
+    def term_index(self) -> Dict[str, array]:
+        """Inverted index from lowercase term to the sorted indices of segments containing it"""
+        if self._term_index is None:
+            index: Dict[str, array] = {}
+            for i in range(len(self)):
+                for term in set(tokenize(self.text_at(i))):
+                    postings = index.get(term)
+                    if postings is None:
+                        postings = index[term] = array('l')
+                    postings.append(i)
+            self._term_index = index
+        return self._term_index
+
+    def _term_postings(self, term: str) -> List[int]:
+        postings = self.term_index().get(term)
+        if postings is not None:
+            return list(postings)
+        if term.isascii():
+            return []
+        # No word boundaries to index on; fall back to a substring scan
+        return [i for i in range(len(self)) if term in self.text_at(i).lower()]
+
+    def search(self, query: str, match_all: bool = True) -> List[int]:
+        """Indices of segments matching the query terms (all of them, or any)
+
+        A multi-word query in quotes must appear as a phrase.
+        """
+        query = query.strip()
+        phrase = None
+        if len(query) > 1 and query[0] == query[-1] == '"':
+            query = query[1:-1]
+            phrase = query.lower()
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        postings = [set(self._term_postings(term)) for term in terms]
+        if match_all or phrase:
+            matches = set.intersection(*postings)
+        else:
+            matches = set.union(*postings)
+        if phrase:
+            matches = {i for i in matches if phrase in self.text_at(i).lower()}
+        return sorted(matches)
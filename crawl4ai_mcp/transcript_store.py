@@ -0,0 +1,135 @@
+"""
+Transcript Store Module
+Persistent on-disk store for YouTube transcripts so repeat requests for a
+video are answered without contacting YouTube
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from .disk_cache import DiskCache, make_cache_key
+from .transcript_segments import TranscriptSegments
+
+
+logger = logging.getLogger(__name__)
+
+# Transcripts rarely change; availability listings are refreshed more often
+TRANSCRIPT_STORE_TTLS = {
+    "segments": 7 * 24 * 3600,
+    "language": 7 * 24 * 3600,
+    "video_info": 24 * 3600,
+}
+
+
+class TranscriptStore:
+    """Transcripts keyed by video_id, source language and translation target
+
+    Segments are stored as the parallel ``start``/``duration``/``text``
+    columns of TranscriptSegments, which compress far better than a list of
+    per-segment dicts; formatted text is rebuilt from them on demand. A small alias entry maps a
+    language preference list to the language it resolved to, so a request
+    for ``['ja', 'en']`` finds the transcript stored under ``en``.
+    """
+
+    def __init__(self, cache: DiskCache):
+        self.cache = cache
+
+    @classmethod
+    def from_env(cls) -> "TranscriptStore":
+        """Create a store configured from TRANSCRIPT_STORE_* environment variables"""
+        return cls(DiskCache.from_env(
+            "TRANSCRIPT_STORE",
+            "transcripts.sqlite3",
+            default_ttls=TRANSCRIPT_STORE_TTLS,
+            default_max_size_mb=256,
+        ))
+
+    @staticmethod
+    def _segments_key(video_id: str, source_language: str, translate_to: Optional[str]) -> str:
+        return make_cache_key(video_id, source_language, translate_to or "")
+
+    @staticmethod
+    def _language_key(video_id: str, languages: List[str], translate_to: Optional[str]) -> str:
+        return make_cache_key(video_id, list(languages), translate_to or "")
+
+    async def get_transcript(
+        self,
+        video_id: str,
+        languages: List[str],
+        translate_to: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Return a stored transcript for a language preference list, or None"""
+        source_language = await self.cache.aget("language", self._language_key(video_id, languages, translate_to))
+        if not source_language:
+            return None
+        entry = await self.cache.aget("segments", self._segments_key(video_id, source_language, translate_to))
+        if not entry:
+            return None
+        return {
+            'source_language': entry['source_language'],
+            'final_language': entry['final_language'],
+            'is_translated': entry['is_translated'],
+            'segments': TranscriptSegments.from_columns(entry['columns']),
+        }
+
+    async def has_transcript(
+        self,
+        video_id: str,
+        languages: List[str],
+        translate_to: Optional[str] = None
+    ) -> bool:
+        """Whether a transcript for a language preference list is stored"""
+        source_language = await self.cache.aget("language", self._language_key(video_id, languages, translate_to))
+        if not source_language:
+            return False
+        return await self.cache.aget("segments", self._segments_key(video_id, source_language, translate_to)) is not None
+
+    async def put_transcript(
+        self,
+        video_id: str,
+        languages: List[str],
+        translate_to: Optional[str],
+        source_language: str,
+        final_language: str,
+        segments: TranscriptSegments
+    ) -> bool:
+        """Store fetched segments and remember which language the preferences resolved to"""
+        stored = await self.cache.aset(
+            "segments",
+            self._segments_key(video_id, source_language, translate_to),
+            {
+                'source_language': source_language,
+                'final_language': final_language,
+                'is_translated': bool(translate_to),
+                'columns': segments.to_columns(),
+            }
+        )
+        if stored:
+            # A request naming only the resolved language finds it directly as well
+            for preferences in {tuple(languages), (source_language,)}:
+                await self.cache.aset("language", self._language_key(video_id, preferences, translate_to), source_language)
+        return stored
+
+    async def get_video_info(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Return stored transcript availability for a video, or None"""
+        return await self.cache.aget("video_info", video_id)
+
+    async def put_video_info(self, video_id: str, info: Dict[str, Any]) -> bool:
+        """Store transcript availability for a video"""
+        return await self.cache.aset("video_info", video_id, info)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and storage usage"""
+        return self.cache.get_stats()
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        """Remove stored transcripts; returns the count removed"""
+        return self.cache.clear(namespace)
+
+    def close(self):
+        """Close the database connection (reopened on next use)"""
+        self.cache.close()
+
+
+# Global transcript store instance
+transcript_store = TranscriptStore.from_env()
@@ -0,0 +1,223 @@
+"""
+YouTube Playlist Module
+Resolves playlist and channel URLs to video IDs page by page, using the
+ytInitialData embedded in YouTube pages and its continuation API
+"""
+
+import json
+import logging
+import re
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+import aiohttp
+
+from .concurrency import AdaptiveRateLimiter
+from .http_client import http_pool
+
+
+logger = logging.getLogger(__name__)
+
+YOUTUBE_BASE_URL = "https://www.youtube.com"
+
+# Consent cookie so EU-hosted servers get the page instead of the consent wall
+CONSENT_COOKIES = {"CONSENT": "YES+1", "SOCS": "CAI"}
+
+# Renderers that describe a video entry in playlist, channel and shorts listings
+VIDEO_RENDERER_KEYS = ("playlistVideoRenderer", "videoRenderer", "gridVideoRenderer", "reelItemRenderer")
+
+_INITIAL_DATA_PATTERNS = [
+    re.compile(r'var ytInitialData\s*=\s*(\{.*?\});\s*</script>', re.DOTALL),
+    re.compile(r'window\["ytInitialData"\]\s*=\s*(\{.*?\});', re.DOTALL),
+]
+_API_KEY_PATTERN = re.compile(r'"INNERTUBE_API_KEY"\s*:\s*"([^"]+)"')
+_CLIENT_VERSION_PATTERN = re.compile(r'"INNERTUBE_CLIENT_VERSION"\s*:\s*"([^"]+)"')
+_CHANNEL_ID_PATTERNS = [
+    re.compile(r'<meta itemprop="identifier" content="(UC[\w-]{22})"'),
+    re.compile(r'"externalId"\s*:\s*"(UC[\w-]{22})"'),
+    re.compile(r'"channelId"\s*:\s*"(UC[\w-]{22})"'),
+]
+
+
+def parse_collection_url(url: str) -> Optional[Tuple[str, str]]:
+    """Classify a playlist or channel URL
+
+    Returns ``("playlist", playlist_id)``, ``("channel", channel_id)``,
+    ``("channel_path", "/@handle")`` or None when the URL is neither.
+    """
+    try:
+        parsed = urlparse(url if "://" in url else f"https://{url}")
+    except Exception:
+        return None
+    host = parsed.netloc.lower()
+    if not (host == "youtube.com" or host.endswith(".youtube.com")):
+        return None
+
+    playlist_id = parse_qs(parsed.query).get("list", [None])[0]
+    if playlist_id and parsed.path in ("/playlist", "/watch"):
+        return "playlist", playlist_id
+
+    parts = [part for part in parsed.path.split("/") if part]
+    if not parts:
+        return None
+    if parts[0] == "channel" and len(parts) > 1 and parts[1].startswith("UC"):
+        return "channel", parts[1]
+    if parts[0].startswith("@"):
+        return "channel_path", f"/{parts[0]}"
+    if parts[0] in ("c", "user") and len(parts) > 1:
+        return "channel_path", f"/{parts[0]}/{parts[1]}"
+    return None
+
+
+def _walk(node: Any) -> Iterator[Tuple[str, Any]]:
+    """Yield every (key, value) pair in a JSON tree in document order"""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            items = list(current.items())
+            for key, value in items:
+                yield key, value
+            stack.extend(value for _, value in reversed(items) if isinstance(value, (dict, list)))
+        elif isinstance(current, list):
+            stack.extend(value for value in reversed(current) if isinstance(value, (dict, list)))
+
+
+def extract_page_items(data: Dict[str, Any]) -> Tuple[List[str], Optional[str]]:
+    """Get the video IDs and the continuation token from one page of ytInitialData or a browse response"""
+    video_ids: List[str] = []
+    continuation = None
+    for key, value in _walk(data):
+        if not isinstance(value, dict):
+            continue
+        if key in VIDEO_RENDERER_KEYS:
+            video_id = value.get("videoId")
+            if video_id:
+                video_ids.append(video_id)
+        elif key == "lockupViewModel" and value.get("contentType") == "LOCKUP_CONTENT_TYPE_VIDEO":
+            video_id = value.get("contentId")
+            if video_id:
+                video_ids.append(video_id)
+        elif key == "continuationItemRenderer" and continuation is None:
+            for inner_key, inner_value in _walk(value):
+                if inner_key == "continuationCommand" and isinstance(inner_value, dict) and inner_value.get("token"):
+                    continuation = inner_value["token"]
+                    break
+    return video_ids, continuation
+
+
+class YouTubePlaylistResolver:
+    """Enumerate the videos of a playlist or channel without the YouTube Data API
+
+    The first page comes from the HTML page's ytInitialData; further pages
+    are requested from the web client's browse endpoint with the page's
+    continuation token. Channels are resolved to their uploads playlist,
+    falling back to the channel's Videos tab.
+    """
+
+    def __init__(self, rate_limiter: Optional[AdaptiveRateLimiter] = None, timeout: float = 20.0):
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+
+    async def _request(self, method: str, url: str, **kwargs) -> str:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        session = http_pool.get_session()
+        async with session.request(
+            method,
+            url,
+            cookies=CONSENT_COOKIES,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            **kwargs
+        ) as response:
+            if response.status == 429 and self.rate_limiter is not None:
+                self.rate_limiter.on_throttle()
+            response.raise_for_status()
+            text = await response.text()
+        if self.rate_limiter is not None:
+            self.rate_limiter.on_success()
+        return text
+
+    @staticmethod
+    def _parse_initial_data(html: str) -> Dict[str, Any]:
+        for pattern in _INITIAL_DATA_PATTERNS:
+            match = pattern.search(html)
+            if match:
+                return json.loads(match.group(1))
+        raise ValueError("Could not find ytInitialData in the YouTube page")
+
+    async def _resolve_channel_id(self, channel_path: str) -> str:
+        html = await self._request("GET", f"{YOUTUBE_BASE_URL}{channel_path}")
+        for pattern in _CHANNEL_ID_PATTERNS:
+            match = pattern.search(html)
+            if match:
+                return match.group(1)
+        raise ValueError(f"Could not resolve a channel ID for {channel_path}")
+
+    async def _iter_listing_pages(self, page_url: str) -> AsyncIterator[List[str]]:
+        """Yield the video IDs of a listing page and its continuations, one page at a time
+
+        Stops when a continuation token repeats or a page has no videos, so a
+        token YouTube echoes back cannot loop forever.
+        """
+        html = await self._request("GET", page_url)
+        data = self._parse_initial_data(html)
+        video_ids, continuation = extract_page_items(data)
+        yield video_ids
+
+        api_key = _API_KEY_PATTERN.search(html)
+        client_version = _CLIENT_VERSION_PATTERN.search(html)
+        if not api_key or not client_version:
+            return
+
+        seen_continuations = set()
+        while continuation and video_ids and continuation not in seen_continuations:
+            seen_continuations.add(continuation)
+            body = await self._request(
+                "POST",
+                f"{YOUTUBE_BASE_URL}/youtubei/v1/browse?key={api_key.group(1)}&prettyPrint=false",
+                json={
+                    "context": {"client": {"clientName": "WEB", "clientVersion": client_version.group(1), "hl": "en"}},
+                    "continuation": continuation,
+                }
+            )
+            video_ids, continuation = extract_page_items(json.loads(body))
+            yield video_ids
+
+    async def iter_video_ids(self, url: str, max_videos: Optional[int] = None) -> AsyncIterator[str]:
+        """Yield the unique video IDs of a playlist or channel URL as pages are fetched"""
+        collection = parse_collection_url(url)
+        if collection is None:
+            raise ValueError("URL is not a YouTube playlist or channel URL")
+        kind, value = collection
+
+        listings: List[str] = []
+        if kind == "playlist":
+            listings.append(f"{YOUTUBE_BASE_URL}/playlist?list={value}")
+        else:
+            channel_id = value if kind == "channel" else await self._resolve_channel_id(value)
+            # The uploads playlist of channel UCxxx is UUxxx
+            listings.append(f"{YOUTUBE_BASE_URL}/playlist?list=UU{channel_id[2:]}")
+            listings.append(f"{YOUTUBE_BASE_URL}/channel/{channel_id}/videos")
+
+        seen = set()
+        for listing_url in listings:
+            try:
+                async for page in self._iter_listing_pages(listing_url):
+                    found_before = len(seen)
+                    for video_id in page:
+                        if video_id in seen:
+                            continue
+                        seen.add(video_id)
+                        yield video_id
+                        if max_videos and len(seen) >= max_videos:
+                            return
+                    if len(seen) == found_before and found_before:
+                        # A page of only repeats means the listing is cycling
+                        break
+            except (aiohttp.ClientResponseError, ValueError) as e:
+                if seen or listing_url == listings[-1]:
+                    raise
+                logger.debug(f"Listing {listing_url} unavailable, trying next: {e}")
+            if seen:
+                return
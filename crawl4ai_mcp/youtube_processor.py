@@ -5,20 +5,66 @@ Simple and reliable transcript extraction without complex authentication
 """
 
 import asyncio
+import json
 import re
 import logging
 import os
-from typing import Dict, List, Optional, Any, Union
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Union
 from urllib.parse import urlparse, parse_qs
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
-from youtube_transcript_api.formatters import TextFormatter
+
+from .concurrency import AdaptiveRateLimiter
+from .llm_cache import llm_cache
+from .llm_clients import llm_clients
+from .text_chunking import count_tokens, group_by_tokens, split_by_tokens
+from .transcript_segments import TranscriptSegments, format_timestamp, parse_timestamp
+from .transcript_store import transcript_store
+
+
+# Transcript languages tried in order when the caller does not specify any
+DEFAULT_LANGUAGES = ['ja', 'en', 'en-US', 'en-GB']
 
 
 class YouTubeProcessor:
     """Process YouTube videos and extract transcripts"""
     
-    def __init__(self):
-        self.formatter = TextFormatter()
+    def __init__(
+        self,
+        transcript_list_ttl: float = 300.0,
+        transcript_list_cache_size: int = 256,
+        max_workers: int = 8,
+        call_timeout: float = 30.0,
+        summary_chunk_tokens: int = 6000,
+        summary_max_concurrent: int = 4,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None
+    ):
+        # youtube-transcript-api is synchronous; its HTTP calls run on a dedicated
+        # thread pool so they never block the event loop or other tools' threads
+        self.max_workers = max(1, max_workers)
+        self.call_timeout = call_timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Every YouTube request from every tool passes through one adaptive rate limiter
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.transcript_store = transcript_store
+        # Map-reduce summarization: tokens per chunk and concurrent LLM calls
+        self.summary_chunk_tokens = summary_chunk_tokens
+        self.summary_max_concurrent = max(1, summary_max_concurrent)
+        # youtube-transcript-api >= 1.0 uses an instance API; older versions use class methods
+        self._api = YouTubeTranscriptApi() if hasattr(YouTubeTranscriptApi, 'list') else None
+        # Short-lived per-video cache of transcript listings, shared by transcript
+        # extraction and video info so each video is listed once
+        self.transcript_list_ttl = transcript_list_ttl
+        self.transcript_list_cache_size = transcript_list_cache_size
+        self._transcript_lists: "OrderedDict[str, tuple]" = OrderedDict()
+        self._transcript_lists_lock = threading.Lock()
+        # Recently queried transcripts keep their term index in memory
+        self._query_segments: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self.query_cache_size = 32
         self.youtube_patterns = [
             r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]{11})',
             r'(?:https?://)?(?:www\.)?youtu\.be/([a-zA-Z0-9_-]{11})',
@@ -47,42 +93,142 @@ class YouTubeProcessor:
         except Exception:
             return None
     
-    def get_video_info(self, video_id: str) -> Dict[str, Any]:
-        """Get basic video information and available transcripts"""
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="youtube-api"
+            )
+        return self._executor
+    
+    @staticmethod
+    def _is_throttle_error(error: BaseException) -> bool:
+        """Whether an error means YouTube is throttling or blocking us
+        
+        Empty or truncated XML ("no element found") is how throttled
+        transcript fetches usually surface, so parse errors count too.
+        """
+        if type(error).__name__ in ('TooManyRequests', 'RequestBlocked', 'IpBlocked', 'ParseError'):
+            return True
+        message = str(error).lower()
+        return any(marker in message for marker in (
+            '429', 'too many requests', 'no element found', 'parseerror', 'rate limit'
+        ))
+    
+    @classmethod
+    def _is_retryable_error(cls, error: BaseException) -> bool:
+        """Whether a failed call is worth retrying: throttling or a timed-out request"""
+        return isinstance(error, TimeoutError) or cls._is_throttle_error(error)
+    
+    async def _run_blocking(self, fn, *args):
+        """Run a blocking youtube-transcript-api call in the pool with the call timeout
+        
+        Calls first take a token from the rate limiter, and report throttling
+        back to it. On timeout or cancellation the caller stops waiting
+        immediately; a call that already started finishes in its thread and
+        its result is dropped.
+        """
+        await self.rate_limiter.acquire()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), fn, *args)
         try:
-            # Get transcript list to determine available languages
+            result = await asyncio.wait_for(future, timeout=self.call_timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"YouTube request timed out after {self.call_timeout:.0f}s")
+        except Exception as e:
+            if self._is_throttle_error(e):
+                self.rate_limiter.on_throttle()
+            raise
+        self.rate_limiter.on_success()
+        return result
+    
+    def shutdown(self):
+        """Stop the worker threads; a new pool is created on next use"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _cached_transcript_list(self, video_id: str):
+        """Return a recent transcript listing for a video, or None"""
+        with self._transcript_lists_lock:
+            cached = self._transcript_lists.get(video_id)
+            if cached and cached[0] > time.monotonic():
+                self._transcript_lists.move_to_end(video_id)
+                return cached[1]
+        return None
+    
+    def _fetch_transcript_list(self, video_id: str):
+        """Fetch the transcript listing for a video from YouTube and remember it"""
+        now = time.monotonic()
+        if self._api is not None:
+            transcript_list = self._api.list(video_id)
+        else:
             transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        
+        with self._transcript_lists_lock:
+            self._transcript_lists[video_id] = (now + self.transcript_list_ttl, transcript_list)
+            self._transcript_lists.move_to_end(video_id)
+            while len(self._transcript_lists) > self.transcript_list_cache_size:
+                self._transcript_lists.popitem(last=False)
+        return transcript_list
+    
+    async def _get_transcript_list(self, video_id: str):
+        """Get the transcript listing for a video, reusing a recent one when possible
+        
+        Only a fetch from YouTube goes through _run_blocking, so cached
+        listings neither take a rate limiter token nor count as successes.
+        """
+        cached = self._cached_transcript_list(video_id)
+        if cached is not None:
+            return cached
+        return await self._run_blocking(self._fetch_transcript_list, video_id)
+    
+    def _build_video_info(self, video_id: str, transcript_list) -> Dict[str, Any]:
+        """Summarize the available transcripts of a video"""
+        available_languages = []
+        manual_transcripts = []
+        auto_transcripts = []
+        
+        for transcript in transcript_list:
+            lang_info = {
+                'language': transcript.language,
+                'language_code': transcript.language_code,
+                'is_generated': transcript.is_generated,
+                'is_translatable': transcript.is_translatable
+            }
             
-            available_languages = []
-            manual_transcripts = []
-            auto_transcripts = []
+            available_languages.append(lang_info)
             
-            for transcript in transcript_list:
-                lang_info = {
-                    'language': transcript.language,
-                    'language_code': transcript.language_code,
-                    'is_generated': transcript.is_generated,
-                    'is_translatable': transcript.is_translatable
-                }
-                
-                available_languages.append(lang_info)
-                
-                if transcript.is_generated:
-                    auto_transcripts.append(lang_info)
-                else:
-                    manual_transcripts.append(lang_info)
+            if transcript.is_generated:
+                auto_transcripts.append(lang_info)
+            else:
+                manual_transcripts.append(lang_info)
+        
+        return {
+            'video_id': video_id,
+            'has_transcripts': len(available_languages) > 0,
+            'total_transcripts': len(available_languages),
+            'manual_transcripts': len(manual_transcripts),
+            'auto_transcripts': len(auto_transcripts),
+            'available_languages': available_languages,
+            'manual_languages': manual_transcripts,
+            'auto_languages': auto_transcripts,
+            'api_version': 'youtube-transcript-api-1.1.0+'
+        }
+    
+    async def get_video_info(self, video_id: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Get basic video information and available transcripts"""
+        try:
+            if use_cache:
+                stored_info = await self.transcript_store.get_video_info(video_id)
+                if stored_info:
+                    return stored_info
             
-            return {
-                'video_id': video_id,
-                'has_transcripts': len(available_languages) > 0,
-                'total_transcripts': len(available_languages),
-                'manual_transcripts': len(manual_transcripts),
-                'auto_transcripts': len(auto_transcripts),
-                'available_languages': available_languages,
-                'manual_languages': manual_transcripts,
-                'auto_languages': auto_transcripts,
-                'api_version': 'youtube-transcript-api-1.1.0+'
-            }
+            # Get transcript list to determine available languages
+            transcript_list = await self._get_transcript_list(video_id)
+            video_info = self._build_video_info(video_id, transcript_list)
+            await self.transcript_store.put_video_info(video_id, video_info)
+            return video_info
             
         except Exception as e:
             error_message = str(e)
@@ -110,127 +256,201 @@ class YouTubeProcessor:
                 'api_version': 'youtube-transcript-api-1.1.0+'
             }
     
+    async def load_transcript(
+        self,
+        video_id: str,
+        languages: List[str],
+        translate_to: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """Get transcript segments from the store or YouTube
+        
+        Raises the youtube-transcript-api exceptions when no transcript is available.
+        """
+        if use_cache:
+            stored = await self.transcript_store.get_transcript(video_id, languages, translate_to)
+            if stored:
+                return {**stored, 'from_store': True}
+        
+        # One listing serves language selection, the fetch and the metadata
+        transcript_list = await self._get_transcript_list(video_id)
+        transcript = transcript_list.find_transcript(languages)
+        source_language = transcript.language_code
+        
+        if translate_to:
+            # Translate the best available transcript
+            transcript = transcript.translate(translate_to)
+            final_language = translate_to
+            is_translated = True
+        else:
+            final_language = transcript.language_code
+            is_translated = False
+        
+        segments = TranscriptSegments.from_entries(await self._run_blocking(transcript.fetch))
+        
+        if len(segments):
+            await self.transcript_store.put_transcript(
+                video_id, languages, translate_to, source_language, final_language, segments
+            )
+            await self.transcript_store.put_video_info(
+                video_id, self._build_video_info(video_id, transcript_list)
+            )
+        
+        return {
+            'source_language': source_language,
+            'final_language': final_language,
+            'is_translated': is_translated,
+            'segments': segments,
+            'from_store': False
+        }
+    
+    async def query_transcript(
+        self,
+        video_id: str,
+        languages: Optional[List[str]] = None,
+        translate_to: Optional[str] = None,
+        start_time: Optional[Union[str, float]] = None,
+        end_time: Optional[Union[str, float]] = None,
+        query: Optional[str] = None,
+        match_all: bool = True,
+        context_segments: int = 0,
+        max_results: int = 100
+    ) -> Dict[str, Any]:
+        """Return only the transcript segments in a time range and/or matching a query
+        
+        The time range is found by bisection over segment start times and
+        terms are looked up in an inverted index, both kept with the
+        transcript in a small in-memory cache for follow-up queries.
+        """
+        try:
+            start_seconds = parse_timestamp(start_time) if start_time not in (None, "") else None
+            end_seconds = parse_timestamp(end_time) if end_time not in (None, "") else None
+        except ValueError as e:
+            return {
+                'success': False,
+                'error': f'Invalid time range: {str(e)}',
+                'video_id': video_id
+            }
+        
+        try:
+            languages = languages or DEFAULT_LANGUAGES
+            key = (video_id, tuple(languages), translate_to or "")
+            loaded = self._query_segments.get(key)
+            if loaded is None:
+                loaded = await self.load_transcript(video_id, languages, translate_to)
+                self._query_segments[key] = loaded
+                while len(self._query_segments) > self.query_cache_size:
+                    self._query_segments.popitem(last=False)
+            else:
+                self._query_segments.move_to_end(key)
+            segments: TranscriptSegments = loaded['segments']
+            
+            window = segments.range_indices(start_seconds, end_seconds)
+            
+            if query:
+                hits = [i for i in segments.search(query, match_all=match_all) if i in window]
+            else:
+                hits = list(window)
+            
+            truncated = len(hits) > max_results
+            hits = hits[:max_results]
+            
+            # Add neighbouring segments for context, keeping transcript order
+            selected = set(hits)
+            if query and context_segments > 0:
+                for i in hits:
+                    selected.update(range(max(window.start, i - context_segments), min(window.stop, i + context_segments + 1)))
+            hit_set = set(hits)
+            
+            matches = []
+            for i in sorted(selected):
+                start = segments.starts[i]
+                entry = {
+                    'index': i,
+                    'timestamp': format_timestamp(start),
+                    'start': start,
+                    'end': start + segments.durations[i],
+                    'text': segments.text_at(i)
+                }
+                if query:
+                    entry['match'] = i in hit_set
+                matches.append(entry)
+            
+            return {
+                'success': True,
+                'video_id': video_id,
+                'source_language': loaded['source_language'],
+                'final_language': loaded['final_language'],
+                'total_segments': len(segments),
+                'duration_seconds': segments.duration_seconds,
+                'window_segments': len(window),
+                'match_count': len(hits),
+                'truncated': truncated,
+                'segments': matches
+            }
+        
+        except (TranscriptsDisabled, NoTranscriptFound) as e:
+            return {
+                'success': False,
+                'error': 'Transcripts are disabled for this video' if isinstance(e, TranscriptsDisabled)
+                else f'No transcript found in languages: {languages}',
+                'video_id': video_id
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Transcript query failed: {str(e)}',
+                'video_id': video_id,
+                'retry_recommended': self._is_retryable_error(e)
+            }
+    
     async def extract_transcript(
         self,
         video_id: str,
         languages: Optional[List[str]] = None,
         translate_to: Optional[str] = None,
         include_timestamps: bool = True,
-        preserve_formatting: bool = True
+        preserve_formatting: bool = True,
+        use_cache: bool = True,
+        include_segments: bool = False,
+        include_clean_text: bool = True
     ) -> Dict[str, Any]:
-        """Extract transcript from YouTube video"""
+        """Extract transcript from YouTube video
+        
+        Text views are rendered from the columnar segments only when needed:
+        per-segment dicts are returned only with include_segments, and the
+        clean text only with include_clean_text.
+        """
         try:
             # Default language preferences
             if languages is None:
-                languages = ['ja', 'en', 'en-US', 'en-GB']
+                languages = DEFAULT_LANGUAGES
             
-            # Get transcript
-            if translate_to:
-                # Get any available transcript and translate
-                transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-                transcript = transcript_list.find_transcript(languages)
-                translated_transcript = transcript.translate(translate_to)
-                transcript_data = translated_transcript.fetch()
-                source_language = transcript.language_code
-                final_language = translate_to
-                is_translated = True
-            else:
-                # Get transcript in preferred language
-                transcript_data = YouTubeTranscriptApi.get_transcript(
-                    video_id, 
-                    languages=languages
-                )
-                # Determine which language was actually used
-                try:
-                    transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-                    # Find the actual language used
-                    source_language = 'unknown'
-                    final_language = 'unknown'
-                    is_translated = False
-                    
-                    for lang in languages:
-                        try:
-                            found_transcript = transcript_list.find_transcript([lang])
-                            source_language = found_transcript.language_code
-                            final_language = lang
-                            is_translated = False
-                            break
-                        except:
-                            continue
-                    
-                    # If we couldn't match, try to get any available transcript info
-                    if source_language == 'unknown':
-                        try:
-                            for transcript in transcript_list:
-                                source_language = transcript.language_code
-                                final_language = transcript.language_code
-                                break
-                        except:
-                            pass
-                except Exception:
-                    source_language = 'unknown'
-                    final_language = 'unknown'
-                    is_translated = False
-            
-            if not transcript_data:
+            loaded = await self.load_transcript(video_id, languages, translate_to, use_cache)
+            segments = loaded['segments']
+            
+            if not len(segments):
                 return {
                     'success': False,
                     'error': 'No transcript data found',
                     'video_id': video_id
                 }
             
-            # Process transcript data
-            full_text = ""
-            segments = []
-            
-            for entry in transcript_data:
-                try:
-                    text = entry.get('text', '')
-                    start_time = entry.get('start', 0)
-                    duration = entry.get('duration', 0)
-                    
-                    if include_timestamps:
-                        timestamp = self._format_timestamp(start_time)
-                        if preserve_formatting:
-                            full_text += f"[{timestamp}] {text}\n"
-                        else:
-                            full_text += f"{text} "
-                    else:
-                        full_text += f"{text} "
-                    
-                    segments.append({
-                        'text': text,
-                        'start': start_time,
-                        'duration': duration,
-                        'end': start_time + duration
-                    })
-                except Exception as e:
-                    # Skip malformed entries but continue processing
-                    continue
-            
-            # Get clean text without timestamps
-            try:
-                clean_text = self.formatter.format_transcript(transcript_data)
-            except Exception as e:
-                # Fallback: create clean text manually
-                clean_text = " ".join([entry.get('text', '') for entry in transcript_data if entry.get('text')])
-            
-            # Calculate statistics
-            total_duration = max([seg['end'] for seg in segments]) if segments else 0
-            word_count = len(clean_text.split())
+            total_duration = segments.duration_seconds
             
             return {
                 'success': True,
                 'video_id': video_id,
-                'source_language': source_language,
-                'final_language': final_language,
-                'is_translated': is_translated,
+                'source_language': loaded['source_language'],
+                'final_language': loaded['final_language'],
+                'is_translated': loaded['is_translated'],
+                'from_store': loaded['from_store'],
                 'transcript_data': {
-                    'full_text': full_text.strip(),
-                    'clean_text': clean_text,
-                    'segments': segments,
+                    'full_text': segments.render(include_timestamps, preserve_formatting),
+                    'clean_text': segments.clean_text if include_clean_text else None,
+                    'segments': segments.to_dicts() if include_segments else None,
                     'segment_count': len(segments),
-                    'word_count': word_count,
+                    'word_count': segments.word_count,
                     'duration_seconds': total_duration,
                     'duration_formatted': self._format_duration(total_duration)
                 }
@@ -249,6 +469,16 @@ class YouTubeProcessor:
                 'video_id': video_id,
                 'requested_languages': languages
             }
+        except TimeoutError as e:
+            error_message = f"YouTube request timed out - {e}"
+            return {
+                'success': False,
+                'error': f'Transcript extraction failed: {error_message}',
+                'video_id': video_id,
+                'api_version': 'youtube-transcript-api-1.1.0+',
+                'suggestion': self._get_error_suggestion(error_message),
+                'retry_recommended': True
+            }
         except Exception as e:
             error_message = str(e)
             
@@ -269,6 +499,8 @@ class YouTubeProcessor:
                 error_message = "Video parsing error - transcript data structure unexpected"
             elif "connection" in error_message.lower() or "timeout" in error_message.lower():
                 error_message = "Network connection issue - please try again later"
+            elif self._is_throttle_error(e):
+                error_message = "YouTube is rate limiting requests - this is a temporary issue"
             
             return {
                 'success': False,
@@ -276,19 +508,17 @@ class YouTubeProcessor:
                 'video_id': video_id,
                 'api_version': 'youtube-transcript-api-1.1.0+',
                 'suggestion': self._get_error_suggestion(error_message),
-                'retry_recommended': "connection" in error_message.lower() or "timeout" in error_message.lower() or "temporary" in error_message.lower()
+                'retry_recommended': (
+                    self._is_throttle_error(e)
+                    or "connection" in error_message.lower()
+                    or "timeout" in error_message.lower()
+                    or "temporary" in error_message.lower()
+                )
             }
     
     def _format_timestamp(self, seconds: float) -> str:
         """Format seconds to MM:SS or HH:MM:SS format"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        
-        if hours > 0:
-            return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-        else:
-            return f"{minutes:02d}:{secs:02d}"
+        return format_timestamp(seconds)
     
     def _format_duration(self, seconds: float) -> str:
         """Format duration in human readable format"""
@@ -316,7 +546,7 @@ class YouTubeProcessor:
             return "The video owner has disabled transcripts. Try a different video."
         elif "video unavailable" in error_lower or "private" in error_lower:
             return "Video is not accessible. Check if the video exists and is publicly available."
-        elif "network" in error_lower or "connection" in error_lower or "timeout" in error_lower:
+        elif "network" in error_lower or "connection" in error_lower or "timeout" in error_lower or "timed out" in error_lower:
             return "Network issue detected. Check your internet connection and try again."
         elif "parsing" in error_lower or "temporary" in error_lower:
             return "This appears to be a temporary issue with YouTube's servers. Try again in a few minutes."
@@ -330,7 +560,10 @@ class YouTubeProcessor:
         translate_to: Optional[str] = None,
         include_timestamps: bool = True,
         preserve_formatting: bool = True,
-        include_metadata: bool = True
+        include_metadata: bool = True,
+        use_cache: bool = True,
+        include_segments: bool = False,
+        include_clean_text: bool = True
     ) -> Dict[str, Any]:
         """Process YouTube URL and extract transcript"""
         
@@ -356,7 +589,10 @@ class YouTubeProcessor:
                 languages=languages,
                 translate_to=translate_to,
                 include_timestamps=include_timestamps,
-                preserve_formatting=preserve_formatting
+                preserve_formatting=preserve_formatting,
+                use_cache=use_cache,
+                include_segments=include_segments,
+                include_clean_text=include_clean_text
             )
             
             if not transcript_result['success']:
@@ -365,7 +601,7 @@ class YouTubeProcessor:
             # Get video metadata if requested
             video_metadata = None
             if include_metadata:
-                video_metadata = self.get_video_info(video_id)
+                video_metadata = await self.get_video_info(video_id, use_cache=use_cache)
             
             return {
                 'success': True,
@@ -390,48 +626,218 @@ class YouTubeProcessor:
                 'video_id': video_id
             }
     
+    async def iter_batch_transcripts(
+        self,
+        urls: Union[List[str], AsyncIterator[str]],
+        languages: Optional[List[str]] = None,
+        translate_to: Optional[str] = None,
+        include_timestamps: bool = True,
+        max_concurrent: int = 3,
+        max_retries: int = 3,
+        retry_base_delay: float = 2.0,
+        skip_stored: bool = False,
+        **options: Any
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Extract transcripts for many URLs, yielding (index, result) as each finishes
+        
+        urls may be a list or an async iterator; with an iterator, extraction
+        starts as soon as each URL is produced. Throughput is governed by the
+        shared rate limiter; max_concurrent only bounds videos in flight.
+        Failures that look transient (throttling, timeouts) are retried with
+        exponential backoff and full jitter. With skip_stored, videos already
+        in the transcript store are reported as skipped instead of extracted.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        results: asyncio.Queue = asyncio.Queue()
+        
+        async def process_single_url(index: int, url: str) -> Tuple[int, Dict[str, Any]]:
+            if skip_stored:
+                video_id = self.extract_video_id(url)
+                if video_id and await self.transcript_store.has_transcript(video_id, languages or DEFAULT_LANGUAGES, translate_to):
+                    return index, {'success': True, 'skipped': True, 'url': url, 'video_id': video_id, 'attempts': 0}
+            
+            attempt = 0
+            while True:
+                try:
+                    async with semaphore:
+                        result = await self.process_youtube_url(
+                            url=url,
+                            languages=languages,
+                            translate_to=translate_to,
+                            include_timestamps=include_timestamps,
+                            **options
+                        )
+                except Exception as e:
+                    result = {
+                        'success': False,
+                        'url': url,
+                        'error': f'Processing failed: {str(e)}',
+                        'retry_recommended': self._is_retryable_error(e)
+                    }
+                
+                attempt += 1
+                if result.get('success') or not result.get('retry_recommended') or attempt > max_retries:
+                    result.setdefault('url', url)
+                    result['attempts'] = attempt
+                    return index, result
+                
+                # Sleep outside the semaphore so other videos keep moving
+                await asyncio.sleep(random.uniform(0, retry_base_delay * 2 ** (attempt - 1)))
+        
+        async def run(index: int, url: str):
+            await results.put(await process_single_url(index, url))
+        
+        tasks: List[asyncio.Task] = []
+        
+        async def feed():
+            if isinstance(urls, list):
+                for url in urls:
+                    tasks.append(asyncio.create_task(run(len(tasks), url)))
+            else:
+                async for url in urls:
+                    tasks.append(asyncio.create_task(run(len(tasks), url)))
+        
+        feeder = asyncio.create_task(feed())
+        yielded = 0
+        try:
+            while True:
+                if feeder.done():
+                    if yielded >= len(tasks):
+                        # Raise errors from the URL source (e.g. playlist resolution)
+                        # only after every started video has been reported
+                        feeder.result()
+                        break
+                    item = await results.get()
+                else:
+                    getter = asyncio.create_task(results.get())
+                    await asyncio.wait({getter, feeder}, return_when=asyncio.FIRST_COMPLETED)
+                    if not getter.done():
+                        getter.cancel()
+                        continue
+                    item = getter.result()
+                yielded += 1
+                yield item
+        finally:
+            feeder.cancel()
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
     async def batch_extract_transcripts(
         self,
         urls: List[str],
         languages: Optional[List[str]] = None,
         translate_to: Optional[str] = None,
         include_timestamps: bool = True,
-        max_concurrent: int = 3
+        max_concurrent: int = 3,
+        max_retries: int = 3
     ) -> List[Dict[str, Any]]:
         """Extract transcripts from multiple YouTube URLs"""
-        
-        async def process_single_url(url):
-            return await self.process_youtube_url(
-                url=url,
-                languages=languages,
-                translate_to=translate_to,
-                include_timestamps=include_timestamps
+        results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+        async for index, result in self.iter_batch_transcripts(
+            urls,
+            languages=languages,
+            translate_to=translate_to,
+            include_timestamps=include_timestamps,
+            max_concurrent=max_concurrent,
+            max_retries=max_retries
+        ):
+            results[index] = result
+        return results
+    
+    async def _complete(self, llm_config, prompt: str, max_tokens: int = 2000) -> str:
+        """Send one summarization prompt through the shared LLM clients, reusing cached answers to identical prompts"""
+        async def call() -> str:
+            return await llm_clients.complete(
+                llm_config,
+                [
+                    {"role": "system", "content": "You are a helpful assistant that summarizes YouTube video transcripts."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=max_tokens
             )
         
-        # Create semaphore to limit concurrent requests
-        semaphore = asyncio.Semaphore(max_concurrent)
-        
-        async def process_with_semaphore(url):
-            async with semaphore:
-                return await process_single_url(url)
+        key = llm_cache.make_key(llm_config.provider, prompt, base_url=llm_config.base_url, max_tokens=max_tokens)
+        return await llm_cache.get_or_call("youtube_summary", key, call, should_cache=bool)
+    
+    @staticmethod
+    def _parse_json_response(content: str) -> Optional[Dict[str, Any]]:
+        """Parse the JSON object in an LLM response, or None if there is none"""
+        json_start = content.find('{')
+        json_end = content.rfind('}') + 1
+        if json_start == -1 or json_end <= json_start:
+            return None
+        try:
+            parsed = json.loads(content[json_start:json_end])
+        except json.JSONDecodeError:
+            return None
+        return parsed if isinstance(parsed, dict) else None
+    
+    def _chunk_transcript(
+        self,
+        transcript_text: str,
+        segments: Optional[TranscriptSegments],
+        max_tokens: int,
+        model: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Split a transcript into token-bounded chunks on segment boundaries
         
-        # Process all URLs concurrently
-        tasks = [process_with_semaphore(url) for url in urls]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Chunk lines always carry timestamps so summaries can cite them.
+        """
+        if segments is None or not len(segments):
+            return [
+                {'text': text, 'start': None, 'end': None}
+                for text in split_by_tokens(transcript_text, max_tokens, model)
+            ]
         
-        # Handle exceptions
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                processed_results.append({
-                    'success': False,
-                    'url': urls[i],
-                    'error': f'Processing failed: {str(result)}'
-                })
+        lines = [f"[{format_timestamp(segments.starts[i])}] {segments.text_at(i)}" for i in range(len(segments))]
+        chunks = []
+        for start, end in group_by_tokens(lines, max_tokens, model):
+            last = end - 1
+            chunks.append({
+                'text': "\n".join(lines[start:end]),
+                'start': segments.starts[start],
+                'end': segments.starts[last] + segments.durations[last]
+            })
+        return chunks
+    
+    @staticmethod
+    def _span_label(chunk: Dict[str, Any]) -> str:
+        if chunk.get('start') is None:
+            return "section"
+        return f"{format_timestamp(chunk['start'])}-{format_timestamp(chunk['end'])}"
+    
+    async def _summarize_chunk(self, llm_config, chunk: Dict[str, Any], kind: str) -> Dict[str, Any]:
+        """Map step: summarize one transcript chunk (or a group of partial summaries)"""
+        prompt = f"""
+            Summarize this {kind} of a YouTube video ({self._span_label(chunk)}).
+            Keep every important point and attach the timestamp where it is made.
+            
+            Please provide a JSON response with the following structure:
+            {{
+                "summary": "Dense summary of this part",
+                "key_points": [{{"timestamp": "MM:SS", "point": "Key point"}}],
+                "topics": ["Topics", "covered"]
+            }}
+            
+            Content:
+            {chunk['text']}
+            """
+        content = await self._complete(llm_config, prompt, max_tokens=1000)
+        parsed = self._parse_json_response(content) or {'summary': content.strip()}
+        return {**parsed, 'start': chunk.get('start'), 'end': chunk.get('end')}
+    
+    def _render_partial(self, partial: Dict[str, Any]) -> str:
+        lines = [f"## {self._span_label(partial)}", str(partial.get('summary', ''))]
+        for key_point in partial.get('key_points') or []:
+            if isinstance(key_point, dict):
+                lines.append(f"- [{key_point.get('timestamp', '')}] {key_point.get('point', '')}")
             else:
-                processed_results.append(result)
-        
-        return processed_results
+                lines.append(f"- {key_point}")
+        if partial.get('topics'):
+            lines.append(f"Topics: {', '.join(str(topic) for topic in partial['topics'])}")
+        return "\n".join(lines)
     
     async def summarize_transcript(
         self,
@@ -439,17 +845,24 @@ class YouTubeProcessor:
         summary_length: str = "medium",
         include_timestamps: bool = True,
         llm_provider: Optional[str] = None,
-        llm_model: Optional[str] = None
+        llm_model: Optional[str] = None,
+        segments: Optional[TranscriptSegments] = None
     ) -> Dict[str, Any]:
         """
         Summarize a long transcript using LLM
         
+        Transcripts that do not fit in one chunk are summarized map-reduce
+        style: chunks split on segment boundaries are summarized concurrently,
+        the partial summaries (with their timestamps) are merged until they
+        fit, and a final call writes the summary.
+        
         Args:
             transcript_text: The full transcript text to summarize
             summary_length: "short", "medium", or "long" summary
             include_timestamps: Whether to preserve key timestamps
             llm_provider: LLM provider to use
             llm_model: Specific model to use
+            segments: Transcript segments; lets chunks follow segment boundaries and timestamps
             
         Returns:
             Dictionary with summary and metadata
@@ -500,13 +913,49 @@ class YouTubeProcessor:
             Make the summary engaging and informative, preserving the tone and style of the original content.
             """
             
-            # Get LLM configuration
+            # Get LLM configuration (any provider configured in config_manager)
             llm_config = get_llm_config(llm_provider, llm_model)
+            provider, _, model = llm_config.provider.partition('/')
+            
+            # Map: summarize token-bounded chunks concurrently
+            chunks = self._chunk_transcript(transcript_text, segments, self.summary_chunk_tokens, llm_config.provider)
+            llm_calls = 0
             
-            # Use direct LLM API call for summarization
-            import json
+            if len(chunks) > 1:
+                semaphore = asyncio.Semaphore(self.summary_max_concurrent)
+                
+                async def summarize_limited(chunk: Dict[str, Any], kind: str) -> Dict[str, Any]:
+                    async with semaphore:
+                        return await self._summarize_chunk(llm_config, chunk, kind)
+                
+                partials = await asyncio.gather(*[summarize_limited(chunk, "part") for chunk in chunks])
+                llm_calls += len(partials)
+                
+                # Collapse partial summaries until they fit in one prompt
+                rendered = [self._render_partial(partial) for partial in partials]
+                while len(rendered) > 1 and count_tokens("\n\n".join(rendered), llm_config.provider) > self.summary_chunk_tokens:
+                    groups = group_by_tokens(rendered, self.summary_chunk_tokens, llm_config.provider)
+                    if len(groups) == len(rendered):
+                        # Every partial is already as large as a chunk; merge pairwise
+                        groups = [(i, min(i + 2, len(rendered))) for i in range(0, len(rendered), 2)]
+                    partials = await asyncio.gather(*[
+                        summarize_limited({
+                            'text': "\n\n".join(rendered[start:end]),
+                            'start': partials[start].get('start'),
+                            'end': partials[end - 1].get('end')
+                        }, "set of section summaries")
+                        for start, end in groups
+                    ])
+                    llm_calls += len(partials)
+                    rendered = [self._render_partial(partial) for partial in partials]
+                
+                source_label = "Section summaries of the transcript (with timestamps)"
+                source_text = "\n\n".join(rendered)
+            else:
+                source_label = "Transcript to summarize"
+                source_text = chunks[0]['text'] if chunks else transcript_text
             
-            # Create the prompt for summarization
+            # Reduce: write the final summary from the transcript or the merged partials
             prompt = f"""
             {instruction}
             
@@ -519,80 +968,48 @@ class YouTubeProcessor:
                 "duration_estimate": "Estimated reading time"
             }}
             
-            Transcript to summarize:
-            {transcript_text}
+            {source_label}:
+            {source_text}
             """
             
-            # Use the LLM config to make direct API call
-            if hasattr(llm_config, 'provider'):
-                provider_info = llm_config.provider.split('/')
-                provider = provider_info[0] if provider_info else 'openai'
-                model = provider_info[1] if len(provider_info) > 1 else 'gpt-4o'
-                
-                if provider == 'openai':
-                    import openai
-                    
-                    # Get API key from config
-                    api_key = llm_config.api_token or os.environ.get('OPENAI_API_KEY')
-                    
-                    if not api_key:
-                        raise ValueError("OpenAI API key not found")
-                    
-                    client = openai.AsyncOpenAI(api_key=api_key)
-                    
-                    response = await client.chat.completions.create(
-                        model=model,
-                        messages=[
-                            {"role": "system", "content": "You are a helpful assistant that summarizes YouTube video transcripts."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.7,
-                        max_tokens=2000
-                    )
-                    
-                    extracted_content = response.choices[0].message.content
-                else:
-                    raise ValueError(f"Provider {provider} not supported in direct mode")
-            else:
-                raise ValueError("Invalid LLM config format")
+            extracted_content = await self._complete(llm_config, prompt)
+            llm_calls += 1
+            
+            result_info = {
+                "summary_length": summary_length,
+                "original_length": len(transcript_text),
+                "llm_provider": provider,
+                "llm_model": model,
+                "strategy": "map_reduce" if len(chunks) > 1 else "single_pass",
+                "chunk_count": len(chunks),
+                "llm_calls": llm_calls
+            }
             
             if extracted_content:
-                try:
-                    import json
-                    # Clean up the extracted content if it's wrapped in markdown
-                    content_to_parse = extracted_content
-                    if content_to_parse.startswith('```json'):
-                        content_to_parse = content_to_parse.replace('```json', '').replace('```', '').strip()
-                    
-                    summary_data = json.loads(content_to_parse) if isinstance(content_to_parse, str) else content_to_parse
-                    
+                summary_data = self._parse_json_response(extracted_content)
+                if summary_data is not None:
+                    summary = str(summary_data.get("summary", "Summary generation failed"))
                     return {
                         "success": True,
-                        "summary": summary_data.get("summary", "Summary generation failed"),
+                        "summary": summary,
                         "key_topics": summary_data.get("key_topics", []),
                         "key_timestamps": summary_data.get("key_timestamps", []) if include_timestamps else [],
                         "content_type": summary_data.get("content_type", "Unknown"),
-                        "summary_length": summary_length,
-                        "original_length": len(transcript_text),
-                        "compressed_ratio": len(summary_data.get("summary", "")) / len(transcript_text) if transcript_text else 0,
-                        "llm_provider": llm_config.get("provider") if isinstance(llm_config, dict) else "unknown",
-                        "llm_model": llm_config.get("model") if isinstance(llm_config, dict) else "unknown"
-                    }
-                except (json.JSONDecodeError, AttributeError) as e:
-                    # Fallback: treat as plain text summary
-                    return {
-                        "success": True,
-                        "summary": str(extracted_content),
-                        "key_topics": [],
-                        "key_timestamps": [],
-                        "content_type": "Unknown",
-                        "summary_length": summary_length,
-                        "original_length": len(transcript_text),
-                        "compressed_ratio": len(str(extracted_content)) / len(transcript_text) if transcript_text else 0,
-                        "llm_provider": llm_config.get("provider") if isinstance(llm_config, dict) else "unknown",
-                        "llm_model": llm_config.get("model") if isinstance(llm_config, dict) else "unknown",
-                        "fallback_mode": True
+                        "compressed_ratio": len(summary) / len(transcript_text) if transcript_text else 0,
+                        **result_info
                     }
+                
+                # Fallback: treat as plain text summary
+                return {
+                    "success": True,
+                    "summary": str(extracted_content),
+                    "key_topics": [],
+                    "key_timestamps": [],
+                    "content_type": "Unknown",
+                    "compressed_ratio": len(str(extracted_content)) / len(transcript_text) if transcript_text else 0,
+                    "fallback_mode": True,
+                    **result_info
+                }
             else:
                 return {
                     "success": False,
@@ -605,4 +1022,4 @@ class YouTubeProcessor:
                 "success": False,
                 "error": f"Summarization failed: {str(e)}",
                 "summary_length": summary_length
-            }
\ No newline at end of file
+            }
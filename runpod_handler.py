@@ -25,11 +25,23 @@ import crawl4ai_mcp.server as mcp_server
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+async def _run_with_cleanup(coro):
+    """
+    Await a coroutine and then release the server's pooled resources.
+    Every job runs on its own event loop, so pooled browsers must be closed
+    before that loop is torn down.
+    """
+    try:
+        return await coro
+    finally:
+        await mcp_server.shutdown_shared_resources()
+
 def run_async_safe(coro):
     """
     Safely run an async coroutine in RunPod serverless environment.
     Handles both cases: running event loop and no event loop.
     """
+    coro = _run_with_cleanup(coro)
     try:
         # Check if there's already a running event loop
         try:
@@ -209,6 +221,13 @@ async def handle_crawl_request(operation: str, params: Dict[str, Any]) -> Dict[s
             else:
                 result = await batch_func(**params)
                 
+        elif operation == 'batch_intelligent_extract':
+            batch_extract_func = mcp_server.batch_intelligent_extract
+            if hasattr(batch_extract_func, 'func'):
+                result = await batch_extract_func.func(**params)
+            else:
+                result = await batch_extract_func(**params)
+                
         elif operation == 'search_and_crawl':
             search_crawl_func = mcp_server.search_and_crawl
             if hasattr(search_crawl_func, 'func'):
@@ -223,7 +242,8 @@ async def handle_crawl_request(operation: str, params: Dict[str, Any]) -> Dict[s
                     'crawl_url', 'crawl_url_with_fallback', 'deep_crawl_site',
                     'intelligent_extract', 'extract_entities', 'extract_structured_data',
                     'process_file', 'extract_youtube_transcript', 'batch_extract_youtube_transcripts',
-                    'search_google', 'batch_search_google', 'search_and_crawl', 'batch_crawl'
+                    'search_google', 'batch_search_google', 'search_and_crawl', 'batch_crawl',
+                    'batch_intelligent_extract'
                 ]
             }
         